@@ -0,0 +1 @@
+# Marks cli as a package.
@@ -0,0 +1,87 @@
+"""
+Benchmark Argon2 on this host and recommend cost parameters for a target verify latency.
+
+Usage (from backend/):
+    python -m app.cli.calibrate_argon2 --target-ms 250
+
+Run it on the node size you deploy to; the output is ready to paste into .env.
+Existing hashes are upgraded transparently on the next successful login.
+"""
+import argparse
+import os
+import statistics
+import time
+
+from argon2 import PasswordHasher
+
+DEFAULT_MEMORY_KIB = (19 * 1024, 46 * 1024, 64 * 1024, 128 * 1024, 256 * 1024)
+SAMPLE_PASSWORD = "Calibrate-Argon2-Pa55word!"
+
+
+def measure_verify_ms(time_cost: int, memory_cost: int, parallelism: int, samples: int) -> float:
+    hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    hashed = hasher.hash(SAMPLE_PASSWORD)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.verify(hashed, SAMPLE_PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(
+    target_ms: float,
+    parallelism: int,
+    memory_options: tuple[int, ...],
+    max_time_cost: int,
+    samples: int,
+) -> list[tuple[int, int, float]]:
+    """Return (time_cost, memory_cost, median_ms) for the costliest time_cost under target per memory size."""
+    results = []
+    for memory_cost in memory_options:
+        best = None
+        for time_cost in range(1, max_time_cost + 1):
+            median_ms = measure_verify_ms(time_cost, memory_cost, parallelism, samples)
+            print(f"  m={memory_cost // 1024:>4} MiB t={time_cost:>2} p={parallelism}: {median_ms:7.1f} ms")
+            if median_ms > target_ms:
+                break
+            best = (time_cost, memory_cost, median_ms)
+        if best is None:
+            # Even t=1 is over budget; larger memory sizes will be too.
+            break
+        results.append(best)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Verify latency budget per login.")
+    parser.add_argument("--parallelism", type=int, default=min(os.cpu_count() or 1, 4))
+    parser.add_argument(
+        "--memory-mib",
+        type=int,
+        nargs="*",
+        help="Memory sizes to try (MiB); defaults to 19 46 64 128 256.",
+    )
+    parser.add_argument("--max-time-cost", type=int, default=10)
+    parser.add_argument("--samples", type=int, default=5, help="Verifications per setting (median is used).")
+    args = parser.parse_args(argv)
+
+    memory_options = tuple(m * 1024 for m in args.memory_mib) if args.memory_mib else DEFAULT_MEMORY_KIB
+    print(f"Calibrating Argon2id for a {args.target_ms:.0f} ms verify budget on {os.cpu_count()} CPUs")
+    results = calibrate(args.target_ms, args.parallelism, memory_options, args.max_time_cost, args.samples)
+    if not results:
+        print("No setting fits the budget; raise --target-ms or try smaller --memory-mib values.")
+        return 1
+
+    # Prefer the largest memory that still fits: memory hardness matters more than passes.
+    time_cost, memory_cost, median_ms = max(results, key=lambda r: (r[1], r[0]))
+    print(f"\nRecommended (median verify {median_ms:.1f} ms):")
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST={memory_cost}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
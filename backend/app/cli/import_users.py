@@ -0,0 +1,189 @@
+"""
+Bulk-import users from CSV or JSONL.
+
+Usage (from backend/):
+    python -m app.cli.import_users staff.csv --errors import-errors.jsonl
+
+Rows need username, email and password; role and status are optional (same rules
+as /auth/register, via UserCreate). Passwords are hashed on every core, duplicates
+are found with one query per batch, and users are inserted with multi-row
+INSERT ... ON CONFLICT DO NOTHING. Rows that fail are listed with their line number.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from pydantic import ValidationError
+
+from app.core.password_executor import hash_password_inline
+from app.db.session import SessionLocal
+from app.repositories.user_repo import UserRepository
+from app.schemas.user import UserCreate
+
+# 4000 rows x 6 columns stays under SQLite's (32766) and PostgreSQL's (65535) bind parameter limits.
+MAX_BATCH_SIZE = 4000
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def fail(self, line: int, row: dict, *messages: str) -> None:
+        self.errors.append(
+            {"line": line, "username": row.get("username"), "email": row.get("email"), "errors": list(messages)}
+        )
+
+
+def read_rows(path: str, fmt: str) -> Iterator[tuple[int, dict]]:
+    """Yield (line number, raw row) pairs; blank optional columns fall back to schema defaults."""
+    with open(path, newline="", encoding="utf-8") as handle:
+        if fmt == "csv":
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, {k: v for k, v in row.items() if k and v not in (None, "")}
+            return
+        for line_num, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as exc:
+                yield line_num, {"__error__": f"invalid JSON: {exc}"}
+                continue
+            yield line_num, row if isinstance(row, dict) else {"__error__": "expected a JSON object"}
+
+
+def validate(rows: Iterator[tuple[int, dict]], report: ImportReport) -> Iterator[tuple[int, UserCreate]]:
+    """Schema-validate rows and drop repeats of an email/username earlier in the file."""
+    seen_emails: set[str] = set()
+    seen_usernames: set[str] = set()
+    for line, row in rows:
+        if "__error__" in row:
+            report.fail(line, {}, row["__error__"])
+            continue
+        try:
+            user = UserCreate(**row)
+        except ValidationError as exc:
+            report.fail(line, row, *(f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in exc.errors()))
+            continue
+        email, username = user.email.lower(), user.username.lower()
+        if email in seen_emails or username in seen_usernames:
+            report.fail(line, row, "duplicate email or username earlier in the file")
+            continue
+        seen_emails.add(email)
+        seen_usernames.add(username)
+        yield line, user
+
+
+def batched(items: Iterator, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_batch(
+    repo: UserRepository,
+    pool: ProcessPoolExecutor | None,
+    batch: list[tuple[int, UserCreate]],
+    report: ImportReport,
+    dry_run: bool,
+) -> None:
+    taken_emails, taken_usernames = repo.existing_identifiers(
+        [user.email for _, user in batch], [user.username for _, user in batch]
+    )
+    fresh = []
+    for line, user in batch:
+        if user.email.lower() in taken_emails or user.username.lower() in taken_usernames:
+            report.fail(line, user.model_dump(include={"username", "email"}), "account already exists")
+        else:
+            fresh.append((line, user))
+    if dry_run:
+        report.imported += len(fresh)
+        return
+    if not fresh:
+        return
+
+    passwords = [user.password for _, user in fresh]
+    if pool is None:
+        hashes = [hash_password_inline(password) for password in passwords]
+    else:
+        hashes = list(pool.map(hash_password_inline, passwords, chunksize=8))
+
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "username": user.username,
+            "email": user.email,
+            "hashed_password": hashed,
+            "role": user.role,
+            "status": user.status,
+        }
+        for (_, user), hashed in zip(fresh, hashes)
+    ]
+    inserted = repo.bulk_insert(rows)
+    for (line, user), row in zip(fresh, rows):
+        if row["id"] not in inserted:
+            report.fail(line, row, "account already exists")
+    report.imported += len(inserted)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV (with header) or JSONL file.")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="Defaults to the file extension.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Hashing processes; 0 hashes inline.")
+    parser.add_argument("--errors", help="Write per-row errors to this JSONL file.")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and check duplicates without inserting.")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("jsonl" if args.path.endswith((".jsonl", ".ndjson")) else "csv")
+    batch_size = min(max(args.batch_size, 1), MAX_BATCH_SIZE)
+    report = ImportReport()
+    started = time.perf_counter()
+
+    pool = None
+    if args.workers > 0 and not args.dry_run:
+        pool = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        with SessionLocal() as db:
+            repo = UserRepository(db)
+            for batch in batched(validate(read_rows(args.path, fmt), report), batch_size):
+                import_batch(repo, pool, batch, report, args.dry_run)
+                print(f"  {report.imported} imported, {len(report.errors)} failed", file=sys.stderr)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - started
+    verb = "validated" if args.dry_run else "imported"
+    print(f"{report.imported} users {verb}, {len(report.errors)} rows failed in {elapsed:.1f}s")
+    if args.errors:
+        with open(args.errors, "w", encoding="utf-8") as handle:
+            for error in report.errors:
+                handle.write(json.dumps(error) + "\n")
+        print(f"Row errors written to {args.errors}")
+    else:
+        for error in report.errors[:20]:
+            print(f"  line {error['line']}: {'; '.join(error['errors'])}")
+        if len(report.errors) > 20:
+            print(f"  ... {len(report.errors) - 20} more; use --errors to write them all")
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""
+Production launcher for the API (used by start.sh).
+
+Usage (from backend/):
+    python -m app.cli.serve --workers 4 --limit-max-requests 50000
+
+Defaults come from WEB_* settings. With several workers uvicorn spawns fresh processes
+that each import the app, so every worker builds its own Redis clients, DB pools and
+hashing pool in the lifespan and warms them (REDIS_WARMUP_CONNECTIONS,
+DB_POOL_WARMUP_CONNECTIONS) before it accepts traffic. Workers that hit
+--limit-max-requests drain and are replaced, which bounds slow memory growth.
+"""
+import argparse
+import logging
+import os
+
+import uvicorn
+
+from app.core.config import get_settings
+
+logger = logging.getLogger("app.cli.serve")
+
+
+def _installed(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def main(argv: list[str] | None = None) -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.web_workers)
+    parser.add_argument("--loop", choices=("auto", "uvloop", "asyncio"), default=settings.web_loop)
+    parser.add_argument("--http", choices=("auto", "httptools", "h11"), default=settings.web_http)
+    parser.add_argument("--limit-max-requests", type=int, default=settings.web_limit_max_requests)
+    parser.add_argument("--timeout-graceful-shutdown", type=int, default=settings.web_timeout_graceful_shutdown)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    loop = args.loop if args.loop != "auto" else ("uvloop" if _installed("uvloop") else "asyncio")
+    http = args.http if args.http != "auto" else ("httptools" if _installed("httptools") else "h11")
+    workers = max(args.workers, 1)
+
+    if args.limit_max_requests and workers == 1:
+        # Only uvicorn's multi-worker supervisor replaces exited workers.
+        logger.warning("--limit-max-requests with one worker stops the server; rely on a restart policy")
+    if workers > 1 and settings.metrics_enabled and not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        logger.warning("METRICS_ENABLED with several workers needs PROMETHEUS_MULTIPROC_DIR, or /metrics shows one worker")
+
+    logger.info("Starting %d worker(s) with loop=%s http=%s", workers, loop, http)
+    # The app is passed by import string so the parent process never imports it.
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        limit_max_requests=args.limit_max_requests or None,
+        timeout_graceful_shutdown=args.timeout_graceful_shutdown,
+        proxy_headers=True,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
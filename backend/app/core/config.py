@@ -13,13 +13,77 @@ class Settings(BaseSettings):
     session_secret: str = "change-me"  # TODO: set a strong secret in production.
     session_signing_secret: str = "change-me-too"  # Used for signing session cookies.
     session_max_age_seconds: int = 60 * 60 * 24 * 7  # 7 days
-    redis_url: str = "redis://redis:6379/0"
+    session_mode: str = "redis"  # "stateless" puts user/expiry/generation in the signed cookie and skips Redis per request.
+    session_generation_refresh_seconds: float = 5.0  # Stateless mode: how stale another worker's logout-all can be.
+    session_generation_cache_max_entries: int = 100_000
+    session_revoked_cache_max_entries: int = 100_000  # Stateless mode: revoked session ids each worker rejects until their tokens expire.
+    redis_url: str = "redis://redis:6379/0"  # A single node (replicas/Sentinel fine); the Lua scripts don't support Cluster.
+    redis_max_connections: Optional[int] = None  # Per-process cap on pooled Redis connections; None is unbounded.
+    redis_warmup_connections: int = 0  # Redis connections opened at startup, before the worker reports ready.
+    session_cache_ttl_seconds: float = 5.0  # In-process session lookup cache; 0 disables.
+    session_cache_max_entries: int = 10_000
+    session_revocation_channel: str = "session_revocations"  # Pub/sub channel keeping worker caches coherent.
+    session_last_seen_interval_seconds: int = 0  # >0 buffers last_seen writes, at most one per session per interval.
+    session_last_seen_flush_seconds: float = 5.0  # How often buffered last_seen updates are flushed to Redis.
+    session_max_per_user: int = 0  # >0 evicts a user's least recently active sessions beyond this many.
+    session_index_sweep_seconds: float = 600.0  # How often expired entries are pruned from idle users' session indexes; 0 disables.
+    session_index_sweep_batch: int = 500  # SCAN page size (and pipeline size) for the index sweeper.
+    user_cache_ttl_seconds: float = 30.0  # Max staleness of cached user projections in get_current_user; 0 disables.
+    user_cache_max_entries: int = 10_000
+    user_cache_redis: bool = False  # Share projections and version counters across workers via Redis.
+    argon2_time_cost: int = 3  # Tune per node with `python -m app.cli.calibrate_argon2`.
+    argon2_memory_cost: int = 65536  # KiB.
+    argon2_parallelism: int = 4
+    password_hash_workers: int = 0  # Argon2 process pool size; 0 hashes inline on the calling thread.
+    password_hash_queue_depth: int = 64  # Jobs allowed to wait for a hashing worker before shedding with 503.
+    rate_limit_local_max_keys: int = 100_000  # Buckets kept per process when Redis is down and limiting falls back locally.
+    reset_alert_window_seconds: int = 3600  # Window for flagging repeated password resets of one account.
+    reset_alert_threshold: int = 3  # Resets within the window that mark a reset as suspicious.
+    reset_velocity_local_max_keys: int = 10_000  # Users tracked per process when Redis is down.
+    reset_velocity_metrics_seconds: float = 60.0  # How often the reset velocity gauges are refreshed (metrics_enabled only); 0 disables.
+    reset_tokens_per_user: int = 1  # Outstanding reset tokens per user; issuing another invalidates the oldest.
+    login_throttle_enabled: bool = True
+    login_ip_limit: int = 30  # Login attempts per client IP per period.
+    login_identifier_limit: int = 10  # Login attempts per account identifier per period.
+    login_throttle_period_seconds: int = 60
+    login_backoff_after_failures: int = 5  # Failed logins before exponential backoff kicks in; 0 disables.
+    login_backoff_max_seconds: int = 900
+    async_mode: bool = False  # Serve auth/session/password routes on the event loop (redis.asyncio + async SQLAlchemy).
+    async_database_url: Optional[str] = None  # Defaults to database_url with the async driver swapped in.
+    db_pool_size: int = 5  # Persistent connections per engine per process; size against PgBouncer's pool.
+    db_max_overflow: int = 10  # Extra short-lived connections allowed under bursts.
+    db_pool_timeout_seconds: float = 30.0  # How long a checkout waits for a free connection before erroring.
+    db_pool_recycle_seconds: int = 1800  # Reopen connections older than this; -1 disables.
+    db_pool_pre_ping: bool = False  # Ping on every checkout; otherwise stale connections are caught by recycle and disconnect handling.
+    db_pool_warmup_connections: int = 0  # Connections opened at startup (capped at db_pool_size).
+    db_statement_timeout_ms: int = 0  # PostgreSQL statement_timeout set per connection; 0 keeps the server default.
+    web_workers: int = 1  # Worker processes started by `python -m app.cli.serve`.
+    web_loop: str = "auto"  # "uvloop", "asyncio" or "auto" (uvloop when installed).
+    web_http: str = "auto"  # "httptools", "h11" or "auto" (httptools when installed).
+    web_limit_max_requests: int = 0  # Recycle a worker after this many requests; 0 never does.
+    web_timeout_graceful_shutdown: int = 30  # Seconds a recycled or stopping worker gets to finish requests.
+    json_backend: str = "auto"  # "orjson", "msgspec" or "stdlib" for Redis payloads and responses; auto picks the fastest installed.
+    metrics_enabled: bool = False  # Serve Prometheus /metrics; set PROMETHEUS_MULTIPROC_DIR when running several workers.
     smtp_host: Optional[str] = None
     smtp_port: int = 587
     smtp_username: Optional[str] = None
     smtp_password: Optional[str] = None
     smtp_sender: str = "no-reply@aquamate.local"
     smtp_use_tls: bool = True
+    smtp_pool_workers: int = 2  # Sender threads, each holding one persistent SMTP connection.
+    smtp_queue_depth: int = 1000  # Emails waiting for a sender before new ones are rejected.
+    smtp_enqueue_timeout_seconds: float = 0.25  # How long a request waits for queue space.
+    smtp_max_attempts: int = 3  # Sends per email, retrying transient failures with jittered backoff.
+    smtp_retry_base_seconds: float = 1.0
+    smtp_idle_timeout_seconds: float = 30.0  # Idle SMTP connections are closed after this long.
+    notification_outbox_enabled: bool = False  # Queue email on a Redis Stream for app.workers.notifier instead of sending in-process.
+    notification_stream: str = "notifications:email"
+    notification_group: str = "notifiers"
+    notification_dead_letter_stream: str = "notifications:email:dead"
+    notification_stream_maxlen: int = 100_000
+    notification_dead_letter_maxlen: int = 10_000  # Dead letters kept (approximately) for inspection; oldest trimmed first.
+    notification_max_attempts: int = 5  # Deliveries before an entry is moved to the dead-letter stream.
+    notification_claim_idle_seconds: int = 60  # Pending entries idle this long are reclaimed from stalled consumers.
 
     model_config = SettingsConfigDict(
         env_file=".env",
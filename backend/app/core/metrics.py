@@ -0,0 +1,145 @@
+"""
+Prometheus metrics, enabled with METRICS_ENABLED=true and served on /metrics.
+
+When disabled every metric is a no-op and prometheus_client is never imported.
+With several uvicorn workers, point PROMETHEUS_MULTIPROC_DIR at an empty directory
+shared by the workers (start.sh clears it on boot): each process then writes its
+samples to mmap'd files there and /metrics aggregates them, whichever worker answers.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+_FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+_HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_SQL_VERBS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK"})
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs) -> "_NoopMetric":
+        return self
+
+    def observe(self, value: float) -> None:
+        pass
+
+    def set(self, value: float) -> None:
+        pass
+
+    def inc(self, amount: float = 1) -> None:
+        pass
+
+
+def _histogram(name: str, documentation: str, labelnames: tuple[str, ...], buckets: tuple[float, ...]):
+    if not settings.metrics_enabled:
+        return _NoopMetric()
+    from prometheus_client import Histogram
+
+    return Histogram(name, documentation, labelnames, buckets=buckets)
+
+
+def _gauge(name: str, documentation: str, multiprocess_mode: str):
+    if not settings.metrics_enabled:
+        return _NoopMetric()
+    from prometheus_client import Gauge
+
+    return Gauge(name, documentation, multiprocess_mode=multiprocess_mode)
+
+
+def _counter(name: str, documentation: str):
+    if not settings.metrics_enabled:
+        return _NoopMetric()
+    from prometheus_client import Counter
+
+    return Counter(name, documentation)
+
+
+# Histogram _count series double as request/call counters.
+HTTP_REQUEST_SECONDS = _histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status.",
+    ("method", "route", "status"),
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+REDIS_SECONDS = _histogram(
+    "redis_operation_duration_seconds",
+    "Latency of Redis round trips made by the session and reset token services.",
+    ("operation",),
+    _FAST_BUCKETS,
+)
+SQL_SECONDS = _histogram(
+    "sql_query_duration_seconds",
+    "Latency of SQL statements by leading keyword.",
+    ("statement",),
+    _FAST_BUCKETS,
+)
+PASSWORD_HASH_SECONDS = _histogram(
+    "password_hash_duration_seconds",
+    "Argon2 hash/verify latency as seen by the caller, including hashing-pool queue time.",
+    ("operation",),
+    _HASH_BUCKETS,
+)
+
+# Shared Redis figures are the same from every worker, so the latest sample wins.
+RESET_VELOCITY_TRACKED_USERS = _gauge(
+    "reset_velocity_tracked_users",
+    "Users with password resets inside the velocity window (Redis).",
+    "mostrecent",
+)
+RESET_VELOCITY_REDIS_BYTES = _gauge(
+    "reset_velocity_redis_bytes_estimate",
+    "Estimated Redis memory of the reset velocity sets (one sampled set times tracked users).",
+    "mostrecent",
+)
+RESET_VELOCITY_LOCAL_USERS = _gauge(
+    "reset_velocity_local_users",
+    "Users tracked by the per-process fallback used while Redis is unavailable.",
+    "livesum",
+)
+RESET_VELOCITY_FALLBACKS = _counter(
+    "reset_velocity_fallbacks",
+    "Resets recorded by the per-process fallback because Redis was unavailable.",
+)
+
+
+@contextmanager
+def timer(metric, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric.labels(**labels).observe(time.perf_counter() - started)
+
+
+def instrument_engine(engine) -> None:
+    """Record every statement run on a (sync) engine; pass async_engine.sync_engine for async ones."""
+    if not settings.metrics_enabled:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["metrics_query_started"].pop()
+        verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        SQL_SECONDS.labels(statement=verb if verb in _SQL_VERBS else "OTHER").observe(elapsed)
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Exposition-format payload and content type for /metrics."""
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
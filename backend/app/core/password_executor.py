@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable
+
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, VerifyMismatchError
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+# Pool workers are spawned and import this module, so keep db/redis imports out of it.
+_pwd_hasher = PasswordHasher(
+    time_cost=settings.argon2_time_cost,
+    memory_cost=settings.argon2_memory_cost,
+    parallelism=settings.argon2_parallelism,
+)
+
+
+def hash_password_inline(password: str) -> str:
+    return _pwd_hasher.hash(password)
+
+
+def verify_password_inline(password: str, hashed_password: str) -> bool:
+    try:
+        return _pwd_hasher.verify(hashed_password, password)
+    except VerifyMismatchError:
+        return False
+    except VerificationError:
+        return False
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True when the hash was made with different Argon2 parameters than configured."""
+    try:
+        return _pwd_hasher.check_needs_rehash(hashed_password)
+    except Exception:
+        return False
+
+
+def _timed(fn: Callable, *args):
+    """Runs in the worker; reports when the job started so the parent can derive queue time."""
+    started = time.monotonic()
+    result = fn(*args)
+    return result, started, time.monotonic() - started
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """Raised when the hashing queue is full; callers should shed load (HTTP 503)."""
+
+
+class PasswordExecutor:
+    """
+    Bounded process pool for Argon2 hashing/verification.
+
+    Keeps CPU-heavy password work off request threads and the event loop so cheap
+    routes stay responsive during login storms. With max_workers=0 jobs run inline.
+    """
+
+    def __init__(self, max_workers: int, queue_depth: int):
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self._pool: ProcessPoolExecutor | None = None
+        self._slots = threading.BoundedSemaphore(max(max_workers, 1) + max(queue_depth, 0))
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.queue_seconds_total = 0.0
+        self.queue_seconds_max = 0.0
+        self.exec_seconds_total = 0.0
+        self.exec_seconds_max = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def start(self) -> None:
+        if not self.enabled or self._pool is not None:
+            return
+        # spawn, not fork: the parent runs Redis listener/flusher threads.
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def run(self, fn: Callable, *args):
+        """Run fn(*args) on the pool and block the calling thread for the result."""
+        if not self.enabled:
+            result, _, elapsed = _timed(fn, *args)
+            self._record(0.0, elapsed)
+            return result
+        return self._submit(fn, *args).result()
+
+    async def run_async(self, fn: Callable, *args):
+        """Await fn(*args) on the pool without blocking the event loop."""
+        if not self.enabled:
+            result, _, elapsed = await run_in_threadpool(_timed, fn, *args)
+            self._record(0.0, elapsed)
+            return result
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queue_depth": self.queue_depth,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "queue_seconds_total": self.queue_seconds_total,
+                "queue_seconds_max": self.queue_seconds_max,
+                "exec_seconds_total": self.exec_seconds_total,
+                "exec_seconds_max": self.exec_seconds_max,
+            }
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusyError("Password hashing queue is full")
+        if self._pool is None:
+            self.start()
+        with self._lock:
+            self.in_flight += 1
+        # CLOCK_MONOTONIC is system-wide, so worker start times are comparable with ours.
+        submitted = time.monotonic()
+        outer: Future = Future()
+
+        def _done(inner: Future) -> None:
+            self._slots.release()
+            with self._lock:
+                self.in_flight -= 1
+            if inner.cancelled():
+                outer.cancel()
+                return
+            exc = inner.exception()
+            if exc is not None:
+                outer.set_exception(exc)
+                return
+            result, started, elapsed = inner.result()
+            self._record(max(started - submitted, 0.0), elapsed)
+            outer.set_result(result)
+
+        try:
+            inner = self._pool.submit(_timed, fn, *args)
+        except Exception:
+            self._slots.release()
+            with self._lock:
+                self.in_flight -= 1
+            raise
+        inner.add_done_callback(_done)
+        return outer
+
+    def _record(self, queue_seconds: float, exec_seconds: float) -> None:
+        with self._lock:
+            self.completed += 1
+            self.queue_seconds_total += queue_seconds
+            self.queue_seconds_max = max(self.queue_seconds_max, queue_seconds)
+            self.exec_seconds_total += exec_seconds
+            self.exec_seconds_max = max(self.exec_seconds_max, exec_seconds)
+
+
+password_executor = PasswordExecutor(
+    settings.password_hash_workers,
+    settings.password_hash_queue_depth,
+)
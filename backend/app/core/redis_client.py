@@ -1,8 +1,168 @@
+import inspect
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
 from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.commands.core import AsyncScript, Script
+from redis.exceptions import RedisError
 
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
-# Simple sync Redis client; consider connection pooling options if needed.
-redis_client = Redis.from_url(settings.redis_url, decode_responses=True)
+
+# Tally of the operation currently counting its round trips, see count_round_trips().
+_round_trip_tally: ContextVar[list[int] | None] = ContextVar("redis_round_trip_tally", default=None)
+_counting_classes: dict[type, type] = {}
+
+
+def _record_round_trip() -> None:
+    tally = _round_trip_tally.get()
+    if tally is not None:
+        tally[0] += 1
+
+
+def _counting_connection_class(connection_class: type) -> type:
+    """Subclass whose send_packed_command, called once per command or pipeline flush, is counted."""
+    if connection_class not in _counting_classes:
+        if inspect.iscoroutinefunction(connection_class.send_packed_command):
+
+            class Counting(connection_class):
+                async def send_packed_command(self, *args, **kwargs):
+                    _record_round_trip()
+                    return await super().send_packed_command(*args, **kwargs)
+
+        else:
+
+            class Counting(connection_class):
+                def send_packed_command(self, *args, **kwargs):
+                    _record_round_trip()
+                    return super().send_packed_command(*args, **kwargs)
+
+        Counting.__name__ = Counting.__qualname__ = f"Counting{connection_class.__name__}"
+        _counting_classes[connection_class] = Counting
+    return _counting_classes[connection_class]
+
+
+def instrument_round_trips(client):
+    """Make count_round_trips() see the client's traffic; call before the client opens connections."""
+    pool = client.connection_pool
+    if pool.connection_class not in _counting_classes.values():
+        pool.connection_class = _counting_connection_class(pool.connection_class)
+    return client
+
+
+@contextmanager
+def count_round_trips() -> Iterator[list[int]]:
+    """
+    Count the requests actually written to Redis by this thread or task inside the block.
+
+    Yields a one-item list holding the running count. Script loads on NOSCRIPT, pipeline
+    SCRIPT EXISTS checks and connection handshakes all show up, unlike a hand-kept tally.
+    """
+    tally = [0]
+    token = _round_trip_tally.set(tally)
+    try:
+        yield tally
+    finally:
+        _round_trip_tally.reset(token)
+
+
+class LazyRedis:
+    """
+    Per-process Redis client, created on first use.
+
+    Services keep a reference to this proxy rather than to a client, so importing the
+    app builds no client and a forked worker never reuses its parent's sockets.
+    Attribute access is forwarded to the underlying client, and scripts registered
+    here call through the proxy too, so they follow the client across forks and
+    close_clients() instead of pinning the one that existed when they were registered.
+    """
+
+    def __init__(self, factory: Callable[[], object], script_class: type = Script):
+        self._factory = factory
+        self._script_class = script_class
+        self._lock = threading.Lock()
+        self._client = None
+        self._pid = 0
+
+    @property
+    def client(self):
+        if self._client is None or self._pid != os.getpid():
+            with self._lock:
+                if self._client is None or self._pid != os.getpid():
+                    self._client = self._factory()
+                    self._pid = os.getpid()
+        return self._client
+
+    @property
+    def created(self) -> bool:
+        return self._client is not None and self._pid == os.getpid()
+
+    def __getattr__(self, name: str):
+        return getattr(self.client, name)
+
+    def register_script(self, script: str):
+        # Pre-encoded, so hashing the script doesn't need a client's encoder (that would build one).
+        return self._script_class(self, script.encode())
+
+    def discard(self) -> None:
+        """Forget the client; the next use creates a fresh one."""
+        self._client = None
+
+
+def _client_options() -> dict:
+    return {"decode_responses": True, "max_connections": settings.redis_max_connections}
+
+
+# Sync client used by the threadpool routes, background threads and workers.
+redis_client = LazyRedis(lambda: instrument_round_trips(Redis.from_url(settings.redis_url, **_client_options())))
+
+# Event-loop client used when async_mode is enabled.
+async_redis_client = LazyRedis(
+    lambda: instrument_round_trips(AsyncRedis.from_url(settings.redis_url, **_client_options())),
+    AsyncScript,
+)
+
+
+def warm_up(connections: int) -> None:
+    """Open up to `connections` pooled connections now rather than on the first requests."""
+    pool = redis_client.connection_pool
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(pool.get_connection("PING"))
+    except RedisError:
+        logger.warning("Redis warmup failed; connections will be opened on demand", exc_info=True)
+    finally:
+        for connection in opened:
+            pool.release(connection)
+
+
+async def warm_up_async(connections: int) -> None:
+    pool = async_redis_client.connection_pool
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(await pool.get_connection("PING"))
+    except RedisError:
+        logger.warning("Redis warmup failed; connections will be opened on demand", exc_info=True)
+    finally:
+        for connection in opened:
+            await pool.release(connection)
+
+
+async def close_clients() -> None:
+    if async_redis_client.created:
+        await async_redis_client.aclose()
+    if redis_client.created:
+        redis_client.close()
+    async_redis_client.discard()
+    redis_client.discard()
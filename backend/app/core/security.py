@@ -3,18 +3,25 @@ import secrets
 from hashlib import sha256
 from uuid import UUID
 
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError, VerificationError
 from fastapi import Cookie, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.db.session import get_db
-from app.services.session_service import SessionService
+from app.core.metrics import PASSWORD_HASH_SECONDS, timer
+from app.core.password_executor import (
+    hash_password_inline,
+    needs_rehash,
+    password_executor,
+    verify_password_inline,
+)
+from app.db.session import get_async_db, get_db
+from app.models.user import UserRole
+from app.services.session_service import AsyncSessionService, SessionService
+from app.services.session_tokens import SessionClaims, revoked_sessions, session_generations
 
 settings = get_settings()
 
-_pwd_hasher = PasswordHasher()
 SESSION_COOKIE_NAME = "session"
 SESSION_SIGNATURE_SEPARATOR = "."
 
@@ -23,6 +30,10 @@ def get_session_service() -> SessionService:
     return SessionService(settings)
 
 
+def get_async_session_service() -> AsyncSessionService:
+    return AsyncSessionService(settings)
+
+
 def _sign(value: str) -> str:
     sig = hmac.new(settings.session_signing_secret.encode(), value.encode(), sha256).hexdigest()
     return f"{value}{SESSION_SIGNATURE_SEPARATOR}{sig}"
@@ -40,18 +51,31 @@ def _unsign(signed_value: str) -> str | None:
 
 def hash_password(password: str) -> str:
     """Return a salted Argon2 hash of the password."""
-    # TODO: expose argon2 parameters via config and track for rehash needs.
-    return _pwd_hasher.hash(password)
+    with timer(PASSWORD_HASH_SECONDS, operation="hash"):
+        return password_executor.run(hash_password_inline, password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
     """Check a plaintext password against an Argon2 hash."""
-    try:
-        return _pwd_hasher.verify(hashed_password, password)
-    except VerifyMismatchError:
-        return False
-    except VerificationError:
-        return False
+    with timer(PASSWORD_HASH_SECONDS, operation="verify"):
+        return password_executor.run(verify_password_inline, password, hashed_password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when the stored hash predates the configured Argon2 parameters."""
+    return needs_rehash(hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password for event-loop callers."""
+    with timer(PASSWORD_HASH_SECONDS, operation="hash"):
+        return await password_executor.run_async(hash_password_inline, password)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """verify_password for event-loop callers."""
+    with timer(PASSWORD_HASH_SECONDS, operation="verify"):
+        return await password_executor.run_async(verify_password_inline, password, hashed_password)
 
 
 def set_session_cookie(response, token: str) -> None:
@@ -68,6 +92,47 @@ def set_session_cookie(response, token: str) -> None:
     # TODO: set domain/path if serving API under a subdomain.
 
 
+def _invalid_session(detail: str = "Invalid or expired session") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _raw_session_token(session_token: str | None) -> str:
+    """Verify the cookie signature and return the raw session id, or raise 401."""
+    if not session_token:
+        raise _invalid_session("Not authenticated")
+
+    raw_token = _unsign(session_token)
+    if not raw_token:
+        raise _invalid_session()
+    return raw_token
+
+
+def _stateless_claims(raw_token: str) -> SessionClaims:
+    """Decode a stateless token and check its expiry and revocation; the generation check is up to the caller."""
+    claims = SessionClaims.decode(raw_token)
+    if claims is None or claims.expired or revoked_sessions.is_revoked(claims.session_id):
+        raise _invalid_session()
+    return claims
+
+
+def _stateless_user_id(raw_token: str) -> UUID:
+    claims = _stateless_claims(raw_token)
+    if claims.generation < session_generations.get(claims.user_id):
+        raise _invalid_session()
+    return claims.user_id
+
+
+async def _stateless_user_id_async(raw_token: str) -> UUID:
+    claims = _stateless_claims(raw_token)
+    if claims.generation < await session_generations.get_async(claims.user_id):
+        raise _invalid_session()
+    return claims.user_id
+
+
 def get_current_user(
     session_token: str | None = Cookie(None, alias=SESSION_COOKIE_NAME),
     db: Session = Depends(get_db),
@@ -76,39 +141,65 @@ def get_current_user(
     """
     Dependency to fetch the current user from a signed session cookie.
     """
-    if not session_token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-
-    raw_token = _unsign(session_token)
-    if not raw_token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired session",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    raw_token = _raw_session_token(session_token)
 
-    user_id = session_service.get_user_id_for_session(raw_token)
+    if session_service.stateless:
+        # Signature, expiry, revocation and generation are all checked locally: no Redis round trip.
+        user_id = _stateless_user_id(raw_token)
+    else:
+        user_id = session_service.get_user_id_for_session(raw_token)
     if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired session",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _invalid_session()
 
     from app.repositories.user_repo import UserRepository  # local import to avoid circular
+    from app.services.user_cache import user_cache
+
+    user = user_cache.get(user_id, UserRepository(db).get)
+    if not user:
+        raise _invalid_session()
+    return user
+
+
+async def get_current_user_async(
+    session_token: str | None = Cookie(None, alias=SESSION_COOKIE_NAME),
+    db: AsyncSession = Depends(get_async_db),
+    session_service: AsyncSessionService = Depends(get_async_session_service),
+):
+    """
+    Event-loop counterpart of get_current_user used when async_mode is enabled.
+    """
+    raw_token = _raw_session_token(session_token)
+
+    if session_service.stateless:
+        user_id = await _stateless_user_id_async(raw_token)
+    else:
+        user_id = await session_service.get_user_id_for_session(raw_token)
+    if not user_id:
+        raise _invalid_session()
+
+    from app.repositories.user_repo import AsyncUserRepository  # local import to avoid circular
+    from app.services.user_cache import user_cache
 
-    user = UserRepository(db).get(user_id)
+    user = await user_cache.get_async(user_id, AsyncUserRepository(db).get)
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired session",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _invalid_session()
     return user
 
 
+def _ensure_admin(user) -> None:
+    if user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+
+
+def require_admin(current_user=Depends(get_current_user)):
+    """Dependency allowing only admins through."""
+    _ensure_admin(current_user)
+    return current_user
+
+
+async def require_admin_async(current_user=Depends(get_current_user_async)):
+    _ensure_admin(current_user)
+    return current_user
+
+
 # TODO: set cookie with httponly/secure/samesite flags when issuing session tokens.
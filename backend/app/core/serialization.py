@@ -0,0 +1,83 @@
+"""
+JSON encoding for Redis payloads and API responses.
+
+JSON_BACKEND picks orjson, msgspec or the stdlib json module; "auto" uses the first
+one installed. All three emit compact JSON, encode datetimes as ISO 8601, UUIDs as
+strings and enums by value, and raise ValueError on malformed input, so payloads
+written by one backend read back under another.
+"""
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable
+from uuid import UUID
+
+from starlette.responses import JSONResponse
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stdlib() -> tuple[Callable[[Any], bytes], Callable[[str | bytes], Any]]:
+    encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_default)
+    return (lambda value: encoder.encode(value).encode()), json.loads
+
+
+def _orjson() -> tuple[Callable[[Any], bytes], Callable[[str | bytes], Any]]:
+    import orjson
+
+    return (lambda value: orjson.dumps(value, default=_default)), orjson.loads
+
+
+def _msgspec() -> tuple[Callable[[Any], bytes], Callable[[str | bytes], Any]]:
+    import msgspec
+
+    encoder = msgspec.json.Encoder(enc_hook=_default)
+    decoder = msgspec.json.Decoder()
+
+    def loads(raw: str | bytes) -> Any:
+        try:
+            return decoder.decode(raw)
+        except msgspec.DecodeError as exc:
+            raise ValueError(str(exc)) from exc
+
+    return encoder.encode, loads
+
+
+_BACKENDS = {"orjson": _orjson, "msgspec": _msgspec, "stdlib": _stdlib}
+
+
+def _select(name: str) -> tuple[str, Callable[[Any], bytes], Callable[[str | bytes], Any]]:
+    candidates = ("orjson", "msgspec", "stdlib") if name == "auto" else (name,)
+    for candidate in candidates:
+        try:
+            return (candidate, *_BACKENDS[candidate]())
+        except ImportError:
+            if name != "auto":
+                raise
+    raise ValueError(f"Unknown JSON backend: {name}")
+
+
+BACKEND, dumps_bytes, loads = _select(settings.json_backend)
+
+
+def dumps(value: Any) -> str:
+    return dumps_bytes(value).decode()
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: renders with the configured backend instead of json.dumps."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
@@ -0,0 +1,29 @@
+"""users created_at microseconds
+
+Revision ID: 3f9a6b1d7c25
+Revises: 8c3d1f6a2e57
+Create Date: 2026-10-18 16:02:11.730418
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6b1d7c25'
+down_revision: Union[str, None] = '8c3d1f6a2e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite stores timestamps as text; rows from the CURRENT_TIMESTAMP server default lack the
+    # fractional part SQLAlchemy binds, so they sort before equal cursors and pagination repeats.
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(sa.text("UPDATE users SET created_at = created_at || '.000000' WHERE length(created_at) = 19"))
+
+
+def downgrade() -> None:
+    pass
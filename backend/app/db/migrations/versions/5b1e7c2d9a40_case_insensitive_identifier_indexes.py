@@ -0,0 +1,29 @@
+"""case-insensitive identifier indexes
+
+Revision ID: 5b1e7c2d9a40
+Revises: cc4d7bb9f38c
+Create Date: 2026-10-18 14:05:12.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e7c2d9a40'
+down_revision: Union[str, None] = 'cc4d7bb9f38c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fails if existing rows differ only by case; resolve those accounts before upgrading.
+    op.create_index('uq_users_email_lower', 'users', [sa.text('lower(email)')], unique=True)
+    op.create_index('uq_users_username_lower', 'users', [sa.text('lower(username)')], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_users_username_lower', table_name='users')
+    op.drop_index('uq_users_email_lower', table_name='users')
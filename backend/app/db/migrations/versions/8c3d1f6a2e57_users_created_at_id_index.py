@@ -0,0 +1,27 @@
+"""users created_at/id index
+
+Revision ID: 8c3d1f6a2e57
+Revises: 5b1e7c2d9a40
+Create Date: 2026-10-18 14:32:47.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c3d1f6a2e57'
+down_revision: Union[str, None] = '5b1e7c2d9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Backs keyset pagination ordered by (created_at, id); scanned backwards for newest-first.
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_created_at_id', table_name='users')
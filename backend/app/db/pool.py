@@ -0,0 +1,105 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import Settings
+
+
+class PoolMonitor:
+    """
+    Checkout statistics for one engine's connection pool, reported on /health.
+
+    wait_* is the time spent obtaining a connection (queueing for a free one, or
+    opening a new one); overflow_opened counts connections opened beyond pool_size
+    and timeouts counts checkouts that gave up after db_pool_timeout_seconds. A
+    steadily non-zero wait or overflow means the pool (or PgBouncer's) is too small.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pool = None
+        self.checkouts = 0
+        self.overflow_opened = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, wait_seconds: float, overflowed: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.overflow_opened += overflowed
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "overflow_opened": self.overflow_opened,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+        pool = self.pool
+        if isinstance(pool, QueuePool):
+            stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=max(pool.overflow(), 0))
+        return stats
+
+
+class _MonitoredPoolMixin:
+    monitor: PoolMonitor
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Pool.recreate() builds a new instance of the same class after invalidation.
+        self.monitor.pool = self
+
+    def _do_get(self):
+        started = time.perf_counter()
+        overflow_before = self.overflow()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.monitor.record_timeout()
+            raise
+        overflow_after = self.overflow()
+        self.monitor.record(time.perf_counter() - started, overflow_after > max(overflow_before, 0))
+        return record
+
+
+def monitored_pool_class(base: type, monitor: PoolMonitor) -> type:
+    """Subclass of a QueuePool flavour that reports checkouts to monitor."""
+    return type(f"Monitored{base.__name__}", (_MonitoredPoolMixin, base), {"monitor": monitor})
+
+
+def engine_options(settings: Settings, url: str, monitor: PoolMonitor, is_async: bool = False) -> dict:
+    """create_engine/create_async_engine keyword arguments for the configured pool."""
+    options = {
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+    }
+    if url.startswith("sqlite"):
+        # A local file needs no sizing, and aiosqlite's default NullPool takes no pool arguments.
+        return options
+
+    options.update(
+        poolclass=monitored_pool_class(AsyncAdaptedQueuePool if is_async else QueuePool, monitor),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        # LIFO keeps the busy connections warm so idle ones age out via pool_recycle.
+        pool_use_lifo=True,
+    )
+    if settings.db_statement_timeout_ms > 0 and url.startswith("postgres"):
+        timeout = str(settings.db_statement_timeout_ms)
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
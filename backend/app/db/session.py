@@ -1,24 +1,71 @@
-from sqlalchemy import create_engine
+import os
+from contextlib import AsyncExitStack, ExitStack
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
+from app.core.metrics import instrument_engine
+from app.db.pool import PoolMonitor, engine_options
 
 
 settings = get_settings()
+DATABASE_URL = settings.database_url or "sqlite:///./app.db"
 
-# Future: consider async engine/session if moving to async DB drivers.
-engine = create_engine(
-    settings.database_url or "sqlite:///./app.db",
-    pool_pre_ping=True,
-)
+pool_monitor = PoolMonitor()
+engine = create_engine(DATABASE_URL, **engine_options(settings, DATABASE_URL, pool_monitor))
+pool_monitor.pool = engine.pool
+instrument_engine(engine)
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
+    expire_on_commit=False,  # Rows stay readable after commit without a reload query.
     bind=engine,
 )
 
 
+def _async_database_url(url: str) -> str:
+    """Swap the sync DBAPI in a database URL for its asyncio counterpart."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+# The async engine is only built in async_mode so sync deployments don't need the async drivers.
+async_engine = None
+AsyncSessionLocal = None
+async_pool_monitor = PoolMonitor()
+if settings.async_mode:
+    _async_url = settings.async_database_url or _async_database_url(DATABASE_URL)
+    async_engine = create_async_engine(
+        _async_url,
+        **engine_options(settings, _async_url, async_pool_monitor, is_async=True),
+    )
+    async_pool_monitor.pool = async_engine.pool
+    instrument_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+
+def _dispose_after_fork() -> None:
+    # Engines hold no connections until first use, but a worker forked after that
+    # (e.g. gunicorn --preload) must not share its parent's pooled sockets.
+    engine.dispose(close=False)
+    if async_engine is not None:
+        async_engine.sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_dispose_after_fork)
+
+
 def get_db():
     """FastAPI dependency that yields a session per request."""
     db = SessionLocal()
@@ -27,4 +74,42 @@ def get_db():
     finally:
         db.close()
 
-# TODO: add engine disposal hooks on shutdown and pool sizing tuned per deployment.
+
+async def get_async_db():
+    """Async counterpart of get_db for async_mode routes."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _warmup_count() -> int:
+    return max(min(settings.db_pool_warmup_connections, settings.db_pool_size), 0)
+
+
+def warm_up_pool() -> None:
+    """Open db_pool_warmup_connections connections up front so first requests skip connect/auth."""
+    with ExitStack() as stack:
+        for _ in range(_warmup_count()):
+            stack.enter_context(engine.connect()).execute(text("SELECT 1"))
+
+
+async def warm_up_async_pool() -> None:
+    if async_engine is None:
+        return
+    async with AsyncExitStack() as stack:
+        for _ in range(_warmup_count()):
+            connection = await stack.enter_async_context(async_engine.connect())
+            await connection.execute(text("SELECT 1"))
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections on shutdown so the server (or PgBouncer) frees them immediately."""
+    engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+def pool_stats() -> dict:
+    stats = {"sync": pool_monitor.stats()}
+    if async_engine is not None:
+        stats["async"] = async_pool_monitor.stats()
+    return stats
@@ -1,12 +1,13 @@
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.db.session import get_db
-from app.services.password_reset import PasswordResetService
-from app.services.reset_token_service import ResetTokenService
-from app.services.session_service import SessionService
-from app.services.user_service import UserService
+from app.db.session import get_async_db, get_db
+from app.services.password_reset import AsyncPasswordResetService, PasswordResetService
+from app.services.reset_token_service import AsyncResetTokenService, ResetTokenService
+from app.services.session_service import AsyncSessionService, SessionService
+from app.services.user_service import AsyncUserService, UserService
 
 
 def get_session_service() -> SessionService:
@@ -27,3 +28,23 @@ def get_password_reset_service(
     token_service: ResetTokenService = Depends(get_reset_token_service),
 ) -> PasswordResetService:
     return PasswordResetService(user_service, session_service, token_service)
+
+
+def get_async_session_service() -> AsyncSessionService:
+    return AsyncSessionService(get_settings())
+
+
+def get_async_user_service(db: AsyncSession = Depends(get_async_db)) -> AsyncUserService:
+    return AsyncUserService(db)
+
+
+def get_async_reset_token_service() -> AsyncResetTokenService:
+    return AsyncResetTokenService(get_settings())
+
+
+def get_async_password_reset_service(
+    user_service: AsyncUserService = Depends(get_async_user_service),
+    session_service: AsyncSessionService = Depends(get_async_session_service),
+    token_service: AsyncResetTokenService = Depends(get_async_reset_token_service),
+) -> AsyncPasswordResetService:
+    return AsyncPasswordResetService(user_service, session_service, token_service)
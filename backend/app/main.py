@@ -1,16 +1,83 @@
+from contextlib import asynccontextmanager
 from typing import List
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
 
 from .core.config import get_settings
-from app.routes.auth import router as auth_router
-from app.routes.sessions import router as sessions_router
-from app.routes.password import router as password_router
+from app.core.password_executor import PasswordHasherBusyError, password_executor
+from app.core.metrics import render_latest
+from app.core.redis_client import close_clients, redis_client, warm_up, warm_up_async
+from app.core.serialization import FastJSONResponse
+from app.db.session import dispose_engines, pool_stats, warm_up_async_pool, warm_up_pool
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.throttle import ThrottleMiddleware
+from app.services.last_seen import last_seen_buffer
+from app.services.mailer import mail_pool
+from app.services.password_reset.audit import reset_velocity_tracker
+from app.services.rate_limiter import rate_limiter
+from app.services.session_cache import SessionRevocationListener, session_cache
+from app.services.session_sweeper import session_index_sweeper
+from app.services.session_tokens import revoked_sessions, session_generations
+from app.services.throttle import ThrottleRule
+from app.services.user_cache import user_cache
 
 settings = get_settings()
+
+# async_mode swaps in event-loop routes so auth/session traffic isn't bounded by the threadpool.
+if settings.async_mode:
+    from app.routes.auth_async import router as auth_router
+    from app.routes.sessions_async import router as sessions_router
+    from app.routes.password_async import router as password_router
+    from app.routes.admin_users_async import router as admin_users_router
+else:
+    from app.routes.auth import router as auth_router
+    from app.routes.sessions import router as sessions_router
+    from app.routes.password import router as password_router
+    from app.routes.admin_users import router as admin_users_router
+
 IS_DEV = settings.environment != "production"
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    revocation_listener = SessionRevocationListener(
+        session_cache,
+        redis_client,
+        settings.session_revocation_channel,
+        revoked_sessions if settings.session_mode == "stateless" else None,
+    )
+    password_executor.start()
+    mail_pool.start()
+    revocation_listener.start()
+    last_seen_buffer.start(redis_client, settings.session_max_age_seconds)
+    session_index_sweeper.start(redis_client)
+    reset_velocity_tracker.start()
+    if settings.session_mode == "stateless":
+        session_generations.start()
+    # Uvicorn reports the worker ready only after this, so warm pools keep rolling deploys spike-free.
+    if settings.async_mode:
+        await warm_up_async(settings.redis_warmup_connections)
+        await warm_up_async_pool()
+    else:
+        await run_in_threadpool(warm_up, settings.redis_warmup_connections)
+        await run_in_threadpool(warm_up_pool)
+    try:
+        yield
+    finally:
+        revocation_listener.stop()
+        session_generations.stop()
+        session_index_sweeper.stop()
+        reset_velocity_tracker.stop()
+        last_seen_buffer.stop()  # Flushes pending last_seen updates before exit.
+        password_executor.shutdown()
+        mail_pool.stop()  # Drains queued mail before exit.
+        await dispose_engines()
+        await close_clients()
+
+
 # In production, consider setting docs_url/redoc_url/openapi_url to None to hide docs;
 # in development it is convenient to expose them for debugging.
 app = FastAPI(
@@ -19,8 +86,27 @@ app = FastAPI(
     docs_url="/docs" if IS_DEV else None,
     redoc_url="/redoc" if IS_DEV else None,
     openapi_url="/openapi.json" if IS_DEV else None,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+# Throttle credential endpoints before routing so rejected attempts never reach the DB or Argon2.
+# Added before CORS so 429s still carry CORS headers.
+if settings.login_throttle_enabled:
+    app.add_middleware(
+        ThrottleMiddleware,
+        rules=[
+            ThrottleRule(
+                prefix="/auth/login",
+                ip_limit=settings.login_ip_limit,
+                identifier_limit=settings.login_identifier_limit,
+                period_seconds=settings.login_throttle_period_seconds,
+                backoff_after_failures=settings.login_backoff_after_failures,
+                backoff_max_seconds=settings.login_backoff_max_seconds,
+            ),
+        ],
+    )
+
 # Comma-separated env var of allowed origins; default to "*" for local development.
 # In production, tighten this to the UI origin(s) to avoid browsers accepting unwanted origins.
 raw_origins = settings.cors_origins
@@ -38,17 +124,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so throttled 429s and CORS preflights are measured too.
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(PasswordHasherBusyError)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError):
+    # Shed login/registration bursts instead of queueing them behind every other route.
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
+
 app.include_router(auth_router)
 app.include_router(sessions_router)
 app.include_router(password_router)
+app.include_router(admin_users_router)
 
 
 @app.get("/health", tags=["health"])
 def health_check():
-    return {"status": "ok", "environment": settings.environment}
+    return {
+        "status": "ok",
+        "environment": settings.environment,
+        "session_cache": session_cache.stats(),
+        "session_generations": session_generations.stats(),
+        "revoked_sessions": revoked_sessions.stats(),
+        "session_index_sweeper": session_index_sweeper.stats(),
+        "user_cache": user_cache.stats(),
+        "password_executor": password_executor.stats(),
+        "mail_pool": mail_pool.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "db_pool": pool_stats(),
+    }
+
 
+if settings.metrics_enabled:
+    # Scraped by Prometheus; keep it off the public ingress.
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        payload, content_type = render_latest()
+        return Response(content=payload, media_type=content_type)
 
 
 # TODO: add more routers (e.g., auth) and group under /api if desired.
-# TODO: add request logging middleware, metrics, rate limiting, structured error handling,
-#       database session lifespan events, and auth before production.
+# TODO: add request logging middleware, structured error handling,
+#       and auth before production.
@@ -0,0 +1 @@
+# Marks middleware as a package.
@@ -0,0 +1,168 @@
+import logging
+from dataclasses import replace
+from typing import Iterable
+
+from redis.exceptions import RedisError
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.serialization import loads
+from app.services.throttle import Throttle, ThrottleDecision, ThrottleRule
+
+logger = logging.getLogger(__name__)
+
+
+class ThrottleMiddleware:
+    """
+    Pure ASGI middleware applying ThrottleRules by route prefix.
+
+    Over-limit requests get a 429 before routing, so no DB lookup or Argon2 work
+    happens for them. The IP bucket is checked before the body is read, and bodies
+    over the rule's max_body_bytes get a 413 rather than being buffered. Responses
+    with a rule's failure status feed the progressive backoff, keyed by account and
+    address; a success clears it. Permitted requests cost one Redis call per check
+    (two for rules keyed by identifier), plus one more only when failures need
+    recording or clearing. If Redis is unreachable
+    requests pass through unthrottled; the hashing pool still sheds overload with 503.
+    """
+
+    def __init__(self, app: ASGIApp, rules: Iterable[ThrottleRule], throttle: Throttle | None = None):
+        self.app = app
+        # Longest prefix wins when rules overlap.
+        self.rules = sorted(rules, key=lambda rule: len(rule.prefix), reverse=True)
+        self.throttle = throttle or Throttle()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        rule = self._match(scope)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        ip = scope["client"][0] if scope.get("client") else "unknown"
+        identifier = None
+        try:
+            decision = await self.throttle.check_ip(rule, ip)
+            if decision.allowed and rule.identifier_field:
+                body, receive = await self._buffer_body(scope, receive, rule.max_body_bytes)
+                if body is None:
+                    await self._too_large()(scope, receive, send)
+                    return
+                identifier = self._identifier(rule, body)
+                decision = self._tightest(decision, await self.throttle.check_identifier(rule, ip, identifier))
+        except RedisError:
+            logger.warning("Throttle check failed; allowing request", exc_info=True)
+            await self.app(scope, receive, send)
+            return
+
+        if not decision.allowed:
+            await self._reject(decision)(scope, receive, send)
+            return
+
+        status_code = 0
+
+        async def send_with_headers(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers += [(k.lower().encode(), v.encode()) for k, v in decision.headers().items()]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+        await self._record_outcome(rule, ip, identifier, decision, status_code)
+
+    async def _record_outcome(
+        self, rule: ThrottleRule, ip: str, identifier: str | None, decision: ThrottleDecision, status_code: int
+    ) -> None:
+        try:
+            if status_code in rule.failure_statuses:
+                if rule.backoff_after_failures > 0:
+                    await self.throttle.record_failure(rule, ip, identifier)
+            elif 200 <= status_code < 300 and decision.failures:
+                await self.throttle.clear_failures(rule, ip, identifier)
+        except RedisError:
+            logger.warning("Failed to record throttle outcome", exc_info=True)
+
+    def _match(self, scope: Scope) -> ThrottleRule | None:
+        if scope["type"] != "http":
+            return None
+        path = scope["path"]
+        for rule in self.rules:
+            if path.startswith(rule.prefix) and scope["method"] in rule.methods:
+                return rule
+        return None
+
+    @staticmethod
+    async def _buffer_body(scope: Scope, receive: Receive, limit: int) -> tuple[bytes | None, Receive]:
+        """
+        Read the request body so the identifier can be keyed, then replay it downstream.
+
+        Returns None for the body once it would exceed `limit` bytes, judged by
+        Content-Length up front and by what has been read otherwise.
+        """
+        declared = dict(scope.get("headers") or ()).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            return None, receive
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > limit:
+                return None, receive
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+        replayed = False
+
+        async def replay() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return body, replay
+
+    @staticmethod
+    def _tightest(ip_decision: ThrottleDecision, identifier_decision: ThrottleDecision) -> ThrottleDecision:
+        # Refusals and the backoff state come from the identifier check; headers show the closer bucket.
+        if not identifier_decision.allowed:
+            return identifier_decision
+        if identifier_decision.limit and identifier_decision.remaining < ip_decision.remaining:
+            return identifier_decision
+        return replace(ip_decision, failures=identifier_decision.failures)
+
+    @staticmethod
+    def _identifier(rule: ThrottleRule, body: bytes) -> str | None:
+        if not rule.identifier_field or not body:
+            return None
+        try:
+            value = loads(body).get(rule.identifier_field)
+        except (ValueError, AttributeError):
+            return None
+        if not isinstance(value, str):
+            return None
+        # Same normalisation as the case-insensitive account lookups.
+        return value.strip().lower() or None
+
+    @staticmethod
+    def _too_large() -> JSONResponse:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": {"code": "body_too_large", "message": "Request body too large"}},
+        )
+
+    @staticmethod
+    def _reject(decision: ThrottleDecision) -> JSONResponse:
+        code = "backoff" if decision.backoff else "too_many_attempts"
+        return JSONResponse(
+            status_code=429,
+            content={"detail": {"code": code, "message": "Too many attempts, please retry later"}},
+            headers=decision.headers(),
+        )
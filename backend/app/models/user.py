@@ -1,8 +1,8 @@
 import enum
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 
-from sqlalchemy import Enum, String, Uuid, func
+from sqlalchemy import Enum, Index, String, Uuid, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -23,8 +23,16 @@ class UserStatus(str, enum.Enum):
     INACTIVE = "inactive"
 
 
+def _utcnow() -> datetime:
+    # Naive UTC like the server default; set client-side so every row carries microseconds
+    # (SQLite's CURRENT_TIMESTAMP has none) and compares consistently with keyset cursors.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class User(Base):
     __tablename__ = "users"
+    # Fetch server defaults (created_at) via RETURNING on insert instead of a follow-up SELECT.
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     username: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
@@ -42,8 +50,17 @@ class User(Base):
     )
     created_at: Mapped[datetime] = mapped_column(
         nullable=False,
+        default=_utcnow,
         server_default=func.now(),
     )
 
 
+# Identifier lookups are case-insensitive; these back them and enforce uniqueness.
+Index("uq_users_email_lower", func.lower(User.email), unique=True)
+Index("uq_users_username_lower", func.lower(User.username), unique=True)
+
+# Keyset pagination over (created_at, id), see UserRepository.list.
+Index("ix_users_created_at_id", User.created_at, User.id)
+
+
 # TODO: add updated_at/soft-delete fields and profile relations for auditing.
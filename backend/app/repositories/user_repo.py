@@ -1,10 +1,45 @@
+from datetime import datetime
+from typing import AsyncIterator, Iterator
 from uuid import UUID
 
+from sqlalchemy import Row, func, insert, or_, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import hash_password
-from app.models.user import User
+from app.core.security import hash_password, hash_password_async
+from app.models.user import User, UserRole, UserStatus
 from app.schemas.user import UserCreate
+from app.services.user_cache import user_cache
+
+
+# Columns streamed by export; plain rows skip the identity map so memory stays flat.
+EXPORT_COLUMNS = (User.id, User.username, User.email, User.role, User.status, User.created_at)
+
+
+def _page_query(limit: int, after: tuple[datetime, UUID] | None):
+    """Newest-first page strictly after the (created_at, id) cursor; served by ix_users_created_at_id."""
+    statement = select(User).order_by(User.created_at.desc(), User.id.desc()).limit(limit)
+    if after is not None:
+        statement = statement.where(tuple_(User.created_at, User.id) < tuple_(*after))
+    return statement
+
+
+def _identifier_taken_query(email: str, username: str):
+    """One probe for either identifier, served by the lower() unique indexes."""
+    return (
+        select(User.id)
+        .where(or_(func.lower(User.email) == email.lower(), func.lower(User.username) == username.lower()))
+        .limit(1)
+    )
+
+
+def _export_query(batch_size: int):
+    return (
+        select(*EXPORT_COLUMNS)
+        .order_by(User.created_at.desc(), User.id.desc())
+        .execution_options(yield_per=batch_size)
+    )
 
 
 class UserRepository:
@@ -20,26 +55,149 @@ class UserRepository:
             status=data.status,
         )
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self.db.commit()  # Raises IntegrityError on a duplicate email/username.
+        user_cache.invalidate(user.id)
         return user
 
     def get(self, user_id: UUID) -> User | None:
         return self.db.query(User).filter(User.id == user_id).first()
 
     def get_by_email(self, email: str) -> User | None:
-        return self.db.query(User).filter(User.email == email).first()
+        return self.db.query(User).filter(func.lower(User.email) == email.lower()).first()
 
     def get_by_username(self, username: str) -> User | None:
-        return self.db.query(User).filter(User.username == username).first()
-
-    def list(self, *, limit: int = 100, offset: int = 0) -> list[User]:
-        return (
-            self.db.query(User)
-            .order_by(User.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+        return self.db.query(User).filter(func.lower(User.username) == username.lower()).first()
+
+    def identifier_taken(self, email: str, username: str) -> bool:
+        return self.db.execute(_identifier_taken_query(email, username)).first() is not None
+
+    def existing_identifiers(self, emails: list[str], usernames: list[str]) -> tuple[set[str], set[str]]:
+        """Lower-cased emails and usernames among the given ones that are already taken, in one query."""
+        lower_email, lower_username = func.lower(User.email), func.lower(User.username)
+        rows = self.db.execute(
+            select(lower_email, lower_username).where(
+                or_(lower_email.in_([e.lower() for e in emails]), lower_username.in_([u.lower() for u in usernames]))
+            )
         )
+        taken_emails, taken_usernames = set(), set()
+        for email, username in rows:
+            taken_emails.add(email)
+            taken_usernames.add(username)
+        return taken_emails, taken_usernames
+
+    def bulk_insert(self, rows: list[dict]) -> set[UUID]:
+        """
+        Insert many users in one multi-row statement and commit.
+
+        On PostgreSQL/SQLite conflicting rows (e.g. registered since the duplicate check)
+        are skipped via ON CONFLICT DO NOTHING; the ids actually inserted are returned.
+        """
+        if not rows:
+            return set()
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            statement = dialect_insert(User).values(rows).on_conflict_do_nothing().returning(User.id)
+            inserted = set(self.db.scalars(statement))
+        else:
+            self.db.execute(insert(User), rows)
+            inserted = {row["id"] for row in rows}
+        self.db.commit()
+        return inserted
+
+    def list(self, *, limit: int = 100, after: tuple[datetime, UUID] | None = None) -> list[User]:
+        return list(self.db.scalars(_page_query(limit, after)))
+
+    def iter_export_rows(self, *, batch_size: int = 1000) -> Iterator[Row]:
+        """Stream every user through a server-side cursor, batch_size rows at a time."""
+        yield from self.db.execute(_export_query(batch_size))
+
+    def update_password_hash(self, user: User, hashed_password: str) -> User:
+        user.hashed_password = hashed_password
+        return self._save(user)
+
+    def update_access(self, user: User, *, role: UserRole | None = None, status: UserStatus | None = None) -> User:
+        if role is not None:
+            user.role = role
+        if status is not None:
+            user.status = status
+        return self._save(user)
+
+    def _save(self, user: User) -> User:
+        self.db.add(user)
+        self.db.commit()
+        self.db.refresh(user)
+        # Bump after commit so readers never cache the pre-change row under the new version.
+        user_cache.invalidate(user.id)
+        return user
+
+    # TODO: add queries by role/status.
+
+
+class AsyncUserRepository:
+    """
+    AsyncSession flavour of UserRepository used when async_mode is enabled.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, data: UserCreate) -> User:
+        hashed_password = await hash_password_async(data.password)
+        user = User(
+            username=data.username,
+            email=data.email,
+            hashed_password=hashed_password,
+            role=data.role,
+            status=data.status,
+        )
+        self.db.add(user)
+        await self.db.commit()  # Raises IntegrityError on a duplicate email/username.
+        await user_cache.invalidate_async(user.id)
+        return user
+
+    async def get(self, user_id: UUID) -> User | None:
+        return await self._first(select(User).where(User.id == user_id))
+
+    async def get_by_email(self, email: str) -> User | None:
+        return await self._first(select(User).where(func.lower(User.email) == email.lower()))
+
+    async def get_by_username(self, username: str) -> User | None:
+        return await self._first(select(User).where(func.lower(User.username) == username.lower()))
+
+    async def identifier_taken(self, email: str, username: str) -> bool:
+        result = await self.db.execute(_identifier_taken_query(email, username))
+        return result.first() is not None
+
+    async def list(self, *, limit: int = 100, after: tuple[datetime, UUID] | None = None) -> list[User]:
+        result = await self.db.execute(_page_query(limit, after))
+        return list(result.scalars().all())
+
+    async def iter_export_rows(self, *, batch_size: int = 1000) -> AsyncIterator[Row]:
+        result = await self.db.stream(_export_query(batch_size))
+        async for row in result:
+            yield row
+
+    async def update_password_hash(self, user: User, hashed_password: str) -> User:
+        user.hashed_password = hashed_password
+        return await self._save(user)
+
+    async def update_access(
+        self, user: User, *, role: UserRole | None = None, status: UserStatus | None = None
+    ) -> User:
+        if role is not None:
+            user.role = role
+        if status is not None:
+            user.status = status
+        return await self._save(user)
+
+    async def _save(self, user: User) -> User:
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        await user_cache.invalidate_async(user.id)
+        return user
 
-    # TODO: add queries by role/status and password rehash handling if parameters change.
+    async def _first(self, statement) -> User | None:
+        result = await self.db.execute(statement.limit(1))
+        return result.scalars().first()
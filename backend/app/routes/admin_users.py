@@ -0,0 +1,43 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core.security import require_admin
+from app.dependencies import get_user_service
+from app.schemas.user import UserPage
+from app.services.user_export import EXPORT_MEDIA_TYPES, export_chunks
+from app.services.user_service import UserService
+
+router = APIRouter(prefix="/admin/users", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/", response_model=UserPage)
+def list_users(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    service: UserService = Depends(get_user_service),
+):
+    """
+    Newest-first user listing with keyset pagination over (created_at, id).
+    """
+    try:
+        users, next_cursor = service.list_users(limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return UserPage(items=users, next_cursor=next_cursor)
+
+
+@router.get("/export")
+def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    service: UserService = Depends(get_user_service),
+):
+    """
+    Stream the full roster; rows come off a server-side cursor so memory stays flat.
+    """
+    return StreamingResponse(
+        export_chunks(service.iter_export_rows(), format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
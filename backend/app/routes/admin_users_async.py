@@ -0,0 +1,38 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core.security import require_admin_async
+from app.dependencies import get_async_user_service
+from app.schemas.user import UserPage
+from app.services.user_export import EXPORT_MEDIA_TYPES, export_chunks_async
+from app.services.user_service import AsyncUserService
+
+# Event-loop twin of routes/admin_users.py, mounted instead of it when async_mode is enabled.
+router = APIRouter(prefix="/admin/users", tags=["admin"], dependencies=[Depends(require_admin_async)])
+
+
+@router.get("/", response_model=UserPage)
+async def list_users(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    service: AsyncUserService = Depends(get_async_user_service),
+):
+    try:
+        users, next_cursor = await service.list_users(limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return UserPage(items=users, next_cursor=next_cursor)
+
+
+@router.get("/export")
+async def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    service: AsyncUserService = Depends(get_async_user_service),
+):
+    return StreamingResponse(
+        export_chunks_async(service.iter_export_rows(), format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, Cookie, status
+
+from app.core.security import (
+    _unsign,
+    get_current_user_async,
+    set_session_cookie,
+    verify_password_async,
+)
+from app.dependencies import get_async_session_service, get_async_user_service
+from app.models.user import User
+from app.schemas.auth import LoginRequest
+from app.schemas.user import UserCreate, UserRead, user_read_json
+from app.services.session_service import AsyncSessionService
+from app.services.user_service import AsyncUserService
+
+# Event-loop twin of routes/auth.py, mounted instead of it when async_mode is enabled.
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+async def register(
+    payload: UserCreate,
+    response: Response,
+    service: AsyncUserService = Depends(get_async_user_service),
+    session_service: AsyncSessionService = Depends(get_async_session_service),
+):
+    try:
+        user = await service.create_user(payload)
+    except ValueError as exc:
+        detail = {"code": "account_exists", "message": "Account already exists"}
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail) from exc
+
+    session_id = await session_service.create_session(user.id)
+    set_session_cookie(response, session_id)
+    return user
+
+
+@router.post("/login", response_model=UserRead)
+async def login(
+    payload: LoginRequest,
+    response: Response,
+    service: AsyncUserService = Depends(get_async_user_service),
+    session_service: AsyncSessionService = Depends(get_async_session_service),
+    existing_session: str | None = Cookie(None, alias="session"),
+):
+    user = await service.get_by_identifier(payload.identifier)
+    if not user or not await verify_password_async(payload.password, user.hashed_password):
+        detail = {"code": "invalid_credentials", "message": "Invalid credentials"}
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=detail,
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Upgrade hashes made with older Argon2 parameters while we have the plaintext.
+    await service.rehash_password_if_needed(user, payload.password)
+
+    # Rotate any existing session for this client.
+    if existing_session:
+        raw = _unsign(existing_session)
+        if raw:
+            await session_service.revoke_session_for_user(user.id, raw)
+
+    session_id = await session_service.create_session(user.id)
+    set_session_cookie(response, session_id)
+    return user
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    response: Response,
+    current_user: User = Depends(get_current_user_async),
+    session_token: str | None = Cookie(None, alias="session"),
+    session_service: AsyncSessionService = Depends(get_async_session_service),
+):
+    if session_token:
+        raw = _unsign(session_token)
+        if raw:
+            await session_service.revoke_session_for_user(current_user.id, raw)
+    response.delete_cookie(key="session")
+    return None
+
+
+@router.get("/me", response_model=UserRead)
+async def get_me(current_user: User = Depends(get_current_user_async)):
+    return Response(content=user_read_json(current_user), media_type="application/json")
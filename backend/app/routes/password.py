@@ -9,6 +9,7 @@ from app.services.password_reset import (
     PasswordReuseError,
     RateLimitError,
 )
+from app.services.rate_limiter import RateLimitResult
 
 router = APIRouter(prefix="/password", tags=["password"])
 
@@ -19,19 +20,34 @@ def _get_client_ip(request: Request | None) -> str:
     return "unknown"
 
 
+def _rate_limit_headers(result: RateLimitResult | None) -> dict[str, str] | None:
+    return result.headers() if result else None
+
+
+def _apply_rate_limit_headers(response: Response, result: RateLimitResult | None) -> None:
+    if result:
+        response.headers.update(result.headers())
+
+
 @router.post("/forgot-password", status_code=status.HTTP_202_ACCEPTED)
 def forgot_password(
     payload: ForgotPasswordRequest,
+    request: Request,
+    response: Response,
     reset_service: PasswordResetService = Depends(get_password_reset_service),
-    request: Request | None = None,
 ):
     """
     Issue password reset token via email/SMS without leaking account existence.
     """
     try:
         found_user = reset_service.initiate_reset(payload.identifier, client_ip=_get_client_ip(request))
-    except RateLimitError:
-        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many requests")
+    except RateLimitError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers=_rate_limit_headers(exc.result),
+        )
+    _apply_rate_limit_headers(response, reset_service.rate_limit)
 
     if found_user:
         return {"message": "Reset token generated"}
@@ -41,9 +57,9 @@ def forgot_password(
 @router.post("/reset-password", status_code=status.HTTP_200_OK)
 def reset_password(
     payload: ResetPasswordRequest,
+    request: Request,
+    response: Response,
     reset_service: PasswordResetService = Depends(get_password_reset_service),
-    response: Response | None = None,
-    request: Request | None = None,
 ):
     """
     Consume reset token, set new password, and optionally sign the user back in.
@@ -58,8 +74,12 @@ def reset_password(
             client_ip=client_ip,
             user_agent=user_agent,
         )
-    except RateLimitError:
-        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many reset attempts")
+    except RateLimitError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many reset attempts",
+            headers=_rate_limit_headers(exc.result),
+        )
     except InvalidResetTokenError:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired token")
     except PasswordReuseError:
@@ -70,6 +90,7 @@ def reset_password(
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
 
+    _apply_rate_limit_headers(response, reset_service.rate_limit)
     if response is not None and result.session_id:
         response.delete_cookie(key="session")
         set_session_cookie(response, result.session_id)
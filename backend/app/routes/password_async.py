@@ -0,0 +1,78 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+
+from app.core.security import set_session_cookie
+from app.dependencies import get_async_password_reset_service
+from app.routes.password import _apply_rate_limit_headers, _get_client_ip, _rate_limit_headers
+from app.schemas.auth import ForgotPasswordRequest, ResetPasswordRequest
+from app.services.password_reset import (
+    AsyncPasswordResetService,
+    InvalidResetTokenError,
+    PasswordReuseError,
+    RateLimitError,
+)
+
+# Event-loop twin of routes/password.py, mounted instead of it when async_mode is enabled.
+router = APIRouter(prefix="/password", tags=["password"])
+
+
+@router.post("/forgot-password", status_code=status.HTTP_202_ACCEPTED)
+async def forgot_password(
+    payload: ForgotPasswordRequest,
+    request: Request,
+    response: Response,
+    reset_service: AsyncPasswordResetService = Depends(get_async_password_reset_service),
+):
+    try:
+        found_user = await reset_service.initiate_reset(payload.identifier, client_ip=_get_client_ip(request))
+    except RateLimitError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers=_rate_limit_headers(exc.result),
+        )
+    _apply_rate_limit_headers(response, reset_service.rate_limit)
+
+    if found_user:
+        return {"message": "Reset token generated"}
+    return {"message": "If the account exists, a reset link will be sent"}
+
+
+@router.post("/reset-password", status_code=status.HTTP_200_OK)
+async def reset_password(
+    payload: ResetPasswordRequest,
+    request: Request,
+    response: Response,
+    reset_service: AsyncPasswordResetService = Depends(get_async_password_reset_service),
+):
+    client_ip = _get_client_ip(request)
+    user_agent = request.headers.get("user-agent")
+
+    try:
+        result = await reset_service.complete_reset(
+            payload.token,
+            payload.new_password,
+            client_ip=client_ip,
+            user_agent=user_agent,
+        )
+    except RateLimitError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many reset attempts",
+            headers=_rate_limit_headers(exc.result),
+        )
+    except InvalidResetTokenError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired token")
+    except PasswordReuseError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="New password must differ from the current password",
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    _apply_rate_limit_headers(response, reset_service.rate_limit)
+    if result.session_id:
+        response.delete_cookie(key="session")
+        set_session_cookie(response, result.session_id)
+        return {"message": "Password updated and you are now signed in."}
+    return {"message": "Password updated. Please log in again."}
@@ -3,12 +3,13 @@ from fastapi import APIRouter, Depends, HTTPException, Response, status
 from app.core.security import get_current_user
 from app.dependencies import get_session_service
 from app.models.user import User
+from app.schemas.session import SessionInfo, session_list_adapter
 from app.services.session_service import SessionService
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
 
-@router.get("/")
+@router.get("/", response_model=list[SessionInfo])
 def list_user_sessions(
     current_user: User = Depends(get_current_user),
     session_service: SessionService = Depends(get_session_service),
@@ -16,7 +17,8 @@ def list_user_sessions(
     """
     Minimal session listing for UI use. Future: include more metadata (UA/IP), pagination, and rotation flags.
     """
-    return session_service.list_sessions(current_user.id)
+    sessions = session_service.list_sessions(current_user.id)
+    return Response(content=session_list_adapter.dump_json(sessions), media_type="application/json")
 
 
 @router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
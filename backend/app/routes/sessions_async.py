@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from app.core.security import get_current_user_async
+from app.dependencies import get_async_session_service
+from app.models.user import User
+from app.schemas.session import SessionInfo, session_list_adapter
+from app.services.session_service import AsyncSessionService
+
+# Event-loop twin of routes/sessions.py, mounted instead of it when async_mode is enabled.
+router = APIRouter(prefix="/sessions", tags=["sessions"])
+
+
+@router.get("/", response_model=list[SessionInfo])
+async def list_user_sessions(
+    current_user: User = Depends(get_current_user_async),
+    session_service: AsyncSessionService = Depends(get_async_session_service),
+):
+    sessions = await session_service.list_sessions(current_user.id)
+    return Response(content=session_list_adapter.dump_json(sessions), media_type="application/json")
+
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(
+    response: Response,
+    current_user: User = Depends(get_current_user_async),
+    session_service: AsyncSessionService = Depends(get_async_session_service),
+):
+    await session_service.revoke_all_sessions(current_user.id)
+    response.delete_cookie(key="session")
+    return None
+
+
+@router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user_async),
+    session_service: AsyncSessionService = Depends(get_async_session_service),
+):
+    ok = await session_service.revoke_session_for_user(current_user.id, session_id)
+    if not ok:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+    return None
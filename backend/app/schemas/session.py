@@ -0,0 +1,19 @@
+from typing import Optional
+
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+
+class SessionInfo(TypedDict):
+    """One entry of GET /sessions/; fields missing from older sessions are null."""
+    id: str
+    user_id: Optional[str]
+    created_at: Optional[str]
+    issued_at: Optional[str]
+    user_agent: Optional[str]
+    ip: Optional[str]
+    last_seen: Optional[str]
+
+
+# Built once: dumping the service's dicts straight to JSON skips jsonable_encoder.
+session_list_adapter = TypeAdapter(list[SessionInfo])
@@ -2,7 +2,7 @@ from typing import Optional
 from uuid import UUID
 from datetime import datetime
 
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, TypeAdapter, field_validator
 
 from app.models.user import UserRole, UserStatus
 from app.schemas import validators
@@ -37,3 +37,21 @@ class UserRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class UserPage(BaseModel):
+    """One keyset page of users; pass next_cursor back as `cursor` for the next page."""
+    items: list[UserRead]
+    next_cursor: Optional[str] = None
+
+
+# Built once and reused by hot read routes, which return its bytes directly.
+user_read_adapter = TypeAdapter(UserRead)
+
+
+def user_read_json(user) -> bytes:
+    """UserRead JSON for an ORM row or CachedUser projection."""
+    # Stored rows were validated on the way in; re-running EmailStr validation on every
+    # read was most of the cost, so build the model without it.
+    fields = {name: getattr(user, name) for name in UserRead.model_fields}
+    return user_read_adapter.dump_json(UserRead.model_construct(**fields))
@@ -0,0 +1,110 @@
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+
+from app.core.config import get_settings
+from app.services.session_scripts import TOUCH_SESSION
+
+logger = logging.getLogger(__name__)
+
+
+class LastSeenBuffer:
+    """
+    Coalesces session last_seen updates in-process and flushes them in pipelined batches.
+
+    Each session is recorded at most once per interval; the flusher runs the
+    session touch script for each, which HSETs last_seen, slides the TTL (and the
+    user's index entry) and leaves sessions revoked in the meantime alone.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: int,
+        flush_seconds: float,
+        session_prefix: str = "session:",
+        index_prefix: str = "user_sessions:",
+    ):
+        self.interval_seconds = interval_seconds
+        self.flush_seconds = flush_seconds
+        self.session_prefix = session_prefix
+        self.index_prefix = index_prefix
+        self._lock = threading.Lock()
+        self._pending: dict[str, str] = {}
+        self._recorded_at: dict[str, float] = {}
+        self._client = None
+        self._touch_script = None
+        self._max_age_seconds = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_seconds > 0
+
+    def touch(self, session_id: str) -> bool:
+        """Queue a last_seen bump unless one was recorded within the interval."""
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            recorded_at = self._recorded_at.get(session_id)
+            if recorded_at is not None and now - recorded_at < self.interval_seconds:
+                return False
+            self._recorded_at[session_id] = now
+            self._pending[session_id] = datetime.now(timezone.utc).isoformat()
+            return True
+
+    def start(self, client, max_age_seconds: int) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._client = client
+        self._touch_script = client.register_script(TOUCH_SESSION)
+        self._max_age_seconds = max_age_seconds
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-last-seen-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flusher and write out whatever is still buffered."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=self.flush_seconds + 5)
+        self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to flush session last_seen updates on shutdown")
+
+    def flush(self) -> int:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            cutoff = time.monotonic() - self.interval_seconds
+            self._recorded_at = {sid: ts for sid, ts in self._recorded_at.items() if ts >= cutoff}
+        if not pending or self._client is None:
+            return 0
+
+        pipe = self._client.pipeline(transaction=False)
+        for session_id, last_seen in pending.items():
+            self._touch_script(
+                keys=[f"{self.session_prefix}{session_id}"],
+                args=[self._max_age_seconds, last_seen, session_id, self.index_prefix],
+                client=pipe,
+            )
+        return len(pipe.execute())
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_seconds):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to flush session last_seen updates")
+
+
+settings = get_settings()
+
+last_seen_buffer = LastSeenBuffer(
+    settings.session_last_seen_interval_seconds,
+    settings.session_last_seen_flush_seconds,
+)
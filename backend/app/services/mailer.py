@@ -0,0 +1,249 @@
+import logging
+import queue
+import random
+import smtplib
+import threading
+import time
+from dataclasses import dataclass
+from email.message import EmailMessage
+
+from app.core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
+
+
+
+def build_message(settings: Settings, recipient: str, subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = settings.smtp_sender
+    message["To"] = recipient
+    message["Subject"] = subject
+    message.set_content(body)
+    return message
+
+
+def is_transient_error(exc: Exception) -> bool:
+    """Worth retrying: dropped connections, timeouts and 4xx replies. 5xx replies are permanent."""
+    if isinstance(exc, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in exc.recipients.values())
+    # SMTPException subclasses OSError, so rule the remaining protocol errors out first.
+    return isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+
+
+@dataclass
+class EmailJob:
+    recipient: str
+    subject: str
+    body: str
+    attempts: int = 0
+
+
+class SMTPConnection:
+    """One authenticated SMTP session, reused until it idles out or the server drops it."""
+
+    def __init__(self, settings: Settings, idle_timeout: float):
+        self.settings = settings
+        self.idle_timeout = idle_timeout
+        self._server: smtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    def send(self, message: EmailMessage) -> None:
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self.close()
+        if self._server is None:
+            self._connect()
+        try:
+            self._server.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # The server may have timed the session out; reconnect once before counting a failure.
+            self.close()
+            self._connect()
+            self._server.send_message(message)
+        self._last_used = time.monotonic()
+
+    def close_if_idle(self) -> None:
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self.close()
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            pass
+        self._server = None
+
+    def _connect(self) -> None:
+        server = smtplib.SMTP(self.settings.smtp_host, self.settings.smtp_port, timeout=10)
+        try:
+            if self.settings.smtp_use_tls:
+                server.starttls()
+            if self.settings.smtp_username and self.settings.smtp_password:
+                server.login(self.settings.smtp_username, self.settings.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self._last_used = time.monotonic()
+
+
+class MailPool:
+    """
+    Bounded email queue served by a fixed set of worker threads.
+
+    Each worker keeps its own SMTP session (smtplib is not thread-safe), so a burst
+    of mail costs one TLS handshake and login per worker instead of per message.
+    Transient failures are retried with full-jitter exponential backoff; stop()
+    lets the workers drain whatever is queued before the process exits.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        workers: int,
+        queue_depth: int,
+        max_attempts: int,
+        retry_base_seconds: float,
+        idle_timeout_seconds: float,
+        enqueue_timeout_seconds: float,
+    ):
+        self.settings = settings
+        self.workers = max(workers, 1)
+        self.queue_depth = queue_depth
+        self.max_attempts = max(max_attempts, 1)
+        self.retry_base_seconds = retry_base_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.enqueue_timeout_seconds = enqueue_timeout_seconds
+        self._queue: queue.Queue[EmailJob | None] = queue.Queue(maxsize=queue_depth)
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        # Set when stop() can't queue a sentinel behind a full queue; workers exit after their current job.
+        self._abort = threading.Event()
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.rejected = 0
+        self.send_seconds_total = 0.0
+        self.send_seconds_max = 0.0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            self._abort.clear()
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f"mail-pool-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Drain queued mail, then stop the workers (waits at most `timeout` seconds)."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        if not threads:
+            return
+        deadline = time.monotonic() + timeout
+        for _ in threads:
+            # Sentinels queue behind pending jobs, so workers exit only once those are sent.
+            try:
+                self._queue.put(None, timeout=max(deadline - time.monotonic(), 0.01))
+            except queue.Full:
+                self._abort.set()
+                break
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        if any(thread.is_alive() for thread in threads):
+            logger.warning("Mail pool stopped with %d message(s) undelivered", self._queue.qsize())
+
+    def submit(self, recipient: str, subject: str, body: str) -> bool:
+        """
+        Queue an email. Blocks up to enqueue_timeout_seconds when the queue is full,
+        then rejects it (returns False) rather than stalling the request further.
+        """
+        if not self._threads:
+            self.start()
+        try:
+            self._queue.put(EmailJob(recipient, subject, body), timeout=self.enqueue_timeout_seconds)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            logger.error("Mail queue full; dropping email to %s", recipient)
+            return False
+        return True
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self._queue.qsize(),
+                "queue_depth": self.queue_depth,
+                "sent": self.sent,
+                "failed": self.failed,
+                "retried": self.retried,
+                "rejected": self.rejected,
+                "send_seconds_total": self.send_seconds_total,
+                "send_seconds_max": self.send_seconds_max,
+            }
+
+    def _work(self) -> None:
+        connection = SMTPConnection(self.settings, self.idle_timeout_seconds)
+        try:
+            while not self._abort.is_set():
+                try:
+                    job = self._queue.get(timeout=self.idle_timeout_seconds)
+                except queue.Empty:
+                    connection.close_if_idle()
+                    continue
+                if job is None:
+                    return
+                self._deliver(connection, job)
+        finally:
+            connection.close()
+
+    def _deliver(self, connection: SMTPConnection, job: EmailJob) -> None:
+        if not self.settings.smtp_host:
+            logger.warning("SMTP not configured; unable to send email to %s", job.recipient)
+            return
+        message = build_message(self.settings, job.recipient, job.subject, job.body)
+        while True:
+            job.attempts += 1
+            started = time.monotonic()
+            try:
+                connection.send(message)
+            except Exception as exc:
+                connection.close()
+                if not is_transient_error(exc) or job.attempts >= self.max_attempts:
+                    with self._lock:
+                        self.failed += 1
+                    logger.exception("Failed to send email to %s after %d attempt(s)", job.recipient, job.attempts)
+                    return
+                with self._lock:
+                    self.retried += 1
+                time.sleep(random.uniform(0, self.retry_base_seconds * 2 ** (job.attempts - 1)))
+                continue
+            self._record(time.monotonic() - started)
+            return
+
+    def _record(self, seconds: float) -> None:
+        with self._lock:
+            self.sent += 1
+            self.send_seconds_total += seconds
+            self.send_seconds_max = max(self.send_seconds_max, seconds)
+
+
+settings = get_settings()
+
+mail_pool = MailPool(
+    settings,
+    settings.smtp_pool_workers,
+    settings.smtp_queue_depth,
+    settings.smtp_max_attempts,
+    settings.smtp_retry_base_seconds,
+    settings.smtp_idle_timeout_seconds,
+    settings.smtp_enqueue_timeout_seconds,
+)
@@ -0,0 +1,41 @@
+import time
+
+from app.core.config import Settings, get_settings
+from app.core.redis_client import async_redis_client, redis_client
+
+
+class NotificationOutbox:
+    """
+    Appends email delivery jobs to a Redis Stream for `python -m app.workers.notifier`.
+
+    The entry is written before the request returns, so a crashing API worker can't
+    lose the email; senders consume it through a consumer group and ack once sent.
+    """
+
+    def __init__(self, settings: Settings, client=redis_client, async_client=async_redis_client):
+        self.settings = settings
+        self.client = client
+        self.async_client = async_client
+
+    def enqueue(self, recipient: str, subject: str, body: str) -> str:
+        return self.client.xadd(**self._xadd_args(recipient, subject, body))
+
+    async def enqueue_async(self, recipient: str, subject: str, body: str) -> str:
+        return await self.async_client.xadd(**self._xadd_args(recipient, subject, body))
+
+    def _xadd_args(self, recipient: str, subject: str, body: str) -> dict:
+        return {
+            "name": self.settings.notification_stream,
+            "fields": {
+                "recipient": recipient,
+                "subject": subject,
+                "body": body,
+                "enqueued_at": f"{time.time():.3f}",
+            },
+            # Approximate trimming is O(1); the cap only guards against a long worker outage.
+            "maxlen": self.settings.notification_stream_maxlen,
+            "approximate": True,
+        }
+
+
+notification_outbox = NotificationOutbox(get_settings())
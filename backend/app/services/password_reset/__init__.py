@@ -1,4 +1,5 @@
 from .service import (
+    AsyncPasswordResetService,
     InvalidResetTokenError,
     PasswordResetResult,
     PasswordResetService,
@@ -8,6 +9,7 @@ from .service import (
 
 __all__ = [
     "PasswordResetService",
+    "AsyncPasswordResetService",
     "PasswordResetResult",
     "RateLimitError",
     "InvalidResetTokenError",
@@ -1,28 +1,161 @@
+import logging
+import secrets
 import threading
 import time
+from collections import OrderedDict, deque
 from uuid import UUID
 
+from redis.exceptions import RedisError, ResponseError
 
-class ResetAuditTracker:
+from app.core.config import get_settings
+from app.core.metrics import (
+    RESET_VELOCITY_FALLBACKS,
+    RESET_VELOCITY_LOCAL_USERS,
+    RESET_VELOCITY_REDIS_BYTES,
+    RESET_VELOCITY_TRACKED_USERS,
+)
+from app.core.redis_client import async_redis_client, redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class ResetVelocityTracker:
     """
-    Tracks reset velocity per user to flag suspicious activity.
+    Counts completed resets per user over a sliding window to flag suspicious activity.
+
+    Each user is a Redis sorted set of at most `threshold` recent events (older ones
+    are trimmed, so the set behaves like a ring buffer) that expires with the window,
+    which gives every replica the same view. reset_velocity:index tracks live users
+    by expiry for the tracked-key metric. If Redis is down a per-process fallback
+    with the same bounds (and LRU eviction of users) takes over.
+
+    The tracked-user and footprint gauges are refreshed by a background thread
+    (start/stop), so no request path pays for the Redis reads behind them.
     """
 
-    def __init__(self, window_seconds: int, threshold: int):
+    KEY_PREFIX = "reset_velocity:"
+    INDEX_KEY = "reset_velocity:index"
+
+    def __init__(
+        self,
+        window_seconds: int,
+        threshold: int,
+        local_max_keys: int,
+        client=redis_client,
+        async_client=async_redis_client,
+        metrics_seconds: float = 0.0,
+    ):
         self.window_seconds = window_seconds
         self.threshold = threshold
+        self.capacity = max(threshold, 1)
+        self.local_max_keys = local_max_keys
+        self.client = client
+        self.async_client = async_client
         self._lock = threading.Lock()
-        self._activity: dict[str, list[float]] = {}
+        self._local: OrderedDict[str, deque[float]] = OrderedDict()
+        self.fallbacks = 0
+        self.metrics_seconds = metrics_seconds
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def record(self, user_id: UUID, ip: str) -> int:
+        """Record one reset and return the user's count in the window (capped at threshold)."""
+        pipe = self.client.pipeline(transaction=True)
+        self._queue_record(pipe, user_id, ip)
+        try:
+            return int(pipe.execute()[3])
+        except RedisError:
+            return self._record_local(user_id)
+
+    async def record_async(self, user_id: UUID, ip: str) -> int:
+        pipe = self.async_client.pipeline(transaction=True)
+        self._queue_record(pipe, user_id, ip)
+        try:
+            return int((await pipe.execute())[3])
+        except RedisError:
+            return self._record_local(user_id)
+
+    def is_suspicious(self, count: int) -> bool:
+        return count >= self.threshold
 
-    def record(self, user_id: UUID, ip: str) -> bool:
+    def start(self) -> None:
+        if self._thread is not None or self.metrics_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="reset-velocity-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def refresh_metrics(self) -> None:
+        """Set the gauges: one ZCOUNT of live users, and MEMORY USAGE of one sampled set."""
+        with self._lock:
+            RESET_VELOCITY_LOCAL_USERS.set(len(self._local))
+        tracked_users = self.client.zcount(self.INDEX_KEY, time.time(), "+inf")
+        RESET_VELOCITY_TRACKED_USERS.set(tracked_users)
+        # Sets are trimmed to `capacity`, so one sample extrapolates well.
+        sample = self.client.zrange(self.INDEX_KEY, -1, -1)
+        if not sample:
+            return
+        try:
+            per_key = self.client.memory_usage(self._key(sample[0])) or 0
+        except ResponseError:
+            return  # MEMORY is disabled on some managed Redis services.
+        RESET_VELOCITY_REDIS_BYTES.set(per_key * tracked_users)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.metrics_seconds):
+            try:
+                self.refresh_metrics()
+            except RedisError:
+                logger.warning("Reset velocity metrics refresh failed", exc_info=True)
+
+    def _queue_record(self, pipe, user_id: UUID, ip: str) -> None:
+        now = time.time()
+        key = self._key(user_id)
+        pipe.zremrangebyscore(key, "-inf", now - self.window_seconds)
+        pipe.zadd(key, {f"{ip}|{secrets.token_hex(4)}": now})
+        pipe.zremrangebyrank(key, 0, -(self.capacity + 1))
+        pipe.zcard(key)
+        pipe.expire(key, self.window_seconds)
+        pipe.zadd(self.INDEX_KEY, {str(user_id): now + self.window_seconds})
+        pipe.zremrangebyscore(self.INDEX_KEY, "-inf", now)
+
+    def _record_local(self, user_id: UUID) -> int:
+        if self.fallbacks == 0:
+            logger.warning("Redis unavailable; reset velocity is tracked per process")
         now = time.monotonic()
-        cutoff = now - self.window_seconds
         key = str(user_id)
+        RESET_VELOCITY_FALLBACKS.inc()
         with self._lock:
-            recent = [ts for ts in self._activity.get(key, []) if ts >= cutoff]
-            recent.append(now)
-            self._activity[key] = recent
-            return len(recent) >= self.threshold
+            self.fallbacks += 1
+            events = self._local.get(key)
+            if events is None:
+                events = self._local[key] = deque(maxlen=self.capacity)
+            self._local.move_to_end(key)
+            while events and events[0] < now - self.window_seconds:
+                events.popleft()
+            events.append(now)
+            while len(self._local) > self.local_max_keys:
+                self._local.popitem(last=False)
+            return len(events)
+
+    def _key(self, user_id) -> str:
+        if isinstance(user_id, bytes):
+            user_id = user_id.decode()
+        return f"{self.KEY_PREFIX}{user_id}"
+
+
+settings = get_settings()
 
-    def count_for(self, user_id: UUID) -> int:
-        return len(self._activity.get(str(user_id), []))
+reset_velocity_tracker = ResetVelocityTracker(
+    settings.reset_alert_window_seconds,
+    settings.reset_alert_threshold,
+    settings.reset_velocity_local_max_keys,
+    metrics_seconds=settings.reset_velocity_metrics_seconds if settings.metrics_enabled else 0.0,
+)
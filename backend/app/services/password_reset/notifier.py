@@ -1,57 +1,75 @@
 import logging
-import threading
 from typing import Callable, Optional
 
+from starlette.concurrency import run_in_threadpool
+
 from app.models.user import User
+from app.services.mailer import MailPool, mail_pool
+from app.services.notification_outbox import NotificationOutbox, notification_outbox
 
 logger = logging.getLogger(__name__)
 
+_SUBJECT = "Reset your AquaMate password"
+
 
 class ResetNotifier:
     """
     Responsible for dispatching reset tokens via configured channels.
+
+    Email goes to the Redis Stream outbox when notification_outbox_enabled is set,
+    otherwise through the in-process MailPool; a custom send_email_fn is called inline.
     """
 
-    def __init__(self, settings, send_email_fn: Optional[Callable[[str, str, str], None]] = None):
+    def __init__(
+        self,
+        settings,
+        send_email_fn: Optional[Callable[[str, str, str], None]] = None,
+        mailer: MailPool = mail_pool,
+        outbox: NotificationOutbox = notification_outbox,
+    ):
         self.settings = settings
+        self.mailer = mailer
+        self.outbox = outbox
         self._send_email_fn = send_email_fn or self._send_email
 
     def dispatch(self, user: User, token: str) -> None:
+        contact, channel, message = self._prepare(user, token)
+        try:
+            if channel == "email":
+                self._send_email_fn(contact, _SUBJECT, message)
+            else:
+                logger.warning("SMS delivery not configured; unable to send reset token to %s", contact)
+        except Exception:
+            logger.exception("Failed to dispatch reset token for user_id=%s", user.id)
+
+    async def dispatch_async(self, user: User, token: str) -> None:
+        if not self._uses_outbox():
+            # MailPool.submit and custom senders may block (a full queue waits enqueue_timeout_seconds).
+            await run_in_threadpool(self.dispatch, user, token)
+            return
+        contact, channel, message = self._prepare(user, token)
+        try:
+            if channel == "email":
+                await self.outbox.enqueue_async(contact, _SUBJECT, message)
+            else:
+                logger.warning("SMS delivery not configured; unable to send reset token to %s", contact)
+        except Exception:
+            logger.exception("Failed to dispatch reset token for user_id=%s", user.id)
+
+    def _prepare(self, user: User, token: str) -> tuple[str, str, str]:
         contact = user.email or user.username
         logger.info("Dispatching password reset token for user_id=%s to %s", user.id, contact)
         channel = "email" if "@" in contact else "sms"
         message = f"Use this code to reset your AquaMate password: {token}"
+        logger.info("Sending password reset token via %s to %s", channel, contact)
+        return contact, channel, message
 
-        def _deliver():
-            try:
-                logger.info("Sending password reset token via %s to %s", channel, contact)
-                if channel == "email":
-                    self._send_email_fn(contact, "Reset your AquaMate password", message)
-                else:
-                    logger.warning("SMS delivery not configured; unable to send reset token to %s", contact)
-            except Exception:
-                logger.exception("Failed to dispatch reset token for user_id=%s", user.id)
-
-        threading.Thread(target=_deliver, name=f"reset-token-{user.id}", daemon=True).start()
+    def _uses_outbox(self) -> bool:
+        return self.settings.notification_outbox_enabled and self._send_email_fn == self._send_email
 
     def _send_email(self, recipient: str, subject: str, body: str) -> None:
-        if not self.settings.smtp_host:
-            logger.warning("SMTP not configured; unable to send email to %s", recipient)
+        if self.settings.notification_outbox_enabled:
+            self.outbox.enqueue(recipient, subject, body)
             return
-        import smtplib
-        from email.message import EmailMessage
-
-        message = EmailMessage()
-        message["From"] = self.settings.smtp_sender
-        message["To"] = recipient
-        message["Subject"] = subject
-        message.set_content(body)
-        try:
-            with smtplib.SMTP(self.settings.smtp_host, self.settings.smtp_port, timeout=10) as server:
-                if self.settings.smtp_use_tls:
-                    server.starttls()
-                if self.settings.smtp_username and self.settings.smtp_password:
-                    server.login(self.settings.smtp_username, self.settings.smtp_password)
-                server.send_message(message)
-        except Exception:
-            logger.exception("Failed to send email to %s", recipient)
+        # Don't surface a full queue to the caller: the response must not reveal that the account exists.
+        self.mailer.submit(recipient, subject, body)
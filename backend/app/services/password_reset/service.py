@@ -4,15 +4,15 @@ from typing import Callable, Optional
 from uuid import UUID
 
 from app.core.config import get_settings
-from app.core.security import verify_password
+from app.core.security import verify_password, verify_password_async
 from app.models.user import User, UserStatus
 from app.schemas import validators
-from app.services.reset_token_service import ResetTokenService
-from app.services.session_service import SessionService
-from app.services.user_service import UserService
-from app.services.password_reset.audit import ResetAuditTracker
+from app.services.reset_token_service import AsyncResetTokenService, ResetTokenService
+from app.services.session_service import AsyncSessionService, SessionService
+from app.services.user_service import AsyncUserService, UserService
+from app.services.password_reset.audit import ResetVelocityTracker, reset_velocity_tracker
 from app.services.password_reset.notifier import ResetNotifier
-from app.services.password_reset.rate_limiter import SlidingWindowRateLimiter
+from app.services.rate_limiter import RateLimiter, RateLimitResult, most_restrictive, rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +20,10 @@ logger = logging.getLogger(__name__)
 class RateLimitError(Exception):
     """Raised when a rate limit bucket is exceeded."""
 
+    def __init__(self, result: RateLimitResult | None = None):
+        super().__init__("Rate limit exceeded")
+        self.result = result
+
 
 class InvalidResetTokenError(Exception):
     """Raised when reset token is invalid or expired."""
@@ -40,8 +44,6 @@ class PasswordResetService:
     _IDENTIFIER_ATTEMPT_LIMIT = 5
     _IP_ATTEMPT_LIMIT = 20
     _RESET_ATTEMPT_LIMIT = 20
-    _RESET_ALERT_WINDOW_SECONDS = 3600
-    _RESET_ALERT_THRESHOLD = 3
 
     def __init__(
         self,
@@ -49,22 +51,22 @@ class PasswordResetService:
         session_service: SessionService,
         token_service: ResetTokenService,
         send_email_fn: Optional[Callable[[str, str, str], None]] = None,
+        limiter: RateLimiter = rate_limiter,
+        velocity_tracker: ResetVelocityTracker = reset_velocity_tracker,
     ):
         self.user_service = user_service
         self.session_service = session_service
         self.token_service = token_service
         self.settings = get_settings()
-        self.rate_limiter = SlidingWindowRateLimiter(self._RATE_LIMIT_WINDOW_SECONDS)
-        self.reset_auditor = ResetAuditTracker(
-            self._RESET_ALERT_WINDOW_SECONDS,
-            self._RESET_ALERT_THRESHOLD,
-        )
+        self.rate_limiter = limiter
+        # Most restrictive bucket checked by the last call, for RateLimit-* headers.
+        self.rate_limit: RateLimitResult | None = None
+        self.reset_auditor = velocity_tracker
         self.notifier = ResetNotifier(self.settings, send_email_fn)
 
     def initiate_reset(self, identifier: str, client_ip: str | None = None) -> bool:
-        identifier_key = identifier.lower()
-        self._enforce_rate_limit(identifier_key, self._IDENTIFIER_ATTEMPT_LIMIT)
-        self._enforce_rate_limit(client_ip or "unknown", self._IP_ATTEMPT_LIMIT)
+        self._enforce_rate_limit("reset:identifier", identifier.lower(), self._IDENTIFIER_ATTEMPT_LIMIT)
+        self._enforce_rate_limit("reset:ip", client_ip or "unknown", self._IP_ATTEMPT_LIMIT)
 
         user = self.user_service.get_by_identifier(identifier)
         if not user or user.status != UserStatus.ACTIVE:
@@ -83,7 +85,7 @@ class PasswordResetService:
     ) -> PasswordResetResult:
         validators.validate_password(new_password)
 
-        self._enforce_rate_limit(client_ip or "unknown", self._RESET_ATTEMPT_LIMIT)
+        self._enforce_rate_limit("reset-complete:ip", client_ip or "unknown", self._RESET_ATTEMPT_LIMIT)
 
         user_id = self.token_service.consume_reset_token(token)
         if not user_id:
@@ -97,7 +99,26 @@ class PasswordResetService:
         if verify_password(new_password, user.hashed_password):
             raise PasswordReuseError()
 
-        suspicious = self.reset_auditor.record(user.id, client_ip or "unknown")
+        suspicious = self._audit_reset(user, client_ip)
+        self._update_password(user, new_password)
+        # Other reset links mailed to the user must not outlive the password they were meant to replace.
+        self.token_service.invalidate_user_tokens(user.id)
+        self.session_service.revoke_all_sessions(user.id)
+        session_id = self.session_service.create_session(
+            user.id,
+            user_agent=user_agent,
+            ip=client_ip,
+        )
+        return PasswordResetResult(session_id=session_id, suspicious=suspicious)
+
+    def _update_password(self, user: User, new_password: str) -> User:
+        return self.user_service.set_password(user, new_password)
+
+    def _audit_reset(self, user: User, client_ip: str | None) -> bool:
+        return self._log_reset(user, client_ip, self.reset_auditor.record(user.id, client_ip or "unknown"))
+
+    def _log_reset(self, user: User, client_ip: str | None, reset_count: int) -> bool:
+        suspicious = self.reset_auditor.is_suspicious(reset_count)
         logger.info(
             "Password reset completed",
             extra={
@@ -113,22 +134,89 @@ class PasswordResetService:
                 extra={
                     "user_id": str(user.id),
                     "ip": client_ip or "unknown",
-                    "reset_count_window": self.reset_auditor.count_for(user.id),
+                    "reset_count_window": reset_count,
                 },
             )
+        return suspicious
 
-        self._update_password(user, new_password)
-        self.session_service.revoke_all_sessions(user.id)
-        session_id = self.session_service.create_session(
+    def _enforce_rate_limit(self, scope: str, key: str, limit: int) -> None:
+        self._check_rate_limit(self.rate_limiter.hit(scope, key, limit, self._RATE_LIMIT_WINDOW_SECONDS))
+
+    def _check_rate_limit(self, result: RateLimitResult) -> None:
+        self.rate_limit = most_restrictive(self.rate_limit, result)
+        if not result.allowed:
+            raise RateLimitError(result)
+
+
+class AsyncPasswordResetService(PasswordResetService):
+    """
+    Event-loop flavour of PasswordResetService used when async_mode is enabled.
+    """
+
+    def __init__(
+        self,
+        user_service: AsyncUserService,
+        session_service: AsyncSessionService,
+        token_service: AsyncResetTokenService,
+        send_email_fn: Optional[Callable[[str, str, str], None]] = None,
+        limiter: RateLimiter = rate_limiter,
+        velocity_tracker: ResetVelocityTracker = reset_velocity_tracker,
+    ):
+        super().__init__(user_service, session_service, token_service, send_email_fn, limiter, velocity_tracker)
+
+    async def initiate_reset(self, identifier: str, client_ip: str | None = None) -> bool:
+        await self._enforce_rate_limit("reset:identifier", identifier.lower(), self._IDENTIFIER_ATTEMPT_LIMIT)
+        await self._enforce_rate_limit("reset:ip", client_ip or "unknown", self._IP_ATTEMPT_LIMIT)
+
+        user = await self.user_service.get_by_identifier(identifier)
+        if not user or user.status != UserStatus.ACTIVE:
+            return False
+
+        token = await self.token_service.create_reset_token(user.id)
+        await self.notifier.dispatch_async(user, token)
+        return True
+
+    async def complete_reset(
+        self,
+        token: str,
+        new_password: str,
+        client_ip: str | None = None,
+        user_agent: str | None = None,
+    ) -> PasswordResetResult:
+        validators.validate_password(new_password)
+
+        await self._enforce_rate_limit("reset-complete:ip", client_ip or "unknown", self._RESET_ATTEMPT_LIMIT)
+
+        user_id = await self.token_service.consume_reset_token(token)
+        if not user_id:
+            logger.warning("Password reset failed: invalid token")
+            raise InvalidResetTokenError()
+
+        user = await self.user_service.repo.get(user_id)
+        if not user:
+            raise InvalidResetTokenError()
+
+        if await verify_password_async(new_password, user.hashed_password):
+            raise PasswordReuseError()
+
+        suspicious = await self._audit_reset(user, client_ip)
+        await self._update_password(user, new_password)
+        await self.token_service.invalidate_user_tokens(user.id)
+        await self.session_service.revoke_all_sessions(user.id)
+        session_id = await self.session_service.create_session(
             user.id,
             user_agent=user_agent,
             ip=client_ip,
         )
         return PasswordResetResult(session_id=session_id, suspicious=suspicious)
 
-    def _update_password(self, user: User, new_password: str) -> User:
-        return self.user_service.set_password(user, new_password)
+    async def _update_password(self, user: User, new_password: str) -> User:
+        return await self.user_service.set_password(user, new_password)
+
+    async def _enforce_rate_limit(self, scope: str, key: str, limit: int) -> None:
+        result = await self.rate_limiter.hit_async(scope, key, limit, self._RATE_LIMIT_WINDOW_SECONDS)
+        self._check_rate_limit(result)
 
-    def _enforce_rate_limit(self, key: str, limit: int) -> None:
-        if self.rate_limiter.exceeded(key, limit):
-            raise RateLimitError()
+    async def _audit_reset(self, user: User, client_ip: str | None) -> bool:
+        reset_count = await self.reset_auditor.record_async(user.id, client_ip or "unknown")
+        return self._log_reset(user, client_ip, reset_count)
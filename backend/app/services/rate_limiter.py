@@ -0,0 +1,148 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.redis_client import async_redis_client, redis_client
+
+logger = logging.getLogger(__name__)
+
+# GCRA: one stored value (the theoretical arrival time, ms) per key.
+# KEYS[1] bucket key | ARGV[1] emission interval ms, ARGV[2] burst window ms (interval * limit)
+# Returns {allowed, remaining, reset_after_ms, retry_after_ms}. Uses the Redis clock
+# so every worker agrees on "now".
+GCRA = """
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - window
+if now < allow_at then
+  return {0, 0, tat - now, allow_at - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, math.floor((now - allow_at) / interval), new_tat - now, 0}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # Seconds until the bucket is completely drained.
+    retry_after: float  # Seconds until the next request would be allowed; 0 when allowed.
+
+    def headers(self) -> dict[str, str]:
+        """RateLimit-* response headers (IETF draft), plus Retry-After when rejected."""
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(math.ceil(self.retry_after), 1))
+        return headers
+
+
+def most_restrictive(*results: RateLimitResult | None) -> RateLimitResult | None:
+    """Pick the result to report when a request is checked against several buckets."""
+    present = [result for result in results if result is not None]
+    if not present:
+        return None
+    return min(present, key=lambda r: (r.allowed, r.remaining, -r.reset_after))
+
+
+class RateLimiter:
+    """
+    GCRA rate limiter shared by every worker through an atomic Redis script.
+
+    Each key costs one Redis string regardless of the limit. If Redis is unreachable
+    the limiter degrades to an in-process GCRA (bounded LRU of keys) rather than
+    failing the request or letting it through unchecked.
+    """
+
+    KEY_PREFIX = "rate:"
+
+    def __init__(self, local_max_keys: int, client=redis_client, async_client=async_redis_client):
+        self.local_max_keys = local_max_keys
+        self.client = client
+        self.async_client = async_client
+        self._script = client.register_script(GCRA)
+        self._async_script = async_client.register_script(GCRA)
+        self._lock = threading.Lock()
+        self._local: OrderedDict[str, float] = OrderedDict()
+        self.fallbacks = 0
+
+    def hit(self, scope: str, key: str, limit: int, period_seconds: float) -> RateLimitResult:
+        """Count one request against scope/key, allowing `limit` per `period_seconds`."""
+        interval_ms, window_ms = self._params(limit, period_seconds)
+        try:
+            reply = self._script(keys=[self._key(scope, key)], args=[interval_ms, window_ms])
+        except RedisError:
+            return self._hit_local(scope, key, limit, interval_ms, window_ms)
+        return self._result(reply, limit)
+
+    async def hit_async(self, scope: str, key: str, limit: int, period_seconds: float) -> RateLimitResult:
+        interval_ms, window_ms = self._params(limit, period_seconds)
+        try:
+            reply = await self._async_script(keys=[self._key(scope, key)], args=[interval_ms, window_ms])
+        except RedisError:
+            return self._hit_local(scope, key, limit, interval_ms, window_ms)
+        return self._result(reply, limit)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"local_keys": len(self._local), "fallbacks": self.fallbacks}
+
+    def _hit_local(self, scope: str, key: str, limit: int, interval_ms: int, window_ms: int) -> RateLimitResult:
+        if self.fallbacks == 0:
+            logger.warning("Redis unavailable; rate limiting falls back to per-process buckets")
+        bucket = self._key(scope, key)
+        now = time.time() * 1000
+        with self._lock:
+            self.fallbacks += 1
+            tat = max(self._local.get(bucket, now), now)
+            new_tat = tat + interval_ms
+            allow_at = new_tat - window_ms
+            if now < allow_at:
+                return RateLimitResult(False, limit, 0, (tat - now) / 1000, (allow_at - now) / 1000)
+            self._local[bucket] = new_tat
+            self._local.move_to_end(bucket)
+            self._evict(now)
+        remaining = int((now - allow_at) // interval_ms)
+        return RateLimitResult(True, limit, remaining, (new_tat - now) / 1000, 0.0)
+
+    def _evict(self, now: float) -> None:
+        # Oldest-touched first; drained buckets carry no state worth keeping.
+        while self._local:
+            bucket, tat = next(iter(self._local.items()))
+            if tat > now and len(self._local) <= self.local_max_keys:
+                break
+            self._local.popitem(last=False)
+
+    @staticmethod
+    def _params(limit: int, period_seconds: float) -> tuple[int, int]:
+        interval_ms = max(int(period_seconds * 1000 / max(limit, 1)), 1)
+        return interval_ms, interval_ms * max(limit, 1)
+
+    @staticmethod
+    def _result(reply: list, limit: int) -> RateLimitResult:
+        allowed, remaining, reset_ms, retry_ms = (int(value) for value in reply)
+        return RateLimitResult(bool(allowed), limit, remaining, reset_ms / 1000, retry_ms / 1000)
+
+    def _key(self, scope: str, key: str) -> str:
+        return f"{self.KEY_PREFIX}{scope}:{key}"
+
+
+settings = get_settings()
+
+rate_limiter = RateLimiter(settings.rate_limit_local_max_keys)
@@ -1,45 +1,180 @@
-import json
+import hashlib
 import secrets
 from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
 from app.core.config import Settings
-from app.core.redis_client import redis_client
+from app.core.metrics import REDIS_SECONDS, timer
+from app.core.redis_client import async_redis_client, redis_client
+from app.core.serialization import dumps, loads
+
+# Token keys of dropped, consumed or invalidated tokens are built from ARGV prefixes, so
+# like session_scripts these need a single (non-cluster) Redis node.
+
+# Store, dropping the user's oldest tokens beyond the cap.
+# Index scores are issue order: server milliseconds, bumped past the newest entry so tokens
+# issued in the same millisecond still rank strictly by issue. Expiry is the token key's TTL,
+# so entries whose key has gone are dropped first.
+# KEYS[1] token key, KEYS[2] user token index | ARGV[1] token digest, ARGV[2] payload, ARGV[3] ttl seconds,
+# ARGV[4] max tokens per user, ARGV[5] token key prefix
+# Returns the number of older tokens invalidated.
+ISSUE_RESET_TOKEN = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local ttl = tonumber(ARGV[3])
+for _, digest in ipairs(redis.call('ZRANGE', KEYS[2], 0, -1)) do
+  if redis.call('EXISTS', ARGV[5] .. digest) == 0 then redis.call('ZREM', KEYS[2], digest) end
+end
+local excess = redis.call('ZCARD', KEYS[2]) - tonumber(ARGV[4]) + 1
+local dropped = {}
+if excess > 0 then
+  dropped = redis.call('ZRANGE', KEYS[2], 0, excess - 1)
+  for _, digest in ipairs(dropped) do redis.call('DEL', ARGV[5] .. digest) end
+  redis.call('ZREMRANGEBYRANK', KEYS[2], 0, excess - 1)
+end
+local newest = redis.call('ZRANGE', KEYS[2], -1, -1, 'WITHSCORES')[2]
+local score = now
+if newest and tonumber(newest) >= now then score = tonumber(newest) + 1 end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ttl)
+redis.call('ZADD', KEYS[2], score, ARGV[1])
+if redis.call('TTL', KEYS[2]) < ttl then redis.call('EXPIRE', KEYS[2], ttl) end
+return #dropped
+"""
+
+# Read and delete in one step, so concurrent requests can't both consume a token.
+# KEYS[1] token key, KEYS[2] key used by older releases (raw token) | ARGV[1] token digest, ARGV[2] user index prefix
+CONSUME_RESET_TOKEN = """
+local raw = redis.call('GET', KEYS[1])
+if raw then
+  redis.call('DEL', KEYS[1])
+  local ok, payload = pcall(cjson.decode, raw)
+  if ok and type(payload) == 'table' and type(payload.user_id) == 'string' then
+    redis.call('ZREM', ARGV[2] .. payload.user_id, ARGV[1])
+  end
+  return raw
+end
+raw = redis.call('GET', KEYS[2])
+if raw then redis.call('DEL', KEYS[2]) end
+return raw
+"""
+
+# KEYS[1] user token index | ARGV[1] token key prefix
+# Returns the number of tokens invalidated.
+INVALIDATE_RESET_TOKENS = """
+local digests = redis.call('ZRANGE', KEYS[1], 0, -1)
+for _, digest in ipairs(digests) do redis.call('DEL', ARGV[1] .. digest) end
+redis.call('DEL', KEYS[1])
+return #digests
+"""
 
 
 class ResetTokenService:
     """
     Issue and consume short-lived password reset tokens in Redis.
+
+    Tokens are stored under a SHA-256 digest of their value, so a Redis dump or
+    MONITOR output can't be replayed against /password/reset. Each user's live
+    tokens are indexed in reset_user:<uuid>, a sorted set in issue order that caps
+    them at reset_tokens_per_user (oldest dropped first); every operation is one
+    script call.
     """
 
-    RESET_TOKEN_PREFIX = "reset:"
+    RESET_TOKEN_PREFIX = "reset_token:"
+    LEGACY_RESET_TOKEN_PREFIX = "reset:"
+    USER_INDEX_PREFIX = "reset_user:"
 
     def __init__(self, settings: Settings, client=redis_client, default_ttl_seconds: int = 3600):
         self.settings = settings
         self.client = client
         self.default_ttl_seconds = default_ttl_seconds
+        self._issue_script = client.register_script(ISSUE_RESET_TOKEN)
+        self._consume_script = client.register_script(CONSUME_RESET_TOKEN)
+        self._invalidate_script = client.register_script(INVALIDATE_RESET_TOKENS)
 
     def create_reset_token(self, user_id: UUID, ttl_seconds: Optional[int] = None) -> str:
+        token, args = self._issue_args(user_id, ttl_seconds)
+        with timer(REDIS_SECONDS, operation="reset_create"):
+            self._issue_script(**args)
+        return token
+
+    def consume_reset_token(self, token: str) -> UUID | None:
+        with timer(REDIS_SECONDS, operation="reset_consume"):
+            raw = self._consume_script(**self._consume_args(token))
+        return self._decode_user_id(raw) if raw else None
+
+    def invalidate_user_tokens(self, user_id: UUID) -> int:
+        """Drop every outstanding reset token for the user (e.g. after a password change)."""
+        with timer(REDIS_SECONDS, operation="reset_invalidate"):
+            return int(self._invalidate_script(**self._invalidate_args(user_id)))
+
+    def _issue_args(self, user_id: UUID, ttl_seconds: Optional[int]) -> tuple[str, dict]:
         token = secrets.token_urlsafe(32)
+        digest = self._digest(token)
         payload = {
             "user_id": str(user_id),
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": datetime.now(timezone.utc),
+        }
+        return token, {
+            "keys": [self._reset_key(digest), self._user_index_key(user_id)],
+            "args": [
+                digest,
+                dumps(payload),
+                ttl_seconds or self.default_ttl_seconds,
+                max(self.settings.reset_tokens_per_user, 1),
+                self.RESET_TOKEN_PREFIX,
+            ],
         }
-        ttl = ttl_seconds or self.default_ttl_seconds
-        self.client.setex(self._reset_key(token), ttl, json.dumps(payload))
-        return token
 
-    def consume_reset_token(self, token: str) -> UUID | None:
-        raw = self.client.get(self._reset_key(token))
-        if not raw:
-            return None
-        self.client.delete(self._reset_key(token))
+    def _consume_args(self, token: str) -> dict:
+        digest = self._digest(token)
+        return {
+            "keys": [self._reset_key(digest), f"{self.LEGACY_RESET_TOKEN_PREFIX}{token}"],
+            "args": [digest, self.USER_INDEX_PREFIX],
+        }
+
+    def _invalidate_args(self, user_id: UUID) -> dict:
+        return {"keys": [self._user_index_key(user_id)], "args": [self.RESET_TOKEN_PREFIX]}
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        # Tokens carry 256 random bits, so a fast unsalted hash is enough.
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @staticmethod
+    def _decode_user_id(raw: str) -> UUID | None:
         try:
-            payload = json.loads(raw)
+            payload = loads(raw)
             return UUID(payload.get("user_id"))
-        except (ValueError, TypeError, json.JSONDecodeError):
+        except (ValueError, TypeError, AttributeError):
             return None
 
-    def _reset_key(self, token: str) -> str:
-        return f"{self.RESET_TOKEN_PREFIX}{token}"
+    def _reset_key(self, digest: str) -> str:
+        return f"{self.RESET_TOKEN_PREFIX}{digest}"
+
+    def _user_index_key(self, user_id: UUID) -> str:
+        return f"{self.USER_INDEX_PREFIX}{user_id}"
+
+
+class AsyncResetTokenService(ResetTokenService):
+    """
+    redis.asyncio flavour of ResetTokenService used when async_mode is enabled.
+    """
+
+    def __init__(self, settings: Settings, client=async_redis_client, default_ttl_seconds: int = 3600):
+        super().__init__(settings, client, default_ttl_seconds)
+
+    async def create_reset_token(self, user_id: UUID, ttl_seconds: Optional[int] = None) -> str:
+        token, args = self._issue_args(user_id, ttl_seconds)
+        with timer(REDIS_SECONDS, operation="reset_create"):
+            await self._issue_script(**args)
+        return token
+
+    async def consume_reset_token(self, token: str) -> UUID | None:
+        with timer(REDIS_SECONDS, operation="reset_consume"):
+            raw = await self._consume_script(**self._consume_args(token))
+        return self._decode_user_id(raw) if raw else None
+
+    async def invalidate_user_tokens(self, user_id: UUID) -> int:
+        with timer(REDIS_SECONDS, operation="reset_invalidate"):
+            return int(await self._invalidate_script(**self._invalidate_args(user_id)))
@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable
+from uuid import UUID
+
+from app.core.config import get_settings
+from app.services.session_tokens import RevokedSessions
+
+logger = logging.getLogger(__name__)
+
+
+class SessionCache:
+    """
+    Bounded, TTL-based in-process cache of session_id -> (user_id, expiry).
+
+    Sits in front of SessionService so hot sessions skip Redis; revocations are
+    fanned out to every worker over Redis pub/sub (see SessionRevocationListener).
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[UUID, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, session_id: str) -> UUID | None:
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            user_id, expires_at = entry
+            if expires_at <= now:
+                del self._entries[session_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return user_id
+
+    def put(self, session_id: str, user_id: UUID) -> None:
+        if not self.enabled:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[session_id] = (user_id, expires_at)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, session_ids: Iterable[str]) -> None:
+        with self._lock:
+            for session_id in session_ids:
+                if self._entries.pop(session_id, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class SessionRevocationListener:
+    """
+    Subscribes to the revocation channel and drops revoked ids from the local cache.
+
+    Given a RevokedSessions (stateless mode), also adds the ids to it, loading the ids
+    recorded in Redis on start and again whenever messages may have been missed.
+    """
+
+    def __init__(self, cache: SessionCache, client, channel: str, revoked: RevokedSessions | None = None):
+        self.cache = cache
+        self.client = client
+        self.channel = channel
+        self.revoked = revoked
+        self._pubsub = None
+        self._thread = None
+
+    def start(self) -> None:
+        if (not self.cache.enabled and self.revoked is None) or self._thread is not None:
+            return
+        try:
+            self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{self.channel: self._handle})
+            self._thread = self._pubsub.run_in_thread(
+                sleep_time=1.0,
+                daemon=True,
+                exception_handler=self._on_error,
+            )
+        except Exception:
+            # Without the channel we can't hear remote revocations; entries still age out via TTL.
+            logger.exception("Session revocation listener failed to start")
+        # After subscribing, so nothing revoked between the load and the subscription is lost.
+        self._reload_revoked()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+    def _handle(self, message) -> None:
+        data = message.get("data")
+        if data:
+            session_ids = decode_revocation(data)
+            self.cache.invalidate(session_ids)
+            if self.revoked is not None:
+                self.revoked.add(session_ids)
+
+    def _on_error(self, exc, pubsub, thread) -> None:
+        # Messages may have been missed while disconnected, so nothing cached can be trusted.
+        logger.warning("Session revocation listener error: %s", exc)
+        self.cache.clear()
+        time.sleep(1.0)
+        self._reload_revoked()
+
+    def _reload_revoked(self) -> None:
+        if self.revoked is None:
+            return
+        try:
+            self.revoked.load()
+        except Exception:
+            logger.warning("Failed to load revoked sessions; retrying on the next listener error", exc_info=True)
+
+
+def decode_revocation(data: str) -> list[str]:
+    # Publishers (the session revocation scripts) space-join urlsafe session ids.
+    return data.split()
+
+
+settings = get_settings()
+
+session_cache = SessionCache(
+    settings.session_cache_max_entries,
+    settings.session_cache_ttl_seconds,
+)
@@ -0,0 +1,206 @@
+"""
+Server-side Lua used by SessionService so each public operation is one atomic round trip.
+
+Sessions are stored as hashes (one field per metadata item). Sessions written by
+older releases as JSON strings are converted in place the first time a script
+touches them, keeping their remaining TTL.
+
+Each user's sessions are indexed in a sorted set scored by expiry (epoch milliseconds,
+from the server clock); scripts drop members whose score has passed before reading or
+writing the index, so it stays proportional to the user's live sessions. Indexes
+written by older releases as plain sets are converted the first time they are read.
+
+Revocation scripts publish the revoked ids themselves, space-separated as
+session_cache.decode_revocation expects; an empty channel argument skips the publish.
+
+Keys passed in KEYS are the ones the caller knows up front; the rest are built inside
+the script from a prefix in ARGV and an id it has just read (the owning user's index
+from a session hash, session keys from an index). Those keys can hash to any slot,
+so these scripts, like ResetTokenService's, need a single Redis node (optionally
+with replicas or Sentinel) and are not supported on Redis Cluster.
+"""
+
+_AS_HASH = """
+local function as_hash(key)
+  local kind = redis.call('TYPE', key)['ok']
+  if kind == 'hash' then return true end
+  if kind ~= 'string' then return false end
+  local ok, payload = pcall(cjson.decode, redis.call('GET', key))
+  if not ok or type(payload) ~= 'table' then return false end
+  local ttl = redis.call('PTTL', key)
+  redis.call('DEL', key)
+  for field, value in pairs(payload) do
+    if type(value) == 'string' then redis.call('HSET', key, field, value) end
+  end
+  if ttl > 0 then redis.call('PEXPIRE', key, ttl) end
+  return true
+end
+"""
+
+# Server time in milliseconds, the unit of index scores.
+_NOW = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+"""
+
+_INDEX = _NOW + """
+-- Convert a legacy SET index, scoring members by their session's remaining TTL.
+local function as_index(key, session_prefix)
+  local kind = redis.call('TYPE', key)['ok']
+  if kind == 'zset' or kind == 'none' then return true end
+  if kind ~= 'set' then return false end
+  local ids = redis.call('SMEMBERS', key)
+  redis.call('DEL', key)
+  local latest = 0
+  for _, id in ipairs(ids) do
+    local ttl = redis.call('PTTL', session_prefix .. id)
+    if ttl > 0 then
+      redis.call('ZADD', key, now + ttl, id)
+      if ttl > latest then latest = ttl end
+    end
+  end
+  if latest > 0 then redis.call('PEXPIRE', key, latest) end
+  return true
+end
+
+local function prune(key)
+  return redis.call('ZREMRANGEBYSCORE', key, '-inf', now)
+end
+
+-- Stateless mode: record a session revoked before its token expires (the session's TTL),
+-- so workers that missed the pub/sub message can still reject it. No-op when key is nil.
+local function remember_revoked(key, session_key, id)
+  if not key then return end
+  local ttl = redis.call('PTTL', session_key)
+  if ttl <= 0 then return end
+  redis.call('ZREMRANGEBYSCORE', key, '-inf', now)
+  redis.call('ZADD', key, now + ttl, id)
+  if redis.call('PTTL', key) < ttl then redis.call('PEXPIRE', key, ttl) end
+end
+
+local function unindex(key, id)
+  local kind = redis.call('TYPE', key)['ok']
+  if kind == 'zset' then redis.call('ZREM', key, id) elseif kind == 'set' then redis.call('SREM', key, id) end
+end
+"""
+
+# Create, evicting the least recently active sessions over the per-user cap.
+# KEYS[1] session key, KEYS[2] user session index, KEYS[3] generation counter,
+# KEYS[4] revoked sessions (stateless mode only) | ARGV[1] session id,
+# ARGV[2] ttl seconds, ARGV[3] max sessions per user (0 = unlimited), ARGV[4] session key prefix,
+# ARGV[5] revocation channel, ARGV[6..] field, value pairs
+# Returns {evicted ids, current generation} (the generation goes into stateless tokens).
+CREATE_SESSION = _INDEX + """
+local ttl = tonumber(ARGV[2])
+as_index(KEYS[2], ARGV[4])
+prune(KEYS[2])
+local evicted = {}
+local cap = tonumber(ARGV[3])
+if cap > 0 then
+  local excess = redis.call('ZCARD', KEYS[2]) - cap + 1
+  if excess > 0 then
+    evicted = redis.call('ZRANGE', KEYS[2], 0, excess - 1)
+    for _, id in ipairs(evicted) do
+      remember_revoked(KEYS[4], ARGV[4] .. id, id)
+      redis.call('DEL', ARGV[4] .. id)
+    end
+    redis.call('ZREMRANGEBYRANK', KEYS[2], 0, excess - 1)
+    if ARGV[5] ~= '' then redis.call('PUBLISH', ARGV[5], table.concat(evicted, ' ')) end
+  end
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 6))
+redis.call('EXPIRE', KEYS[1], ttl)
+redis.call('ZADD', KEYS[2], now + ttl * 1000, ARGV[1])
+-- Every session shares one max age, so the newest one outlives the rest of the index.
+redis.call('EXPIRE', KEYS[2], ttl)
+return {evicted, redis.call('GET', KEYS[3]) or '0'}
+"""
+
+# Validate and touch, sliding the session's index score along with its TTL.
+# KEYS[1] session key | ARGV[1] ttl seconds, ARGV[2] last_seen timestamp ('' slides the TTL only),
+# ARGV[3] session id, ARGV[4] user index prefix
+TOUCH_SESSION = _AS_HASH + _NOW + """
+if not as_hash(KEYS[1]) then return false end
+local user_id = redis.call('HGET', KEYS[1], 'user_id')
+if not user_id then return false end
+if ARGV[2] ~= '' then redis.call('HSET', KEYS[1], 'last_seen', ARGV[2]) end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+-- A legacy set index refuses the ZADD and is left for the next list, create or sweep to convert.
+local index = ARGV[4] .. user_id
+if type(redis.pcall('ZADD', index, now + tonumber(ARGV[1]) * 1000, ARGV[3])) == 'number' then
+  redis.call('EXPIRE', index, ARGV[1])
+end
+return user_id
+"""
+
+# KEYS[1] user session index | ARGV[1] session key prefix
+# Returns {{id, {field, value, ...}}, ...} for live sessions, least recently active first.
+LIST_SESSIONS = _AS_HASH + _INDEX + """
+local out = {}
+if not as_index(KEYS[1], ARGV[1]) then return out end
+prune(KEYS[1])
+for _, id in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+  local key = ARGV[1] .. id
+  if as_hash(key) then
+    out[#out + 1] = {id, redis.call('HGETALL', key)}
+  else
+    redis.call('ZREM', KEYS[1], id)
+  end
+end
+return out
+"""
+
+# KEYS[1] session key, KEYS[2] revoked sessions (stateless mode only) | ARGV[1] session id,
+# ARGV[2] user index prefix, ARGV[3] revocation channel
+REVOKE_SESSION = _AS_HASH + _INDEX + """
+local found = as_hash(KEYS[1])
+local user_id = found and redis.call('HGET', KEYS[1], 'user_id')
+if found then remember_revoked(KEYS[2], KEYS[1], ARGV[1]) end
+redis.call('DEL', KEYS[1])
+if user_id then unindex(ARGV[2] .. user_id, ARGV[1]) end
+if ARGV[3] ~= '' then redis.call('PUBLISH', ARGV[3], ARGV[1]) end
+return found and 1 or 0
+"""
+
+# Revoke if owned by user.
+# KEYS[1] session key, KEYS[2] user session index, KEYS[3] revoked sessions (stateless mode only)
+# | ARGV[1] session id, ARGV[2] user id, ARGV[3] channel
+REVOKE_OWNED_SESSION = _AS_HASH + _INDEX + """
+if not as_hash(KEYS[1]) then
+  unindex(KEYS[2], ARGV[1])
+  return 0
+end
+if redis.call('HGET', KEYS[1], 'user_id') ~= ARGV[2] then return 0 end
+remember_revoked(KEYS[3], KEYS[1], ARGV[1])
+redis.call('DEL', KEYS[1])
+unindex(KEYS[2], ARGV[1])
+if ARGV[3] ~= '' then redis.call('PUBLISH', ARGV[3], ARGV[1]) end
+return 1
+"""
+
+# Revoke all for user, bumping their session generation (invalidates stateless tokens).
+# KEYS[1] user session index, KEYS[2] generation counter | ARGV[1] session key prefix, ARGV[2] revocation channel
+# Returns {new generation, revoked ids}; expired index entries are dropped without being published.
+REVOKE_ALL_SESSIONS = _INDEX + """
+local generation = redis.call('INCR', KEYS[2])
+local ids = {}
+if as_index(KEYS[1], ARGV[1]) then
+  ids = redis.call('ZRANGEBYSCORE', KEYS[1], '(' .. now, '+inf')
+end
+for _, id in ipairs(ids) do
+  redis.call('DEL', ARGV[1] .. id)
+end
+redis.call('DEL', KEYS[1])
+if #ids > 0 and ARGV[2] ~= '' then
+  redis.call('PUBLISH', ARGV[2], table.concat(ids, ' '))
+end
+return {generation, ids}
+"""
+
+# Sweep one index (SessionIndexSweeper).
+# KEYS[1] user session index | ARGV[1] session key prefix
+# Returns the number of expired entries removed.
+PRUNE_INDEX = _INDEX + """
+if not as_index(KEYS[1], ARGV[1]) then return 0 end
+return prune(KEYS[1])
+"""
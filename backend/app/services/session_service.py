@@ -1,26 +1,86 @@
-import json
 import secrets
+import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 from uuid import UUID
 
 from app.core.config import Settings
-from app.core.redis_client import redis_client
+from app.core.metrics import REDIS_SECONDS, timer
+from app.core.redis_client import async_redis_client, count_round_trips, redis_client
+from app.services import session_scripts
+from app.services.last_seen import LastSeenBuffer, last_seen_buffer
+from app.services.session_cache import SessionCache, session_cache
+from app.services.session_tokens import (
+    REVOKED_SESSIONS_KEY,
+    RevokedSessions,
+    SessionClaims,
+    SessionGenerations,
+    generation_key,
+    revoked_sessions,
+    session_generations,
+)
 
 
-class SessionService:
+class _SessionStore:
     """
-    Redis-backed session management.
+    Key layout, scripts and payload handling shared by the sync and async session services.
+
+    Sessions live in hashes under session:<id> (legacy JSON strings are migrated on
+    first touch, see session_scripts) and are indexed per user in user_sessions:<uuid>,
+    a sorted set scored by expiry that the scripts prune as they go (and
+    SessionIndexSweeper prunes for idle users). session_max_per_user caps each index by
+    evicting the least recently active sessions on create.
+
+    Every public operation is a single script call; round_trips counts the requests
+    this instance actually wrote to Redis (see count_round_trips) so callers and tests
+    can assert on it.
+
+    With session_mode="stateless", create_session returns encoded SessionClaims instead
+    of the bare id (the Redis record is still written for listings and revocation), and
+    security verifies those tokens locally against SessionGenerations and RevokedSessions;
+    the scripts also record individually revoked ids in REVOKED_SESSIONS_KEY.
     """
 
     SESSION_PREFIX = "session:"
     SESSION_SET_PREFIX = "user_sessions:"
+    SESSION_FIELDS = ("user_id", "created_at", "issued_at", "user_agent", "ip", "last_seen")
 
-    def __init__(self, settings: Settings, client=redis_client):
+    def __init__(
+        self,
+        settings: Settings,
+        client,
+        cache: SessionCache,
+        last_seen: LastSeenBuffer,
+        generations: SessionGenerations,
+        revoked: RevokedSessions,
+    ):
         self.settings = settings
         self.client = client
+        self.cache = cache
+        self.last_seen = last_seen
+        self.generations = generations
+        self.revoked = revoked
+        self.round_trips = 0
+        self._create_script = client.register_script(session_scripts.CREATE_SESSION)
+        self._touch_script = client.register_script(session_scripts.TOUCH_SESSION)
+        self._list_script = client.register_script(session_scripts.LIST_SESSIONS)
+        self._revoke_script = client.register_script(session_scripts.REVOKE_SESSION)
+        self._revoke_owned_script = client.register_script(session_scripts.REVOKE_OWNED_SESSION)
+        self._revoke_all_script = client.register_script(session_scripts.REVOKE_ALL_SESSIONS)
 
-    def create_session(self, user_id: UUID, user_agent: Optional[str] = None, ip: Optional[str] = None) -> str:
+    @contextmanager
+    def _round_trip(self, operation: str):
+        """Time one operation and add the Redis requests it made to round_trips."""
+        with timer(REDIS_SECONDS, operation=f"session_{operation}"), count_round_trips() as tally:
+            try:
+                yield
+            finally:
+                self.round_trips += tally[0]
+
+    def _new_session(
+        self, user_id: UUID, user_agent: Optional[str] = None, ip: Optional[str] = None
+    ) -> tuple[str, Dict[str, Optional[str]]]:
         session_id = secrets.token_urlsafe(32)
         now = datetime.now(timezone.utc).isoformat()
         metadata = {
@@ -31,85 +91,243 @@ class SessionService:
             "ip": ip,
             "last_seen": now,
         }
-        self.client.setex(
-            self._session_key(session_id),
-            self.settings.session_max_age_seconds,
-            json.dumps(metadata),
-        )
-        self.client.sadd(self._user_sessions_key(user_id), session_id)
-        self.client.expire(self._user_sessions_key(user_id), self.settings.session_max_age_seconds)
-        return session_id
+        return session_id, metadata
 
-    def get_user_id_for_session(self, session_id: str) -> UUID | None:
-        raw = self.client.get(self._session_key(session_id))
-        if not raw:
-            return None
-        try:
-            payload = json.loads(raw)
-            payload["last_seen"] = datetime.now(timezone.utc).isoformat()
-            self.client.setex(
+    def _create_args(self, session_id: str, user_id: UUID, metadata: Dict[str, Optional[str]]) -> dict:
+        # Hash fields can't hold None; absent fields read back as None in listings.
+        fields = [item for field, value in metadata.items() if value is not None for item in (field, value)]
+        return {
+            "keys": [
                 self._session_key(session_id),
+                self._user_sessions_key(user_id),
+                generation_key(user_id),
+                *self._revoked_keys(),
+            ],
+            "args": [
+                session_id,
                 self.settings.session_max_age_seconds,
-                json.dumps(payload),
-            )
-            return UUID(payload.get("user_id"))
-        except (ValueError, TypeError, json.JSONDecodeError):
+                self.settings.session_max_per_user,
+                self.SESSION_PREFIX,
+                self._revocation_channel(),
+                *fields,
+            ],
+        }
+
+    @property
+    def stateless(self) -> bool:
+        return self.settings.session_mode == "stateless"
+
+    def _revoked_keys(self) -> list[str]:
+        # Only stateless tokens outlive their Redis record, so only they need the record.
+        return [REVOKED_SESSIONS_KEY] if self.stateless else []
+
+    def _forget(self, session_ids: list[str]) -> None:
+        """Drop revoked sessions from this worker's cache (and, for stateless tokens, reject them)."""
+        self.cache.invalidate(session_ids)
+        if self.stateless:
+            self.revoked.add(session_ids)
+
+    def _revoke_args(self, session_id: str) -> dict:
+        return {
+            "keys": [self._session_key(session_id), *self._revoked_keys()],
+            "args": [session_id, self.SESSION_SET_PREFIX, self._revocation_channel()],
+        }
+
+    def _revoke_owned_args(self, user_id: UUID, session_id: str) -> dict:
+        return {
+            "keys": [self._session_key(session_id), self._user_sessions_key(user_id), *self._revoked_keys()],
+            "args": [session_id, str(user_id), self._revocation_channel()],
+        }
+
+    def _issue_token(self, session_id: str, user_id: UUID, reply: list) -> str:
+        evicted, generation = reply
+        self._forget(evicted or [])
+        if not self.stateless:
+            return session_id
+        generation = self.generations.set(user_id, int(generation))
+        issued_at = int(time.time())
+        claims = SessionClaims(
+            session_id,
+            user_id,
+            issued_at,
+            issued_at + self.settings.session_max_age_seconds,
+            generation,
+        )
+        return claims.encode()
+
+    @staticmethod
+    def _session_id(token: str) -> str:
+        """Accept either a bare session id or a stateless token and return the session id."""
+        claims = SessionClaims.decode(token)
+        return claims.session_id if claims else token
+
+    def _revoke_all_args(self, user_id: UUID) -> dict:
+        return {
+            "keys": [self._user_sessions_key(user_id), generation_key(user_id)],
+            "args": [self.SESSION_PREFIX, self._revocation_channel()],
+        }
+
+    def _apply_revoke_all(self, user_id: UUID, reply) -> None:
+        generation, session_ids = reply
+        self.generations.set(user_id, int(generation))
+        self.cache.invalidate(session_ids or [])
+
+    def _touch_args(self, session_id: str) -> list:
+        # With buffered last_seen the script only slides the TTL.
+        last_seen = "" if self.last_seen.enabled else datetime.now(timezone.utc).isoformat()
+        return [self.settings.session_max_age_seconds, last_seen, session_id, self.SESSION_SET_PREFIX]
+
+    @staticmethod
+    def _as_uuid(value: str | None) -> UUID | None:
+        try:
+            return UUID(value) if value else None
+        except (ValueError, TypeError):
             return None
 
-    def list_sessions(self, user_id: UUID) -> List[Dict[str, Optional[str]]]:
-        session_ids = self.client.smembers(self._user_sessions_key(user_id)) or []
+    @classmethod
+    def _decode_listing(cls, rows: list) -> List[Dict[str, Optional[str]]]:
         sessions: List[Dict[str, Optional[str]]] = []
-        for session_id in session_ids:
-            raw = self.client.get(self._session_key(session_id))
-            if not raw:
-                continue
-            try:
-                meta = json.loads(raw)
-                meta["id"] = session_id
-                sessions.append(meta)
-            except json.JSONDecodeError:
-                continue
+        for session_id, flat in rows:
+            meta: Dict[str, Optional[str]] = dict.fromkeys(cls.SESSION_FIELDS)
+            meta.update(zip(flat[::2], flat[1::2]))
+            meta["id"] = session_id
+            sessions.append(meta)
         return sessions
 
-    def revoke_session(self, session_id: str) -> None:
-        raw = self.client.get(self._session_key(session_id))
-        user_id = None
-        if raw:
-            try:
-                user_id = json.loads(raw).get("user_id")
-            except json.JSONDecodeError:
-                user_id = None
-        self.client.delete(self._session_key(session_id))
+    def _revocation_channel(self) -> str:
+        # Only publish when there are caches or stateless revocation sets to keep coherent.
+        return self.settings.session_revocation_channel if self.cache.enabled or self.stateless else ""
+
+    def _session_key(self, session_id: str) -> str:
+        return f"{self.SESSION_PREFIX}{session_id}"
+
+    def _user_sessions_key(self, user_id: UUID) -> str:
+        return f"{self.SESSION_SET_PREFIX}{user_id}"
+
+
+class SessionService(_SessionStore):
+    """
+    Redis-backed session management.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        client=redis_client,
+        cache: SessionCache = session_cache,
+        last_seen: LastSeenBuffer = last_seen_buffer,
+        generations: SessionGenerations = session_generations,
+        revoked: RevokedSessions = revoked_sessions,
+    ):
+        super().__init__(settings, client, cache, last_seen, generations, revoked)
+
+    def create_session(self, user_id: UUID, user_agent: Optional[str] = None, ip: Optional[str] = None) -> str:
+        session_id, metadata = self._new_session(user_id, user_agent, ip)
+        with self._round_trip("create"):
+            reply = self._create_script(**self._create_args(session_id, user_id, metadata))
+        return self._issue_token(session_id, user_id, reply)
+
+    def get_user_id_for_session(self, session_id: str) -> UUID | None:
+        cached = self.cache.get(session_id)
+        if cached:
+            self.last_seen.touch(session_id)
+            return cached
+        with self._round_trip("touch"):
+            user_id = self._as_uuid(self._touch_script(keys=[self._session_key(session_id)], args=self._touch_args(session_id)))
         if user_id:
-            self.client.srem(self._user_sessions_key(UUID(user_id)), session_id)
+            self.last_seen.touch(session_id)
+            self.cache.put(session_id, user_id)
+        return user_id
+
+    def list_sessions(self, user_id: UUID) -> List[Dict[str, Optional[str]]]:
+        with self._round_trip("list"):
+            rows = self._list_script(keys=[self._user_sessions_key(user_id)], args=[self.SESSION_PREFIX])
+        return self._decode_listing(rows or [])
+
+    def revoke_session(self, session_id: str) -> None:
+        session_id = self._session_id(session_id)
+        self._forget([session_id])
+        with self._round_trip("revoke"):
+            self._revoke_script(**self._revoke_args(session_id))
 
     def revoke_all_sessions(self, user_id: UUID) -> None:
-        session_ids = self.client.smembers(self._user_sessions_key(user_id)) or []
-        if session_ids:
-            keys = [self._session_key(sid) for sid in session_ids]
-            self.client.delete(*keys)
-        self.client.delete(self._user_sessions_key(user_id))
+        with self._round_trip("revoke_all"):
+            reply = self._revoke_all_script(**self._revoke_all_args(user_id))
+        self._apply_revoke_all(user_id, reply)
 
     def revoke_session_for_user(self, user_id: UUID, session_id: str) -> bool:
         """
         Revoke a specific session if it belongs to the user.
         """
-        raw = self.client.get(self._session_key(session_id))
-        if not raw:
-            self.client.srem(self._user_sessions_key(user_id), session_id)
-            return False
-        try:
-            payload = json.loads(raw)
-            if payload.get("user_id") != str(user_id):
-                return False
-        except json.JSONDecodeError:
-            return False
-        self.client.delete(self._session_key(session_id))
-        self.client.srem(self._user_sessions_key(user_id), session_id)
-        return True
+        session_id = self._session_id(session_id)
+        with self._round_trip("revoke_owned"):
+            revoked = self._revoke_owned_script(**self._revoke_owned_args(user_id, session_id))
+        if revoked:
+            self._forget([session_id])
+        return bool(revoked)
 
-    def _session_key(self, session_id: str) -> str:
-        return f"{self.SESSION_PREFIX}{session_id}"
 
-    def _user_sessions_key(self, user_id: UUID) -> str:
-        return f"{self.SESSION_SET_PREFIX}{user_id}"
+class AsyncSessionService(_SessionStore):
+    """
+    redis.asyncio flavour of SessionService used when async_mode is enabled.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        client=async_redis_client,
+        cache: SessionCache = session_cache,
+        last_seen: LastSeenBuffer = last_seen_buffer,
+        generations: SessionGenerations = session_generations,
+        revoked: RevokedSessions = revoked_sessions,
+    ):
+        super().__init__(settings, client, cache, last_seen, generations, revoked)
+
+    async def create_session(
+        self, user_id: UUID, user_agent: Optional[str] = None, ip: Optional[str] = None
+    ) -> str:
+        session_id, metadata = self._new_session(user_id, user_agent, ip)
+        with self._round_trip("create"):
+            reply = await self._create_script(**self._create_args(session_id, user_id, metadata))
+        return self._issue_token(session_id, user_id, reply)
+
+    async def get_user_id_for_session(self, session_id: str) -> UUID | None:
+        cached = self.cache.get(session_id)
+        if cached:
+            self.last_seen.touch(session_id)
+            return cached
+        with self._round_trip("touch"):
+            user_id = self._as_uuid(
+                await self._touch_script(keys=[self._session_key(session_id)], args=self._touch_args(session_id))
+            )
+        if user_id:
+            self.last_seen.touch(session_id)
+            self.cache.put(session_id, user_id)
+        return user_id
+
+    async def list_sessions(self, user_id: UUID) -> List[Dict[str, Optional[str]]]:
+        with self._round_trip("list"):
+            rows = await self._list_script(keys=[self._user_sessions_key(user_id)], args=[self.SESSION_PREFIX])
+        return self._decode_listing(rows or [])
+
+    async def revoke_session(self, session_id: str) -> None:
+        session_id = self._session_id(session_id)
+        self._forget([session_id])
+        with self._round_trip("revoke"):
+            await self._revoke_script(**self._revoke_args(session_id))
+
+    async def revoke_all_sessions(self, user_id: UUID) -> None:
+        with self._round_trip("revoke_all"):
+            reply = await self._revoke_all_script(**self._revoke_all_args(user_id))
+        self._apply_revoke_all(user_id, reply)
+
+    async def revoke_session_for_user(self, user_id: UUID, session_id: str) -> bool:
+        """
+        Revoke a specific session if it belongs to the user.
+        """
+        session_id = self._session_id(session_id)
+        with self._round_trip("revoke_owned"):
+            revoked = await self._revoke_owned_script(**self._revoke_owned_args(user_id, session_id))
+        if revoked:
+            self._forget([session_id])
+        return bool(revoked)
@@ -0,0 +1,114 @@
+import logging
+import os
+import threading
+import time
+
+from app.core.config import get_settings
+from app.services.session_scripts import PRUNE_INDEX
+
+logger = logging.getLogger(__name__)
+
+
+class SessionIndexSweeper:
+    """
+    Periodically prunes expired entries from every user's session index.
+
+    Reads and writes already prune the index they touch; this covers users who stop
+    coming back, whose index would otherwise keep its expired entries until the
+    index key itself expires. Workers share a Redis lock, so each interval one
+    process walks the keyspace with SCAN and pipelines the prune script per page.
+    """
+
+    LOCK_KEY = "session_index_sweep_lock"
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        batch_size: int,
+        session_prefix: str = "session:",
+        index_prefix: str = "user_sessions:",
+    ):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.session_prefix = session_prefix
+        self.index_prefix = index_prefix
+        self.runs = 0
+        self.indexes_scanned = 0
+        self.entries_pruned = 0
+        self.last_run_seconds = 0.0
+        self._client = None
+        self._prune_script = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval_seconds > 0
+
+    def start(self, client) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._client = client
+        self._prune_script = client.register_script(PRUNE_INDEX)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-index-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def sweep(self) -> int:
+        """Prune every index once and return the number of expired entries removed."""
+        started = time.perf_counter()
+        scanned = pruned = 0
+        cursor = 0
+        while True:
+            cursor, keys = self._client.scan(cursor, match=f"{self.index_prefix}*", count=self.batch_size)
+            if keys:
+                pipe = self._client.pipeline(transaction=False)
+                for key in keys:
+                    self._prune_script(keys=[key], args=[self.session_prefix], client=pipe)
+                pruned += sum(int(removed or 0) for removed in pipe.execute())
+                scanned += len(keys)
+            if not cursor or self._stop.is_set():
+                break
+        self.runs += 1
+        self.indexes_scanned += scanned
+        self.entries_pruned += pruned
+        self.last_run_seconds = round(time.perf_counter() - started, 3)
+        return pruned
+
+    def _acquire(self) -> bool:
+        # Held for most of an interval so only one worker sweeps per interval.
+        ttl_ms = max(int(self.interval_seconds * 900), 1)
+        return bool(self._client.set(self.LOCK_KEY, os.getpid(), nx=True, px=ttl_ms))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                if self._acquire():
+                    self.sweep()
+            except Exception:
+                logger.exception("Failed to sweep session indexes")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "running": self._thread is not None,
+            "runs": self.runs,
+            "indexes_scanned": self.indexes_scanned,
+            "entries_pruned": self.entries_pruned,
+            "last_run_seconds": self.last_run_seconds,
+        }
+
+
+settings = get_settings()
+
+session_index_sweeper = SessionIndexSweeper(
+    settings.session_index_sweep_seconds,
+    settings.session_index_sweep_batch,
+)
@@ -0,0 +1,237 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.core.redis_client import async_redis_client, redis_client
+
+logger = logging.getLogger(__name__)
+
+GENERATION_PREFIX = "session_gen:"
+# Sorted set of session ids revoked before their stateless tokens expire, scored by that
+# expiry (epoch milliseconds); written by the revocation scripts, read by RevokedSessions.
+REVOKED_SESSIONS_KEY = "revoked_sessions"
+
+
+@dataclass(frozen=True)
+class SessionClaims:
+    """
+    Payload of a stateless session cookie (signed by security._sign like a session id).
+
+    The generation is the user's session_gen counter at issue time; revoking all of a
+    user's sessions bumps the counter, invalidating every older token.
+    """
+
+    VERSION = "v1"
+
+    session_id: str
+    user_id: UUID
+    issued_at: int
+    expires_at: int
+    generation: int
+
+    def encode(self) -> str:
+        return ":".join(
+            (
+                self.VERSION,
+                self.session_id,
+                self.user_id.hex,
+                str(self.issued_at),
+                str(self.expires_at),
+                str(self.generation),
+            )
+        )
+
+    @classmethod
+    def decode(cls, raw: str) -> "SessionClaims | None":
+        parts = raw.split(":")
+        if len(parts) != 6 or parts[0] != cls.VERSION:
+            return None
+        try:
+            return cls(parts[1], UUID(hex=parts[2]), int(parts[3]), int(parts[4]), int(parts[5]))
+        except ValueError:
+            return None
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at <= time.time()
+
+
+class SessionGenerations:
+    """
+    Local cache of per-user session generations for stateless session tokens.
+
+    A user's generation is fetched from Redis the first time this worker sees them;
+    after that a background thread refreshes every cached user with one MGET per
+    refresh_seconds, so verifying a token needs no network round trip. Bumps made by
+    this worker apply immediately, bumps made elsewhere within refresh_seconds.
+    """
+
+    def __init__(self, max_entries: int, refresh_seconds: float, client=redis_client, async_client=async_redis_client):
+        self.max_entries = max_entries
+        self.refresh_seconds = refresh_seconds
+        self.client = client
+        self.async_client = async_client
+        self._lock = threading.Lock()
+        self._generations: OrderedDict[UUID, int] = OrderedDict()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def get(self, user_id: UUID) -> int:
+        cached = self._cached(user_id)
+        if cached is not None:
+            return cached
+        return self.set(user_id, int(self.client.get(generation_key(user_id)) or 0))
+
+    async def get_async(self, user_id: UUID) -> int:
+        cached = self._cached(user_id)
+        if cached is not None:
+            return cached
+        return self.set(user_id, int(await self.async_client.get(generation_key(user_id)) or 0))
+
+    def set(self, user_id: UUID, generation: int) -> int:
+        with self._lock:
+            # Never step backwards: a concurrent refresh may have read an older value.
+            generation = max(generation, self._generations.get(user_id, 0))
+            self._generations[user_id] = generation
+            self._generations.move_to_end(user_id)
+            while len(self._generations) > self.max_entries:
+                self._generations.popitem(last=False)
+        return generation
+
+    def start(self) -> None:
+        if self._thread is not None or self.refresh_seconds <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-generations", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def refresh(self) -> None:
+        with self._lock:
+            user_ids = list(self._generations)
+        for start in range(0, len(user_ids), 1000):
+            chunk = user_ids[start:start + 1000]
+            values = self.client.mget([generation_key(user_id) for user_id in chunk])
+            for user_id, value in zip(chunk, values):
+                self.set(user_id, int(value or 0))
+        self.refreshes += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._generations),
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+            }
+
+    def _cached(self, user_id: UUID) -> int | None:
+        with self._lock:
+            generation = self._generations.get(user_id)
+            if generation is None:
+                self.misses += 1
+                return None
+            self._generations.move_to_end(user_id)
+            self.hits += 1
+            return generation
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_seconds):
+            try:
+                self.refresh()
+            except RedisError:
+                logger.warning("Session generation refresh failed; keeping cached values", exc_info=True)
+
+
+class RevokedSessions:
+    """
+    Local set of session ids revoked individually (logout, revoke, cap eviction) while
+    their stateless tokens may still be unexpired.
+
+    The generation only covers logout-all, so stateless verification also rejects ids in
+    this set. Revocations made by this worker are added immediately, those made elsewhere
+    arrive over the revocation channel (SessionRevocationListener), and load() rebuilds
+    the set from REVOKED_SESSIONS_KEY at startup and after the channel drops messages.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, client=redis_client):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.client = client
+        self._lock = threading.Lock()
+        self._expiry: OrderedDict[str, float] = OrderedDict()
+        self.rejected = 0
+        self.overflows = 0
+        self.loads = 0
+
+    def add(self, session_ids, expires_at: float | None = None) -> None:
+        expires_at = expires_at or time.time() + self.ttl_seconds
+        with self._lock:
+            for session_id in session_ids:
+                self._expiry[session_id] = max(expires_at, self._expiry.get(session_id, 0.0))
+                self._expiry.move_to_end(session_id)
+            while len(self._expiry) > self.max_entries:
+                # Every entry shares one max age, so the oldest insert expires first.
+                self._expiry.popitem(last=False)
+                self.overflows += 1
+
+    def is_revoked(self, session_id: str) -> bool:
+        with self._lock:
+            expires_at = self._expiry.get(session_id)
+            if expires_at is None:
+                return False
+            if expires_at <= time.time():
+                del self._expiry[session_id]
+                return False
+            self.rejected += 1
+            return True
+
+    def load(self) -> None:
+        """Merge every still-unexpired revocation recorded in Redis."""
+        now_ms = int(time.time() * 1000)
+        entries = self.client.zrangebyscore(REVOKED_SESSIONS_KEY, now_ms, "+inf", withscores=True)
+        for session_id, expires_ms in entries:
+            self.add([session_id], expires_ms / 1000)
+        self.loads += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._expiry),
+                "max_entries": self.max_entries,
+                "rejected": self.rejected,
+                "overflows": self.overflows,
+                "loads": self.loads,
+            }
+
+
+def generation_key(user_id: UUID) -> str:
+    return f"{GENERATION_PREFIX}{user_id}"
+
+
+settings = get_settings()
+
+session_generations = SessionGenerations(
+    settings.session_generation_cache_max_entries,
+    settings.session_generation_refresh_seconds,
+)
+
+revoked_sessions = RevokedSessions(
+    settings.session_revoked_cache_max_entries,
+    settings.session_max_age_seconds,
+)
@@ -0,0 +1,173 @@
+import math
+from dataclasses import dataclass
+
+from app.core.redis_client import async_redis_client
+
+# Check a failure backoff and any number of GCRA buckets, committing only if all pass.
+# KEYS[1] failure hash | KEYS[2..] bucket keys
+# ARGV[1] backoff after N failures, ARGV[2] base backoff ms, ARGV[3] max backoff ms,
+# then (emission interval ms, burst window ms) per bucket.
+# Returns {allowed, retry_after_ms, bucket (1-based; 0 = backoff), remaining, reset_after_ms, failures}.
+CHECK = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local failures = tonumber(redis.call('HGET', KEYS[1], 'count') or 0)
+local after = tonumber(ARGV[1])
+if after > 0 and failures >= after then
+  local delay = math.min(tonumber(ARGV[2]) * 2 ^ (failures - after), tonumber(ARGV[3]))
+  local until_ms = tonumber(redis.call('HGET', KEYS[1], 'last') or 0) + delay
+  if now < until_ms then
+    return {0, until_ms - now, 0, 0, until_ms - now, failures}
+  end
+end
+local tats = {}
+local tightest, remaining, reset_after = 1, -1, 0
+for i = 2, #KEYS do
+  local interval = tonumber(ARGV[2 + (i - 1) * 2])
+  local window = tonumber(ARGV[3 + (i - 1) * 2])
+  local tat = tonumber(redis.call('GET', KEYS[i]) or now)
+  if tat < now then tat = now end
+  local new_tat = tat + interval
+  local allow_at = new_tat - window
+  if now < allow_at then
+    return {0, allow_at - now, i - 1, 0, tat - now, failures}
+  end
+  tats[i] = new_tat
+  local left = math.floor((now - allow_at) / interval)
+  if remaining < 0 or left < remaining then
+    tightest, remaining, reset_after = i - 1, left, new_tat - now
+  end
+end
+for i = 2, #KEYS do
+  redis.call('SET', KEYS[i], tats[i], 'PX', tats[i] - now)
+end
+return {1, 0, tightest, math.max(remaining, 0), reset_after, failures}
+"""
+
+# KEYS[1] failure hash | ARGV[1] ttl seconds. Returns the new failure count.
+RECORD_FAILURE = """
+local t = redis.call('TIME')
+local count = redis.call('HINCRBY', KEYS[1], 'count', 1)
+redis.call('HSET', KEYS[1], 'last', tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return count
+"""
+
+
+@dataclass(frozen=True)
+class ThrottleRule:
+    """Limits for one route prefix; identifier_field names the JSON body field keyed per account."""
+
+    prefix: str
+    ip_limit: int
+    identifier_limit: int
+    period_seconds: float
+    identifier_field: str | None = "identifier"
+    backoff_after_failures: int = 0  # 0 disables progressive backoff.
+    backoff_base_seconds: float = 1.0
+    backoff_max_seconds: float = 900.0
+    failure_window_seconds: int = 900  # Failure counts reset after this long without a failure.
+    failure_statuses: tuple[int, ...] = (401,)
+    methods: tuple[str, ...] = ("POST",)
+    max_body_bytes: int = 4096  # Larger bodies get a 413 instead of being buffered to find the identifier.
+
+
+@dataclass(frozen=True)
+class ThrottleDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+    failures: int
+    backoff: bool
+
+    def headers(self) -> dict[str, str]:
+        headers = {}
+        if not self.backoff:
+            headers.update(
+                {
+                    "RateLimit-Limit": str(self.limit),
+                    "RateLimit-Remaining": str(self.remaining),
+                    "RateLimit-Reset": str(math.ceil(self.reset_after)),
+                }
+            )
+        if not self.allowed:
+            headers["Retry-After"] = str(max(math.ceil(self.retry_after), 1))
+        return headers
+
+
+class Throttle:
+    """
+    Per-IP and per-identifier token buckets plus failure backoff, one script call per check.
+
+    The IP bucket is checked on its own first so floods are refused before their
+    bodies are read; the identifier bucket and backoff follow once the body is parsed.
+    """
+
+    KEY_PREFIX = "throttle:"
+
+    def __init__(self, client=async_redis_client):
+        self.client = client
+        self._check_script = client.register_script(CHECK)
+        self._failure_script = client.register_script(RECORD_FAILURE)
+
+    async def check_ip(self, rule: ThrottleRule, ip: str) -> ThrottleDecision:
+        """
+        The per-IP bucket, checked before the request body is read.
+
+        Rules without an identifier field also apply the client's failure backoff here,
+        so check_identifier isn't needed for them.
+        """
+        backoff = not rule.identifier_field
+        return await self._check(rule, self._failure_key(rule, ip, None), [self._bucket(rule, "ip", ip)], backoff)
+
+    async def check_identifier(self, rule: ThrottleRule, ip: str, identifier: str | None) -> ThrottleDecision:
+        """The per-account bucket and the failure backoff for this account from this address."""
+        buckets = [self._bucket(rule, "id", identifier)] if identifier else []
+        return await self._check(rule, self._failure_key(rule, ip, identifier), buckets, True)
+
+    async def _check(
+        self, rule: ThrottleRule, failure_key: str, buckets: list[tuple[str, int]], backoff: bool
+    ) -> ThrottleDecision:
+        args = [
+            rule.backoff_after_failures if backoff else 0,
+            int(rule.backoff_base_seconds * 1000),
+            int(rule.backoff_max_seconds * 1000),
+        ]
+        for _, limit in buckets:
+            interval_ms = max(int(rule.period_seconds * 1000 / max(limit, 1)), 1)
+            args += [interval_ms, interval_ms * max(limit, 1)]
+        reply = await self._check_script(keys=[failure_key, *(key for key, _ in buckets)], args=args)
+        allowed, retry_ms, bucket, remaining, reset_ms, failures = (int(value) for value in reply)
+        limit = buckets[bucket - 1][1] if bucket and buckets else 0
+        return ThrottleDecision(
+            allowed=bool(allowed),
+            limit=limit,
+            remaining=remaining,
+            reset_after=reset_ms / 1000,
+            retry_after=retry_ms / 1000,
+            failures=failures if backoff else 0,
+            backoff=bucket == 0,
+        )
+
+    async def record_failure(self, rule: ThrottleRule, ip: str, identifier: str | None) -> int:
+        reply = await self._failure_script(
+            keys=[self._failure_key(rule, ip, identifier)],
+            args=[rule.failure_window_seconds],
+        )
+        return int(reply)
+
+    async def clear_failures(self, rule: ThrottleRule, ip: str, identifier: str | None) -> None:
+        await self.client.delete(self._failure_key(rule, ip, identifier))
+
+    def _bucket(self, rule: ThrottleRule, kind: str, value: str) -> tuple[str, int]:
+        return self._key(rule, kind, value), rule.ip_limit if kind == "ip" else rule.identifier_limit
+
+    def _failure_key(self, rule: ThrottleRule, ip: str, identifier: str | None) -> str:
+        # Back off per (account, address), so failures from elsewhere can't lock the owner out;
+        # guessing across addresses is still bounded by the identifier bucket.
+        return self._key(rule, "fail", f"{identifier}|{ip}" if identifier else f"ip:{ip}")
+
+    def _key(self, rule: ThrottleRule, kind: str, value: str) -> str:
+        return f"{self.KEY_PREFIX}{rule.prefix}:{kind}:{value}"
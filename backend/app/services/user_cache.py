@@ -0,0 +1,238 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from app.core.config import get_settings
+from app.core.redis_client import async_redis_client, redis_client
+from app.core import serialization
+from app.models.user import User, UserRole, UserStatus
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """The slice of a user row needed to authenticate and render UserRead."""
+
+    id: UUID
+    username: str
+    email: str
+    role: UserRole
+    status: UserStatus
+    created_at: datetime
+    version: int = 0
+
+    @classmethod
+    def from_user(cls, user: User, version: int) -> "CachedUser":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            role=user.role,
+            status=user.status,
+            created_at=user.created_at,
+            version=version,
+        )
+
+    def dumps(self) -> str:
+        # The serializer writes UUIDs and enums as strings and datetimes as ISO 8601.
+        return serialization.dumps(asdict(self))
+
+    @classmethod
+    def loads(cls, raw: str) -> "CachedUser":
+        payload = serialization.loads(raw)
+        return cls(
+            id=UUID(payload["id"]),
+            username=payload["username"],
+            email=payload["email"],
+            role=UserRole(payload["role"]),
+            status=UserStatus(payload["status"]),
+            created_at=datetime.fromisoformat(payload["created_at"]),
+            version=int(payload["version"]),
+        )
+
+
+class UserCache:
+    """
+    Read-through cache of CachedUser projections for get_current_user.
+
+    Local entries are trusted for ttl_seconds; after that they are revalidated
+    against user_version:<id> in Redis (when the Redis tier is on) or reloaded.
+    Writers call invalidate(), which bumps the version, so every worker sees a
+    status/role/password change within ttl_seconds.
+    """
+
+    VERSION_PREFIX = "user_version:"
+    PROJECTION_PREFIX = "user_cache:"
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        use_redis: bool,
+        client=redis_client,
+        async_client=async_redis_client,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.use_redis = use_redis
+        self.client = client
+        self.async_client = async_client
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[UUID, tuple[CachedUser, float]] = OrderedDict()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, user_id: UUID, loader: Callable[[UUID], User | None]) -> CachedUser | User | None:
+        if not self.enabled:
+            return loader(user_id)
+        entry = self._fresh_or_stale(user_id)
+        if isinstance(entry, CachedUser):
+            return entry
+        version, shared = 0, None
+        if self.use_redis:
+            version, shared = self._parse_shared(self.client.mget(self._keys(user_id)))
+            found = self._revalidate(user_id, entry, shared, version)
+            if found:
+                return found
+        user = loader(user_id)
+        if user is None:
+            return None
+        cached = self._store(user, version)
+        if self.use_redis:
+            self.client.set(self._projection_key(user_id), cached.dumps(), ex=self._redis_ttl())
+        return cached
+
+    async def get_async(
+        self, user_id: UUID, loader: Callable[[UUID], Awaitable[User | None]]
+    ) -> CachedUser | User | None:
+        if not self.enabled:
+            return await loader(user_id)
+        entry = self._fresh_or_stale(user_id)
+        if isinstance(entry, CachedUser):
+            return entry
+        version, shared = 0, None
+        if self.use_redis:
+            version, shared = self._parse_shared(await self.async_client.mget(self._keys(user_id)))
+            found = self._revalidate(user_id, entry, shared, version)
+            if found:
+                return found
+        user = await loader(user_id)
+        if user is None:
+            return None
+        cached = self._store(user, version)
+        if self.use_redis:
+            await self.async_client.set(self._projection_key(user_id), cached.dumps(), ex=self._redis_ttl())
+        return cached
+
+    def invalidate(self, user_id: UUID) -> None:
+        self._drop(user_id)
+        if self.enabled and self.use_redis:
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_bump(pipe, user_id)
+            pipe.execute()
+
+    async def invalidate_async(self, user_id: UUID) -> None:
+        self._drop(user_id)
+        if self.enabled and self.use_redis:
+            pipe = self.async_client.pipeline(transaction=False)
+            self._queue_bump(pipe, user_id)
+            await pipe.execute()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "revalidations": self.revalidations,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _fresh_or_stale(self, user_id: UUID) -> CachedUser | tuple[CachedUser, float] | None:
+        """Return a fresh entry, the stale (entry, checked_at) pair, or None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            if now - entry[1] < self.ttl_seconds:
+                self.hits += 1
+                return entry[0]
+            return entry
+
+    def _revalidate(self, user_id: UUID, entry, shared: CachedUser | None, version: int) -> CachedUser | None:
+        """Reuse the stale local entry or the shared projection if either is still current."""
+        candidate = entry[0] if entry else None
+        if candidate is None or candidate.version != version:
+            candidate = shared if shared is not None and shared.version == version else None
+        if candidate is None:
+            return None
+        with self._lock:
+            self.revalidations += 1
+        self._put(candidate)
+        return candidate
+
+    def _store(self, user: User, version: int) -> CachedUser:
+        cached = CachedUser.from_user(user, version)
+        self._put(cached)
+        return cached
+
+    def _put(self, cached: CachedUser) -> None:
+        with self._lock:
+            self._entries[cached.id] = (cached, time.monotonic())
+            self._entries.move_to_end(cached.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _drop(self, user_id: UUID) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def _queue_bump(self, pipe, user_id: UUID) -> None:
+        pipe.incr(self._version_key(user_id))
+        pipe.delete(self._projection_key(user_id))
+
+    @staticmethod
+    def _parse_shared(values: list) -> tuple[int, CachedUser | None]:
+        raw_version, raw_projection = values
+        try:
+            version = int(raw_version or 0)
+            shared = CachedUser.loads(raw_projection) if raw_projection else None
+        except (ValueError, KeyError, TypeError):
+            return 0, None
+        return version, shared
+
+    def _redis_ttl(self) -> int:
+        # Shared projections only need to outlive a burst of cross-worker misses.
+        return max(int(self.ttl_seconds * 10), 60)
+
+    def _keys(self, user_id: UUID) -> list[str]:
+        return [self._version_key(user_id), self._projection_key(user_id)]
+
+    def _version_key(self, user_id: UUID) -> str:
+        return f"{self.VERSION_PREFIX}{user_id}"
+
+    def _projection_key(self, user_id: UUID) -> str:
+        return f"{self.PROJECTION_PREFIX}{user_id}"
+
+
+settings = get_settings()
+
+user_cache = UserCache(
+    settings.user_cache_ttl_seconds,
+    settings.user_cache_max_entries,
+    settings.user_cache_redis,
+)
@@ -0,0 +1,57 @@
+import csv
+import io
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator
+
+from sqlalchemy import Row
+
+from app.core.serialization import dumps
+
+EXPORT_FIELDS = ("id", "username", "email", "role", "status", "created_at")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Rows buffered per chunk written to the response: fewer, larger writes without holding the table.
+_ROWS_PER_CHUNK = 500
+
+
+def _values(row: Row) -> tuple[str, ...]:
+    user_id, username, email, role, status, created_at = row
+    return str(user_id), username, email, role.value, status.value, created_at.isoformat()
+
+
+def _encode(rows: list[Row], fmt: str) -> str:
+    if fmt == "ndjson":
+        return "".join(dumps(dict(zip(EXPORT_FIELDS, _values(row)))) + "\n" for row in rows)
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(_values(row) for row in rows)
+    return buffer.getvalue()
+
+
+def _header(fmt: str) -> str:
+    return ",".join(EXPORT_FIELDS) + "\r\n" if fmt == "csv" else ""
+
+
+def export_chunks(rows: Iterable[Row], fmt: str) -> Iterator[str]:
+    """Encode streamed user rows as NDJSON or CSV text chunks."""
+    if fmt == "csv":
+        yield _header(fmt)
+    batch: list[Row] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= _ROWS_PER_CHUNK:
+            yield _encode(batch, fmt)
+            batch = []
+    if batch:
+        yield _encode(batch, fmt)
+
+
+async def export_chunks_async(rows: AsyncIterable[Row], fmt: str) -> AsyncIterator[str]:
+    if fmt == "csv":
+        yield _header(fmt)
+    batch: list[Row] = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= _ROWS_PER_CHUNK:
+            yield _encode(batch, fmt)
+            batch = []
+    if batch:
+        yield _encode(batch, fmt)
@@ -1,18 +1,57 @@
+import base64
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Iterator
+from uuid import UUID
+
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.models.user import User
-from app.core.security import hash_password
-from app.repositories.user_repo import UserRepository
+from app.models.user import User, UserRole, UserStatus
+from app.core.password_executor import PasswordHasherBusyError
+from app.core.security import hash_password, hash_password_async, password_needs_rehash
+from app.repositories.user_repo import AsyncUserRepository, UserRepository
 from app.schemas.user import UserCreate
 
+logger = logging.getLogger(__name__)
+
+
+def encode_cursor(user: User) -> str:
+    """Opaque keyset cursor for the position just after `user`."""
+    raw = f"{user.created_at.isoformat()}|{user.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Raise ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, user_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(user_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def _next_cursor(users: list[User], limit: int) -> str | None:
+    return encode_cursor(users[-1]) if len(users) == limit else None
+
 
 class UserService:
     def __init__(self, db: Session):
         self.repo = UserRepository(db)
 
     def create_user(self, data: UserCreate) -> User:
-        self._ensure_unique(data.email, data.username)
-        return self.repo.create(data)
+        # Probe before hashing so a duplicate doesn't cost an Argon2 hash; the
+        # lower() unique indexes still settle registrations racing past the probe.
+        if self.repo.identifier_taken(data.email, data.username):
+            raise ValueError("Account already exists")
+        try:
+            return self.repo.create(data)
+        except IntegrityError as exc:
+            self.repo.db.rollback()
+            raise ValueError("Account already exists") from exc
 
     def get_by_email(self, email: str) -> User | None:
         return self.repo.get_by_email(email)
@@ -26,17 +65,105 @@ class UserService:
         return self.get_by_username(identifier)
 
     def set_password(self, user: User, new_password: str) -> User:
-        user.hashed_password = hash_password(new_password)
-        self.repo.db.add(user)
-        self.repo.db.commit()
-        self.repo.db.refresh(user)
-        return user
-
-    def _ensure_unique(self, email: str | None = None, username: str | None = None) -> None:
-        if email and self.repo.get_by_email(email):
-            raise ValueError("Account already exists")
-        if username and self.repo.get_by_username(username):
+        return self.repo.update_password_hash(user, hash_password(new_password))
+
+    def rehash_password_if_needed(self, user: User, password: str) -> bool:
+        """
+        Re-hash a just-verified password when the Argon2 parameters have changed.
+
+        Best effort: a full hashing queue or a failed write is logged and the old
+        hash kept, so the login it rides on still succeeds; the next one retries.
+        """
+        if not password_needs_rehash(user.hashed_password):
+            return False
+        try:
+            self.repo.update_password_hash(user, hash_password(password))
+        except PasswordHasherBusyError:
+            logger.warning("Password hasher busy; keeping the outdated hash for user %s", user.id)
+            return False
+        except SQLAlchemyError:
+            self.repo.db.rollback()
+            logger.warning("Failed to store rehashed password for user %s", user.id, exc_info=True)
+            return False
+        return True
+
+    def list_users(self, limit: int, cursor: str | None = None) -> tuple[list[User], str | None]:
+        users = self.repo.list(limit=limit, after=decode_cursor(cursor) if cursor else None)
+        return users, _next_cursor(users, limit)
+
+    def iter_export_rows(self, batch_size: int = 1000) -> Iterator[Row]:
+        return self.repo.iter_export_rows(batch_size=batch_size)
+
+    def set_role(self, user: User, role: UserRole) -> User:
+        return self.repo.update_access(user, role=role)
+
+    def set_status(self, user: User, status: UserStatus) -> User:
+        return self.repo.update_access(user, status=status)
+
+
+class AsyncUserService:
+    """
+    AsyncSession flavour of UserService used when async_mode is enabled.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.repo = AsyncUserRepository(db)
+
+    async def create_user(self, data: UserCreate) -> User:
+        if await self.repo.identifier_taken(data.email, data.username):
             raise ValueError("Account already exists")
+        try:
+            return await self.repo.create(data)
+        except IntegrityError as exc:
+            await self.repo.db.rollback()
+            raise ValueError("Account already exists") from exc
+
+    async def get_by_email(self, email: str) -> User | None:
+        return await self.repo.get_by_email(email)
+
+    async def get_by_username(self, username: str) -> User | None:
+        return await self.repo.get_by_username(username)
+
+    async def get_by_identifier(self, identifier: str) -> User | None:
+        if "@" in identifier:
+            return await self.get_by_email(identifier)
+        return await self.get_by_username(identifier)
+
+    async def set_password(self, user: User, new_password: str) -> User:
+        return await self.repo.update_password_hash(user, await hash_password_async(new_password))
+
+    async def rehash_password_if_needed(self, user: User, password: str) -> bool:
+        """
+        Re-hash a just-verified password when the Argon2 parameters have changed.
+        """
+        if not password_needs_rehash(user.hashed_password):
+            return False
+        user_id = user.id
+        try:
+            await self.repo.update_password_hash(user, await hash_password_async(password))
+        except PasswordHasherBusyError:
+            logger.warning("Password hasher busy; keeping the outdated hash for user %s", user_id)
+            return False
+        except SQLAlchemyError:
+            await self.repo.db.rollback()
+            logger.warning("Failed to store rehashed password for user %s", user_id, exc_info=True)
+            # The rollback expired the row and AsyncSession can't lazy-load it for the caller.
+            await self.repo.db.refresh(user)
+            return False
+        return True
+
+    async def list_users(self, limit: int, cursor: str | None = None) -> tuple[list[User], str | None]:
+        users = await self.repo.list(limit=limit, after=decode_cursor(cursor) if cursor else None)
+        return users, _next_cursor(users, limit)
+
+    def iter_export_rows(self, batch_size: int = 1000) -> AsyncIterator[Row]:
+        return self.repo.iter_export_rows(batch_size=batch_size)
+
+    async def set_role(self, user: User, role: UserRole) -> User:
+        return await self.repo.update_access(user, role=role)
+
+    async def set_status(self, user: User, status: UserStatus) -> User:
+        return await self.repo.update_access(user, status=status)
 
 
-# TODO: add uniqueness validation, role-based access checks, and domain errors.
+# TODO: add role-based access checks and domain errors.
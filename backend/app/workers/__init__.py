@@ -0,0 +1 @@
+# Marks workers as a package.
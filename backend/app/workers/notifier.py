@@ -0,0 +1,184 @@
+"""
+Standalone sender for the notification outbox (NOTIFICATION_OUTBOX_ENABLED=true).
+
+Usage (from backend/):
+    python -m app.workers.notifier --batch-size 50
+
+Reads the outbox stream through a consumer group, sends each email over one reused
+SMTP connection and acks it. Failed sends stay pending and are reclaimed with
+XAUTOCLAIM once idle for NOTIFICATION_CLAIM_IDLE_SECONDS (by this or any other
+consumer); entries delivered more than NOTIFICATION_MAX_ATTEMPTS times, or failing
+permanently, go to the dead-letter stream (envelope only, without the body, capped at
+NOTIFICATION_DEAD_LETTER_MAXLEN). Run as many copies as throughput needs.
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import time
+
+from redis.exceptions import RedisError, ResponseError
+
+from app.core.config import Settings, get_settings
+from app.core.redis_client import redis_client
+from app.services.mailer import SMTPConnection, build_message, is_transient_error
+
+logger = logging.getLogger("app.workers.notifier")
+
+# Outbox fields copied to the dead-letter stream; never the rendered body.
+DEAD_LETTER_FIELDS = ("recipient", "subject", "enqueued_at")
+
+
+class NotifierWorker:
+    def __init__(self, settings: Settings, client, consumer: str, batch_size: int, block_ms: int):
+        self.settings = settings
+        self.client = client
+        self.consumer = consumer
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.stream = settings.notification_stream
+        self.group = settings.notification_group
+        self.connection = SMTPConnection(settings, settings.smtp_idle_timeout_seconds)
+        self._claim_cursor = "0-0"
+        self._next_claim = 0.0
+        self._stopping = False
+        self.sent = 0
+        self.dead_lettered = 0
+
+    def ensure_group(self) -> None:
+        try:
+            self.client.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except ResponseError as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+
+    def stop(self, *_) -> None:
+        self._stopping = True
+
+    def run(self) -> None:
+        self.ensure_group()
+        logger.info("Notifier %s consuming %s as group %s", self.consumer, self.stream, self.group)
+        try:
+            while not self._stopping:
+                try:
+                    self.process_once()
+                except RedisError:
+                    logger.exception("Redis error in notifier loop; retrying")
+                    time.sleep(1)
+        finally:
+            self.connection.close()
+            logger.info("Notifier %s stopped (sent=%d dead_lettered=%d)", self.consumer, self.sent, self.dead_lettered)
+
+    def process_once(self) -> int:
+        entries = self._reclaim()
+        if not entries:
+            entries = self._read()
+        if entries:
+            self._handle(entries)
+        else:
+            self.connection.close_if_idle()
+        return len(entries)
+
+    def _reclaim(self) -> list:
+        # Claiming is a scan over the pending list, so only do it every half idle period.
+        now = time.monotonic()
+        if now < self._next_claim:
+            return []
+        idle_ms = self.settings.notification_claim_idle_seconds * 1000
+        self._claim_cursor, entries, _ = self.client.xautoclaim(
+            self.stream, self.group, self.consumer, idle_ms, self._claim_cursor, count=self.batch_size
+        )
+        if self._claim_cursor == "0-0":
+            self._next_claim = now + self.settings.notification_claim_idle_seconds / 2
+        if entries:
+            logger.info("Reclaimed %d stalled notification(s)", len(entries))
+        return entries
+
+    def _read(self) -> list:
+        reply = self.client.xreadgroup(
+            self.group, self.consumer, {self.stream: ">"}, count=self.batch_size, block=self.block_ms
+        )
+        return reply[0][1] if reply else []
+
+    def _handle(self, entries: list) -> None:
+        attempts = self._delivery_counts([entry_id for entry_id, _ in entries])
+        done, dead = [], []
+        for entry_id, fields in entries:
+            if not fields:
+                done.append(entry_id)  # Trimmed from the stream while pending.
+                continue
+            if attempts.get(entry_id, 1) > self.settings.notification_max_attempts:
+                dead.append((entry_id, fields, "max attempts exceeded"))
+                continue
+            try:
+                self._send(fields)
+            except Exception as exc:
+                self.connection.close()
+                if is_transient_error(exc):
+                    # Left pending: XAUTOCLAIM retries it after the idle period.
+                    logger.warning("Transient failure sending to %s: %s", fields.get("recipient"), exc)
+                    continue
+                logger.exception("Permanent failure sending to %s", fields.get("recipient"))
+                dead.append((entry_id, fields, repr(exc)))
+                continue
+            done.append(entry_id)
+        self._settle(done, dead, attempts)
+
+    def _send(self, fields: dict) -> None:
+        if not self.settings.smtp_host:
+            logger.warning("SMTP not configured; unable to send email to %s", fields["recipient"])
+            return
+        self.connection.send(build_message(self.settings, fields["recipient"], fields["subject"], fields["body"]))
+        self.sent += 1
+
+    def _settle(self, done: list, dead: list, attempts: dict) -> None:
+        if not done and not dead:
+            return
+        pipe = self.client.pipeline(transaction=True)
+        for entry_id, fields, error in dead:
+            pipe.xadd(
+                self.settings.notification_dead_letter_stream,
+                self._dead_letter(entry_id, fields, attempts.get(entry_id, 1), error),
+                maxlen=self.settings.notification_dead_letter_maxlen,
+                approximate=True,
+            )
+        ids = done + [entry_id for entry_id, _, _ in dead]
+        pipe.xack(self.stream, self.group, *ids)
+        pipe.xdel(self.stream, *ids)
+        pipe.execute()
+        self.dead_lettered += len(dead)
+        if dead:
+            logger.error("Dead-lettered %d notification(s)", len(dead))
+
+    @staticmethod
+    def _dead_letter(entry_id: str, fields: dict, attempts: int, error: str) -> dict:
+        # The body carries live secrets (reset links), so only the envelope is kept for triage.
+        envelope = {name: fields[name] for name in DEAD_LETTER_FIELDS if name in fields}
+        return {**envelope, "source_id": entry_id, "attempts": attempts, "error": error}
+
+    def _delivery_counts(self, ids: list) -> dict[str, int]:
+        ordered = sorted(ids, key=lambda entry_id: tuple(int(part) for part in entry_id.split("-")))
+        pending = self.client.xpending_range(
+            self.stream, self.group, min=ordered[0], max=ordered[-1], count=len(ids) * 2, consumername=self.consumer
+        )
+        return {row["message_id"]: row["times_delivered"] for row in pending}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--consumer", default=f"{socket.gethostname()}-{os.getpid()}")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--block-ms", type=int, default=5000, help="How long to wait for new entries per read.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    worker = NotifierWorker(get_settings(), redis_client, args.consumer, args.batch_size, args.block_ms)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
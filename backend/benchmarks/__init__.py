@@ -0,0 +1 @@
+"""Offline microbenchmarks for the auth hot paths; run with `python -m benchmarks`."""
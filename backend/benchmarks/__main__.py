@@ -0,0 +1,86 @@
+"""
+Microbenchmarks for the auth hot paths, compared against benchmarks/baseline.json.
+
+Usage (from backend/):
+    python -m benchmarks                    # run everything, exit 1 on regression
+    python -m benchmarks -k session         # only cases whose name contains "session"
+    python -m benchmarks --save             # record the current numbers as the baseline
+
+Runs offline against fakeredis (from requirements-dev.txt) and a temporary SQLite file;
+pass --redis-url and/or --database-url to measure against real servers instead.
+Throughput is compared as a ratio to a fixed calibration workload measured alongside
+each case (see harness.measure), so baselines carry across machines of similar
+architecture. A case regresses when that ratio drops, or its peak allocation per call
+grows, by more than the threshold (baseline.json's threshold_percent unless --threshold
+is given) and a second measurement agrees.
+"""
+import argparse
+import os
+import sys
+
+from benchmarks import offline
+from benchmarks.harness import load_baseline, measure, regressions, save_baseline
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", default="", help="Only run cases whose name contains this.")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds of timed rounds per case.")
+    parser.add_argument("--threshold", type=float, help="Allowed regression in percent.")
+    parser.add_argument("--save", action="store_true", help="Write the results to the baseline file.")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--redis-url", help="Use this Redis instead of fakeredis.")
+    parser.add_argument("--database-url", help="Use this database instead of a temporary SQLite file.")
+    args = parser.parse_args(argv)
+
+    offline.configure(args.redis_url, args.database_url)
+    from benchmarks.cases import CASES
+
+    baseline = load_baseline(args.baseline)
+    threshold = args.threshold if args.threshold is not None else baseline["threshold_percent"]
+    results, failed = [], []
+
+    print(f"{'case':34} {'ops/s':>12} {'relative':>10} {'baseline':>10} {'change':>8} {'peak B/op':>10}")
+    for name, factory in CASES.items():
+        if args.pattern not in name:
+            continue
+        expected = baseline["results"].get(name)
+        with factory() as op:
+            if args.save:
+                # Record the middle of three measurements so a lucky run doesn't set the bar.
+                runs = sorted((measure(name, op, args.min_time) for _ in range(3)), key=lambda run: run.relative)
+                result = runs[1]
+            else:
+                result = measure(name, op, args.min_time)
+            problems = regressions(result, expected, threshold)
+            if problems and not args.save:
+                # A single slow measurement isn't a regression until a second one agrees.
+                result = measure(name, op, args.min_time)
+                problems = regressions(result, expected, threshold)
+        results.append(result)
+        if expected and "relative" in expected:
+            reference = f"{expected['relative']:.4g}"
+            change = f"{(result.relative / expected['relative'] - 1) * 100:+.1f}%"
+        else:
+            reference, change = "-", "new"
+        print(
+            f"{name:34} {result.ops_per_sec:>12,.0f} {result.relative:>10.4g} {reference:>10} {change:>8}"
+            f" {result.peak_bytes_per_op:>10,}" + (f"  REGRESSED: {'; '.join(problems)}" if problems else "")
+        )
+        if problems:
+            failed.append(name)
+
+    if args.save:
+        save_baseline(args.baseline, baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if failed:
+        print(f"{len(failed)} case(s) regressed by more than {threshold:g}%: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,187 @@
+"""
+Benchmarked hot paths. Each case is a context manager that sets up state and yields
+the zero-argument callable to time; app modules are imported inside the cases
+because benchmarks.offline.configure() has to run first.
+"""
+from contextlib import contextmanager
+from typing import Callable, ContextManager
+
+CASES: dict[str, Callable[[], ContextManager[Callable[[], object]]]] = {}
+
+PASSWORD = "Str0ng!Password"
+
+
+def case(name: str):
+    def register(fn):
+        CASES[name] = contextmanager(fn)
+        return fn
+
+    return register
+
+
+@contextmanager
+def _session_fixture():
+    """A registered user, a DB session and a live Redis session for them."""
+    from app.core.config import get_settings
+    from app.db.session import SessionLocal
+    from app.repositories.user_repo import UserRepository
+    from app.schemas.user import UserCreate
+    from app.services.session_service import SessionService
+
+    with SessionLocal() as db:
+        repo = UserRepository(db)
+        user = repo.get_by_username("bench") or repo.create(
+            UserCreate(username="bench", email="bench@example.com", password=PASSWORD)
+        )
+        service = SessionService(get_settings())
+        token = service.create_session(user.id, user_agent="bench", ip="127.0.0.1")
+        yield db, user, service, token
+
+
+@case("security.sign")
+def _sign_case():
+    from app.core.security import _sign
+
+    yield lambda: _sign("k3Jx0Qm1b2Yv4zW8c9Lr5tP7uS6aE0dF1gH2iJ3kL4m")
+
+
+@case("security.unsign")
+def _unsign_case():
+    from app.core.security import _sign, _unsign
+
+    signed = _sign("k3Jx0Qm1b2Yv4zW8c9Lr5tP7uS6aE0dF1gH2iJ3kL4m")
+    yield lambda: _unsign(signed)
+
+
+@case("session.lookup.cached")
+def _lookup_cached_case():
+    with _session_fixture() as (_, _, service, token):
+        yield lambda: service.get_user_id_for_session(token)
+
+
+@case("session.lookup.redis")
+def _lookup_redis_case():
+    from app.core.config import get_settings
+    from app.services.session_cache import SessionCache
+    from app.services.session_service import SessionService
+
+    with _session_fixture() as (_, _, _, token):
+        # A zero TTL disables the in-process cache, so every call runs the touch script.
+        service = SessionService(get_settings(), cache=SessionCache(1, 0))
+        yield lambda: service.get_user_id_for_session(token)
+
+
+@case("auth.get_current_user")
+def _current_user_case():
+    from app.core.security import _sign, get_current_user
+
+    with _session_fixture() as (db, _, service, token):
+        cookie = _sign(token)
+        yield lambda: get_current_user(session_token=cookie, db=db, session_service=service)
+
+
+@case("auth.get_current_user.uncached")
+def _current_user_uncached_case():
+    from app.core.config import get_settings
+    from app.core.security import _sign, get_current_user
+    from app.services.session_cache import SessionCache
+    from app.services.session_service import SessionService
+    from app.services.user_cache import user_cache
+
+    with _session_fixture() as (db, _, _, token):
+        cookie = _sign(token)
+        service = SessionService(get_settings(), cache=SessionCache(1, 0))
+        ttl, user_cache.ttl_seconds = user_cache.ttl_seconds, 0
+        try:
+            yield lambda: get_current_user(session_token=cookie, db=db, session_service=service)
+        finally:
+            user_cache.ttl_seconds = ttl
+
+
+@case("validators.validate_password")
+def _validate_password_case():
+    from app.schemas.validators import validate_password
+
+    yield lambda: validate_password(PASSWORD)
+
+
+@case("schemas.user_read")
+def _user_read_case():
+    from app.schemas.user import UserRead
+
+    with _session_fixture() as (_, user, _, _):
+        yield lambda: UserRead.model_validate(user).model_dump_json()
+
+
+# Response encoding: the FastAPI default path (JSONResponse over json.dumps) against the
+# precompiled TypeAdapters the hot routes now return directly.
+_SESSIONS = [
+    {
+        "id": f"s{index}3Jx0Qm1b2Yv4zW8c9Lr5tP7uS6aE0dF1gH2",
+        "user_id": "0b8c1e0e-3f7a-4a53-9d43-2b1c8f0e5a11",
+        "created_at": "2024-05-01T12:00:00+00:00",
+        "issued_at": "1714564800",
+        "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)",
+        "ip": "203.0.113.7",
+        "last_seen": "2024-05-01T12:30:00+00:00",
+    }
+    for index in range(5)
+]
+
+
+@case("responses.user_read.jsonresponse")
+def _user_read_jsonresponse_case():
+    from starlette.responses import JSONResponse
+
+    from app.schemas.user import UserRead
+
+    with _session_fixture() as (_, user, _, _):
+        yield lambda: JSONResponse(UserRead.model_validate(user).model_dump(mode="json")).body
+
+
+@case("responses.user_read.adapter")
+def _user_read_adapter_case():
+    from starlette.responses import Response
+
+    from app.schemas.user import user_read_json
+
+    with _session_fixture() as (_, user, _, _):
+        yield lambda: Response(user_read_json(user), media_type="application/json").body
+
+
+@case("responses.sessions.jsonresponse")
+def _sessions_jsonresponse_case():
+    from fastapi.encoders import jsonable_encoder
+    from starlette.responses import JSONResponse
+
+    yield lambda: JSONResponse(jsonable_encoder(_SESSIONS)).body
+
+
+@case("responses.sessions.adapter")
+def _sessions_adapter_case():
+    from starlette.responses import Response
+
+    from app.schemas.session import session_list_adapter
+
+    yield lambda: Response(session_list_adapter.dump_json(_SESSIONS), media_type="application/json").body
+
+
+@case("serialization.reset_payload.stdlib")
+def _reset_payload_stdlib_case():
+    import json
+    from datetime import datetime, timezone
+
+    def roundtrip():
+        raw = json.dumps({"user_id": _SESSIONS[0]["user_id"], "created_at": datetime.now(timezone.utc).isoformat()})
+        return json.loads(raw)
+
+    yield roundtrip
+
+
+@case("serialization.reset_payload")
+def _reset_payload_case():
+    from datetime import datetime, timezone
+
+    from app.core.serialization import dumps, loads
+
+    yield lambda: loads(dumps({"user_id": _SESSIONS[0]["user_id"], "created_at": datetime.now(timezone.utc)}))
@@ -0,0 +1,121 @@
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+ALLOC_SAMPLES = 200
+# Peak-allocation changes this small are interpreter noise, not regressions.
+ALLOC_SLACK_BYTES = 256
+SAMPLES = 5
+
+
+@dataclass
+class Result:
+    name: str
+    ops_per_sec: float
+    relative: float  # Calls per call of calibration_op in the same time; what baselines compare.
+    peak_bytes_per_op: int
+
+
+def calibration_op() -> int:
+    """Fixed pure-Python workload (dict build, string and int conversion) that scales with the interpreter."""
+    data = {str(index): index for index in range(64)}
+    return sum(int(key) * value for key, value in data.items())
+
+
+def _run(op: Callable[[], object], number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        op()
+    return time.perf_counter() - started
+
+
+def _loop_size(op: Callable[[], object]) -> int:
+    number = 1
+    while _run(op, number) < 0.02:
+        number *= 2
+    return number
+
+
+def _best(op: Callable[[], object], number: int, seconds: float) -> float:
+    rounds = []
+    deadline = time.perf_counter() + seconds
+    while len(rounds) < 3 or time.perf_counter() < deadline:
+        rounds.append(number / _run(op, number))
+    return max(rounds)
+
+
+def measure(name: str, op: Callable[[], object], min_time: float) -> Result:
+    """
+    Throughput relative to calibration_op, as the median of SAMPLES paired samples.
+
+    Absolute ops/s swing with CPU frequency, neighbours and the machine itself, so each
+    sample times the case and then calibration_op back to back (best round of each,
+    as with timeit) and keeps their ratio; the median of those ratios is what gets
+    compared, which cancels machine speed and rides out a disturbed sample. Sizing the
+    loops doubles as warm-up. Allocations are sampled separately with tracemalloc,
+    which would otherwise distort the timings.
+    """
+    number = _loop_size(op)
+    calibration_number = _loop_size(calibration_op)
+    speeds, ratios = [], []
+    gc.disable()
+    try:
+        for _ in range(SAMPLES):
+            speed = _best(op, number, min_time / SAMPLES)
+            speeds.append(speed)
+            ratios.append(speed / _best(calibration_op, calibration_number, min_time / SAMPLES / 2))
+    finally:
+        gc.enable()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        peaks = 0
+        for _ in range(ALLOC_SAMPLES):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            op()
+            peaks += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return Result(name, statistics.median(speeds), statistics.median(ratios), peaks // ALLOC_SAMPLES)
+
+
+def regressions(result: Result, baseline: dict | None, threshold_percent: float) -> list[str]:
+    if not baseline or "relative" not in baseline:
+        return []
+    problems = []
+    floor = baseline["relative"] * (1 - threshold_percent / 100)
+    if result.relative < floor:
+        problems.append(f"{result.relative:.4g}x calibration < {floor:.4g}x")
+    ceiling = baseline["peak_bytes_per_op"] * (1 + threshold_percent / 100) + ALLOC_SLACK_BYTES
+    if result.peak_bytes_per_op > ceiling:
+        problems.append(f"{result.peak_bytes_per_op:,} B/op > {ceiling:,.0f}")
+    return problems
+
+
+def load_baseline(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return {"threshold_percent": 25, "results": {}}
+
+
+def save_baseline(path: str, baseline: dict, results: list[Result]) -> None:
+    baseline["machine"] = f"{platform.python_implementation()} {platform.python_version()} on {platform.machine()}"
+    for result in results:
+        entry = asdict(result)
+        del entry["name"]
+        entry["ops_per_sec"] = round(entry["ops_per_sec"], 1)
+        entry["relative"] = float(f"{entry['relative']:.4g}")
+        baseline["results"][result.name] = entry
+    baseline["results"] = dict(sorted(baseline["results"].items()))
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(baseline, handle, indent=2)
+        handle.write("\n")
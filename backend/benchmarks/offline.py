@@ -0,0 +1,35 @@
+"""
+Run the app without docker-compose: fakeredis (or a local redis-server) plus a throwaway SQLite file.
+
+Call configure() before anything under app/ is imported; settings, Redis clients and
+the engine are all built at import time.
+"""
+import os
+import tempfile
+
+
+def configure(redis_url: str | None = None, database_url: str | None = None) -> str:
+    """Point settings at local backends and create the schema; returns the database URL used."""
+    if database_url is None:
+        database_url = f"sqlite:///{tempfile.mkdtemp(prefix='aquamate-perf-')}/app.db"
+    os.environ["DATABASE_URL"] = database_url
+
+    if redis_url:
+        os.environ["REDIS_URL"] = redis_url
+    else:
+        import fakeredis
+        import redis
+        import redis.asyncio
+
+        server = fakeredis.FakeServer()
+        redis.Redis.from_url = classmethod(lambda cls, url, **kw: fakeredis.FakeRedis(server=server, **kw))
+        redis.asyncio.Redis.from_url = classmethod(
+            lambda cls, url, **kw: fakeredis.FakeAsyncRedis(server=server, **kw)
+        )
+
+    from app.db.base import Base
+    from app.db.session import engine
+    from app.models import user  # noqa: F401  (registers the table)
+
+    Base.metadata.create_all(engine)
+    return database_url
@@ -0,0 +1 @@
+"""In-repo load generator and traffic replay; run with `python -m loadtest`."""
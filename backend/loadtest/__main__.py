@@ -0,0 +1,131 @@
+"""
+Load generator for the whole app: scripted scenarios or replay of a recorded JSONL log.
+
+Usage (from backend/):
+    python -m loadtest run --dashboard-users 500 --arrival-rate 50 --storm-users 200 --storm-at 10
+    python -m loadtest replay traffic.jsonl --speed 2
+    python -m loadtest run --base-url http://localhost:8000 --dashboard-users 50
+
+Without --base-url, app.main:app is booted in-process on a local port against fakeredis
+and a temporary SQLite file (or --redis-url/--database-url). Scenarios:
+
+  dashboard    register -> login -> poll /auth/me -> GET /sessions/ -> logout-all
+  reset        register -> forgot-password -> reset-password -> login
+  login storm  pre-registered users all logging in at once, --storm-at seconds in
+
+Dashboard and reset users arrive as a Poisson process at --arrival-rate users/s
+(0 starts them all at once). The report lists throughput and p50/p95/p99 per endpoint.
+"""
+import argparse
+import asyncio
+import random
+import resource
+import secrets
+
+from loadtest.recorder import Recorder
+from loadtest.replay import replay
+from loadtest.scenarios import SCENARIOS, ScenarioOptions, VirtualUser, login_storm
+
+
+async def run_scenarios(base_url: str, args, mailbox, recorder: Recorder) -> None:
+    run_id = secrets.token_hex(3)
+    options = ScenarioOptions(args.polls, args.poll_interval, args.bad_password_ratio)
+
+    storm = [VirtualUser(base_url, recorder, run_id, index, "storm") for index in range(args.storm_users)]
+    setup_slots = asyncio.Semaphore(args.setup_concurrency)
+
+    async def register(user: VirtualUser) -> None:
+        async with setup_slots:
+            await user.register(record=False)
+
+    if storm:
+        print(f"Registering {len(storm)} login-storm users...")
+        await asyncio.gather(*(register(user) for user in storm))
+        for user in storm:
+            user.client.cookies.clear()
+
+    arrivals = ["dashboard"] * args.dashboard_users + ["reset"] * args.reset_users
+    random.shuffle(arrivals)
+    users: list[VirtualUser] = list(storm)
+    tasks: list[asyncio.Task] = []
+    recorder.start()  # Setup above is not part of the measured run.
+
+    async def fire_storm() -> None:
+        await asyncio.sleep(args.storm_at)
+        await asyncio.gather(*(login_storm(user, options, mailbox) for user in storm))
+
+    async def arrive() -> None:
+        for index, kind in enumerate(arrivals, start=len(storm)):
+            user = VirtualUser(base_url, recorder, run_id, index, kind)
+            users.append(user)
+            tasks.append(asyncio.create_task(SCENARIOS[kind](user, options, mailbox)))
+            if args.arrival_rate > 0:
+                await asyncio.sleep(random.expovariate(args.arrival_rate))
+
+    print(f"Running {args.dashboard_users} dashboard, {args.reset_users} reset and {len(storm)} storm users...")
+    try:
+        await asyncio.gather(arrive(), fire_storm() if storm else asyncio.sleep(0))
+        await asyncio.gather(*tasks)
+    finally:
+        recorder.stop()
+        await asyncio.gather(*(user.close() for user in users))
+
+
+def _raise_fd_limit() -> None:
+    # Every virtual user holds its own connection, and the in-process server the other end.
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and (hard == resource.RLIM_INFINITY or soft < hard):
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard if hard != resource.RLIM_INFINITY else 65536, hard))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Target a running server instead of booting one.")
+    parser.add_argument("--redis-url", help="Booted server: use this Redis instead of fakeredis.")
+    parser.add_argument("--database-url", help="Booted server: use this database instead of a temporary SQLite file.")
+    parser.add_argument("--json", dest="json_path", help="Also write the report to this file.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Drive the scripted scenarios.")
+    run.add_argument("--dashboard-users", type=int, default=100)
+    run.add_argument("--reset-users", type=int, default=0)
+    run.add_argument("--storm-users", type=int, default=0)
+    run.add_argument("--storm-at", type=float, default=5.0, help="Seconds into the run when the login storm hits.")
+    run.add_argument("--arrival-rate", type=float, default=20.0, help="Dashboard/reset users per second; 0 = all at once.")
+    run.add_argument("--polls", type=int, default=10, help="/auth/me polls per dashboard user.")
+    run.add_argument("--poll-interval", type=float, default=1.0)
+    run.add_argument("--bad-password-ratio", type=float, default=0.1, help="Share of storm logins with a wrong password.")
+    run.add_argument("--setup-concurrency", type=int, default=20)
+
+    replay_parser = commands.add_parser("replay", help="Replay a recorded JSONL request log.")
+    replay_parser.add_argument("log", help="JSONL file; see loadtest/replay.py for the format.")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="2 replays twice as fast as recorded.")
+    args = parser.parse_args(argv)
+
+    _raise_fd_limit()
+    mailbox, server = None, None
+    base_url = args.base_url
+    if base_url is None:
+        from loadtest.server import boot
+
+        base_url, mailbox, server = boot(args.redis_url, args.database_url)
+        print(f"Booted app.main:app on {base_url}")
+
+    recorder = Recorder()
+    try:
+        if args.command == "run":
+            asyncio.run(run_scenarios(base_url, args, mailbox, recorder))
+        else:
+            asyncio.run(replay(base_url, args.log, args.speed, secrets.token_hex(3), recorder))
+    finally:
+        if server is not None:
+            server.should_exit = True
+
+    recorder.print_report()
+    if args.json_path:
+        recorder.write_json(args.json_path)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
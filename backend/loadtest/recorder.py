@@ -0,0 +1,70 @@
+import json
+import time
+from collections import Counter, defaultdict
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(int(round(fraction * len(ordered))) - 1, 0))]
+
+
+class Recorder:
+    """Latencies and status codes per endpoint label for one load run."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def record(self, name: str, status: int | str, seconds: float) -> None:
+        self.latencies[name].append(seconds)
+        self.statuses[name][status] += 1
+
+    def stop(self) -> None:
+        self.finished = time.perf_counter()
+
+    def summary(self) -> dict[str, dict]:
+        elapsed = self.elapsed()
+        rows = {}
+        for name in sorted(self.latencies):
+            ordered = sorted(self.latencies[name])
+            statuses = self.statuses[name]
+            rows[name] = {
+                "count": len(ordered),
+                "rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+                # Transport errors are recorded under the exception name instead of a status.
+                "errors": sum(n for status, n in statuses.items() if not isinstance(status, int) or status >= 500),
+                "statuses": {str(status): n for status, n in sorted(statuses.items(), key=lambda item: str(item[0]))},
+                "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+                "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+                "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2),
+            }
+        return {"elapsed_seconds": round(elapsed, 2), "endpoints": rows}
+
+    def print_report(self) -> None:
+        summary = self.summary()
+        print(f"\n{'endpoint':32} {'count':>7} {'req/s':>8} {'err':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}  statuses")
+        for name, row in summary["endpoints"].items():
+            statuses = " ".join(f"{status}x{n}" for status, n in row["statuses"].items())
+            print(
+                f"{name:32} {row['count']:>7} {row['rps']:>8.1f} {row['errors']:>5} "
+                f"{row['p50_ms']:>7.1f}ms {row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms {row['max_ms']:>7.1f}ms  {statuses}"
+            )
+        total = sum(row["count"] for row in summary["endpoints"].values())
+        print(f"{total} requests in {summary['elapsed_seconds']}s")
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.summary(), handle, indent=2)
+            handle.write("\n")
@@ -0,0 +1,59 @@
+"""
+Replay of a recorded request log.
+
+One JSON object per line:
+    {"t": 12.5, "method": "GET", "path": "/auth/me", "user": "u-381"}
+    {"t": 12.9, "method": "POST", "path": "/auth/login", "json": {...}}
+
+t is seconds (any origin; epoch timestamps work); entries with the same "user" share
+one virtual user, which is registered and logged in before the clock starts, so
+recorded session cookies are never needed. "name" overrides the report label.
+"""
+import asyncio
+import json
+
+from loadtest.recorder import Recorder
+from loadtest.scenarios import VirtualUser
+
+
+def load_entries(path: str) -> list[dict]:
+    entries = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                entries.append(json.loads(line))
+    entries.sort(key=lambda entry: float(entry["t"]))
+    return entries
+
+
+async def replay(base_url: str, path: str, speed: float, run_id: str, recorder: Recorder) -> None:
+    entries = load_entries(path)
+    if not entries:
+        return
+
+    users: dict[str | None, VirtualUser] = {None: VirtualUser(base_url, recorder, run_id, 0, "anon")}
+    for index, key in enumerate(dict.fromkeys(entry["user"] for entry in entries if entry.get("user")), start=1):
+        users[key] = VirtualUser(base_url, recorder, run_id, index, "replay")
+    await asyncio.gather(*(_sign_in(user) for key, user in users.items() if key is not None))
+
+    origin = float(entries[0]["t"])
+    recorder.start()
+
+    async def send(entry: dict) -> None:
+        delay = (float(entry["t"]) - origin) / speed - recorder.elapsed()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        method = entry.get("method", "GET").upper()
+        name = entry.get("name") or f"{method} {entry['path'].split('?', 1)[0]}"
+        await users[entry.get("user")].request(method, entry["path"], name=name, json=entry.get("json"))
+
+    try:
+        await asyncio.gather(*(send(entry) for entry in entries))
+    finally:
+        recorder.stop()
+        await asyncio.gather(*(user.close() for user in users.values()))
+
+
+async def _sign_in(user: VirtualUser) -> None:
+    await user.register(record=False)
+    await user.login(record=False)
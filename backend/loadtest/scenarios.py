@@ -0,0 +1,98 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+
+import httpx
+
+from loadtest.recorder import Recorder
+from loadtest.server import Mailbox
+
+PASSWORD = "Str0ng!Password"
+NEW_PASSWORD = "N3w!Str0ngerPassword"
+
+
+class VirtualUser:
+    """One simulated browser: its own cookie jar, connection and client address."""
+
+    def __init__(self, base_url: str, recorder: Recorder, run_id: str, index: int, kind: str):
+        self.recorder = recorder
+        self.username = f"{kind}{run_id}{index}"
+        self.email = f"{self.username}@loadtest.example.com"
+        self.password = PASSWORD
+        ip = f"10.{(index >> 16) & 255}.{(index >> 8) & 255}.{index & 255}"
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"X-Forwarded-For": ip, "User-Agent": f"aquamate-loadtest/{kind}"},
+            limits=httpx.Limits(max_connections=1),
+            timeout=httpx.Timeout(60.0),
+        )
+
+    async def request(self, method: str, path: str, name: str | None = None, record: bool = True, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, **kwargs)
+        except httpx.HTTPError as exc:
+            if record:
+                self.recorder.record(name or f"{method} {path}", type(exc).__name__, time.perf_counter() - started)
+            return None
+        if record:
+            self.recorder.record(name or f"{method} {path}", response.status_code, time.perf_counter() - started)
+        return response
+
+    async def register(self, record: bool = True):
+        payload = {"username": self.username, "email": self.email, "password": self.password}
+        return await self.request("POST", "/auth/register", json=payload, record=record)
+
+    async def login(self, password: str | None = None, record: bool = True):
+        payload = {"identifier": self.username, "password": password or self.password}
+        return await self.request("POST", "/auth/login", json=payload, record=record)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+@dataclass
+class ScenarioOptions:
+    polls: int
+    poll_interval: float
+    bad_password_ratio: float
+
+
+async def dashboard(user: VirtualUser, options: ScenarioOptions, mailbox: Mailbox | None) -> None:
+    """register -> login -> poll /auth/me -> list sessions -> logout-all."""
+    await user.register()
+    await user.login()
+    for _ in range(options.polls):
+        await user.request("GET", "/auth/me")
+        # Jitter keeps pollers from marching in lockstep after a synchronized start.
+        await asyncio.sleep(options.poll_interval * random.uniform(0.5, 1.5))
+    await user.request("GET", "/sessions/")
+    await user.request("POST", "/sessions/logout-all")
+
+
+async def password_reset(user: VirtualUser, options: ScenarioOptions, mailbox: Mailbox | None) -> None:
+    """register -> forgot-password -> reset-password (token read from the mailbox) -> login."""
+    await user.register()
+    user.client.cookies.clear()
+    await user.request("POST", "/password/forgot-password", json={"identifier": user.email})
+    if mailbox is None:
+        return  # Against an external server the token only arrives by email.
+    token = await mailbox.wait_for_token(user.email)
+    if token is None:
+        user.recorder.record("POST /password/reset-password", "NoTokenDelivered", 0.0)
+        return
+    await user.request("POST", "/password/reset-password", json={"token": token, "new_password": NEW_PASSWORD})
+    await user.login(password=NEW_PASSWORD)
+
+
+async def login_storm(user: VirtualUser, options: ScenarioOptions, mailbox: Mailbox | None) -> None:
+    """One login from an already registered user; a share of them use a wrong password."""
+    wrong = random.random() < options.bad_password_ratio
+    await user.login(password="Wr0ng!Password" if wrong else None)
+
+
+SCENARIOS = {
+    "dashboard": dashboard,
+    "reset": password_reset,
+}
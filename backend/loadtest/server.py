@@ -0,0 +1,67 @@
+"""Boot app.main:app on a local port in a background thread, against fakes by default."""
+import asyncio
+import re
+import socket
+import threading
+import time
+from collections import defaultdict
+
+from benchmarks import offline
+
+
+class Mailbox:
+    """Reset tokens captured from outgoing email so the reset scenario can finish offline."""
+
+    _TOKEN = re.compile(r"reset your AquaMate password: (\S+)")
+
+    def __init__(self):
+        self._tokens: dict[str, list[str]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def submit(self, recipient: str, subject: str, body: str) -> bool:
+        match = self._TOKEN.search(body)
+        if match:
+            with self._lock:
+                self._tokens[recipient.lower()].append(match.group(1))
+        return True
+
+    async def wait_for_token(self, recipient: str, timeout: float = 5.0) -> str | None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                tokens = self._tokens.get(recipient.lower())
+                if tokens:
+                    return tokens.pop()
+            await asyncio.sleep(0.05)
+        return None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def boot(redis_url: str | None, database_url: str | None) -> tuple[str, Mailbox, object]:
+    """
+    Start uvicorn in-process; returns (base URL, mailbox, server) - set server.should_exit to stop it.
+
+    uvicorn trusts X-Forwarded-For from 127.0.0.1, so each virtual user's own address
+    is what rate limits and the login throttle see.
+    """
+    offline.configure(redis_url, database_url)
+
+    import uvicorn
+
+    from app.main import app
+    from app.services.mailer import mail_pool
+
+    mailbox = Mailbox()
+    mail_pool.submit = mailbox.submit
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", backlog=4096))
+    threading.Thread(target=server.run, name="loadtest-server", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}", mailbox, server
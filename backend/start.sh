@@ -9,5 +9,11 @@ alembic -c alembic.ini upgrade head || {
   alembic -c alembic.ini stamp head
 }
 
-echo "Starting Uvicorn..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+  # Stale per-process metric files from the previous run would be summed into /metrics.
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+echo "Starting API..."
+exec python -m app.cli.serve --host 0.0.0.0 --port 8000
@@ -0,0 +1,59 @@
+"""
+Tests run against fakeredis and a throwaway SQLite file.
+
+Settings, Redis clients and the engine are built at import time, so the environment
+and the Redis factories are patched here before anything under app/ is imported.
+"""
+import os
+import tempfile
+
+import fakeredis
+import pytest
+import redis
+import redis.asyncio
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='aquamate-test-')}/app.db"
+os.environ["SESSION_INDEX_SWEEP_SECONDS"] = "0"
+
+_server = fakeredis.FakeServer()
+redis.Redis.from_url = classmethod(lambda cls, url, **kw: fakeredis.FakeRedis(server=_server, **kw))
+redis.asyncio.Redis.from_url = classmethod(lambda cls, url, **kw: fakeredis.FakeAsyncRedis(server=_server, **kw))
+
+
+@pytest.fixture
+def settings():
+    from app.core.config import get_settings
+
+    return get_settings()
+
+
+@pytest.fixture
+def db():
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.models import user  # noqa: F401  (registers the table)
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def redis_server():
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_client(redis_server):
+    """Like the app's client: decoded responses, round trips visible to count_round_trips()."""
+    from app.core.redis_client import instrument_round_trips
+
+    return instrument_round_trips(fakeredis.FakeRedis(server=redis_server, decode_responses=True))
+
+
+@pytest.fixture
+def async_redis_client(redis_server):
+    from app.core.redis_client import instrument_round_trips
+
+    return instrument_round_trips(fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=True))
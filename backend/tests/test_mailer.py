@@ -0,0 +1,52 @@
+import threading
+import time
+
+from app.services.mailer import MailPool
+
+
+def _pool(settings, **overrides) -> MailPool:
+    options = dict(
+        workers=1,
+        queue_depth=1,
+        max_attempts=1,
+        retry_base_seconds=0,
+        idle_timeout_seconds=0.05,
+        enqueue_timeout_seconds=0.01,
+    )
+    options.update(overrides)
+    return MailPool(settings, **options)
+
+
+def test_stop_with_a_full_queue_returns(settings, monkeypatch):
+    pool = _pool(settings)
+    release = threading.Event()
+    delivered = []
+
+    def deliver(connection, job):
+        release.wait(5)
+        delivered.append(job.recipient)
+
+    monkeypatch.setattr(pool, "_deliver", deliver)
+    pool.submit("a@example.com", "s", "b")  # Picked up by the worker, which then blocks.
+    while pool.stats()["queue_size"]:
+        time.sleep(0.001)
+    assert pool.submit("b@example.com", "s", "b")  # Fills the queue.
+    worker = pool._threads[0]
+
+    pool.stop(timeout=0.1)  # No room for the sentinel; must not raise.
+    release.set()
+    worker.join(5)
+
+    assert not worker.is_alive()
+    assert delivered == ["a@example.com"]
+
+def test_stop_drains_queued_mail(settings, monkeypatch):
+    pool = _pool(settings, queue_depth=10)
+    delivered = []
+    monkeypatch.setattr(pool, "_deliver", lambda connection, job: delivered.append(job.recipient))
+    for index in range(5):
+        pool.submit(f"user{index}@example.com", "s", "b")
+
+    pool.stop(timeout=5)
+
+    assert len(delivered) == 5
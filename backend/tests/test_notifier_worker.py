@@ -0,0 +1,45 @@
+from app.services.notification_outbox import NotificationOutbox
+from app.workers.notifier import NotifierWorker
+
+TOKEN = "raw-reset-token-value"
+
+
+def _worker(settings, redis_client, monkeypatch, batch_size: int = 10) -> NotifierWorker:
+    worker = NotifierWorker(settings, redis_client, "test", batch_size=batch_size, block_ms=1)
+
+    def reject(fields):
+        raise ValueError("mailbox does not exist")
+
+    monkeypatch.setattr(worker, "_send", reject)
+    worker.ensure_group()
+    return worker
+
+
+def test_dead_letters_keep_the_envelope_but_not_the_body(settings, redis_client, monkeypatch):
+    worker = _worker(settings, redis_client, monkeypatch)
+    NotificationOutbox(settings, client=redis_client).enqueue(
+        "alice@example.com", "Reset your password", f"https://example.com/reset?token={TOKEN}"
+    )
+
+    worker.process_once()
+
+    [(_, fields)] = redis_client.xrange(settings.notification_dead_letter_stream)
+    assert fields["recipient"] == "alice@example.com"
+    assert fields["subject"] == "Reset your password"
+    assert "body" not in fields
+    assert not any(TOKEN in value for value in fields.values())
+    assert redis_client.xlen(settings.notification_stream) == 0
+
+
+def test_dead_letter_stream_is_capped(settings, redis_client, monkeypatch):
+    settings = settings.model_copy(update={"notification_dead_letter_maxlen": 3})
+    worker = _worker(settings, redis_client, monkeypatch, batch_size=250)
+    outbox = NotificationOutbox(settings, client=redis_client)
+    for i in range(250):
+        outbox.enqueue(f"user{i}@example.com", "Reset your password", "body")
+
+    worker.process_once()
+
+    assert worker.dead_lettered == 250
+    # Approximate trimming drops whole stream nodes (100 entries by default).
+    assert redis_client.xlen(settings.notification_dead_letter_stream) <= 3 + 100
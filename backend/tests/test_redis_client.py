@@ -0,0 +1,46 @@
+import asyncio
+
+import fakeredis
+from redis.commands.core import AsyncScript
+
+from app.core.redis_client import LazyRedis
+
+ECHO = "return ARGV[1]"
+
+
+def test_registering_scripts_builds_no_client():
+    built = []
+    proxy = LazyRedis(lambda: built.append(1) or fakeredis.FakeRedis(decode_responses=True))
+
+    script = proxy.register_script(ECHO)
+
+    assert built == [] and not proxy.created
+    assert script(args=["hi"]) == "hi"
+    assert built == [1]
+
+
+def test_scripts_follow_the_proxy_after_discard():
+    clients = []
+
+    def factory():
+        clients.append(fakeredis.FakeRedis(decode_responses=True))
+        return clients[-1]
+
+    proxy = LazyRedis(factory)
+    script = proxy.register_script(ECHO)
+    script(args=["first"])
+    proxy.close()
+    proxy.discard()
+
+    assert script(args=["second"]) == "second"
+    assert len(clients) == 2
+
+
+def test_async_scripts_resolve_lazily():
+    built = []
+    proxy = LazyRedis(lambda: built.append(1) or fakeredis.FakeAsyncRedis(decode_responses=True), AsyncScript)
+    script = proxy.register_script(ECHO)
+    assert built == []
+
+    assert asyncio.run(script(args=["hi"])) == "hi"
+    assert built == [1]
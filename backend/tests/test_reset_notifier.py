@@ -0,0 +1,39 @@
+import asyncio
+import time
+import uuid
+from types import SimpleNamespace
+
+from app.services.password_reset.notifier import ResetNotifier
+
+
+class _SlowMailer:
+    """Stands in for MailPool with a full queue: submit blocks for the enqueue timeout."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, recipient: str, subject: str, body: str) -> bool:
+        time.sleep(0.2)
+        self.submitted.append(recipient)
+        return False
+
+
+def test_dispatch_async_does_not_block_the_event_loop(settings):
+    mailer = _SlowMailer()
+    notifier = ResetNotifier(settings, mailer=mailer)
+    user = SimpleNamespace(id=uuid.uuid4(), email="alice@example.com", username="alice")
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while not mailer.submitted:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        await asyncio.gather(notifier.dispatch_async(user, "token"), ticker())
+
+    asyncio.run(scenario())
+
+    assert mailer.submitted == ["alice@example.com"]
+    assert ticks > 5
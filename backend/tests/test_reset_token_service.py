@@ -0,0 +1,110 @@
+import asyncio
+import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.schemas.user import UserCreate
+from app.services.password_reset.service import InvalidResetTokenError, PasswordResetService
+from app.services.reset_token_service import AsyncResetTokenService, ResetTokenService
+from app.services.session_cache import SessionCache
+from app.services.session_service import SessionService
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+def tokens(settings, redis_client):
+    return ResetTokenService(settings, client=redis_client)
+
+
+def test_token_is_consumed_once(tokens):
+    user_id = uuid.uuid4()
+    token = tokens.create_reset_token(user_id)
+
+    assert tokens.consume_reset_token(token) == user_id
+    assert tokens.consume_reset_token(token) is None
+
+
+def test_concurrent_consumers_cannot_both_win(tokens):
+    user_id = uuid.uuid4()
+    token = tokens.create_reset_token(user_id)
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(tokens.consume_reset_token, [token] * 8))
+
+    assert results.count(user_id) == 1
+    assert results.count(None) == 7
+
+
+def test_new_token_invalidates_the_previous_one(tokens):
+    user_id = uuid.uuid4()
+    first = tokens.create_reset_token(user_id)
+    second = tokens.create_reset_token(user_id)
+
+    assert tokens.consume_reset_token(first) is None
+    assert tokens.consume_reset_token(second) == user_id
+
+
+def test_cap_keeps_the_newest_tokens(settings, redis_client):
+    tokens = ResetTokenService(settings.model_copy(update={"reset_tokens_per_user": 2}), client=redis_client)
+    user_id = uuid.uuid4()
+    issued = [tokens.create_reset_token(user_id) for _ in range(3)]
+
+    assert [tokens.consume_reset_token(token) for token in issued] == [None, user_id, user_id]
+
+
+def test_expired_tokens_do_not_count_against_the_cap(settings, redis_client):
+    tokens = ResetTokenService(settings.model_copy(update={"reset_tokens_per_user": 2}), client=redis_client)
+    user_id = uuid.uuid4()
+    expired = tokens.create_reset_token(user_id)
+    redis_client.delete(tokens._reset_key(tokens._digest(expired)))
+    issued = [tokens.create_reset_token(user_id) for _ in range(2)]
+
+    assert [tokens.consume_reset_token(token) for token in issued] == [user_id, user_id]
+
+
+def test_tokens_are_stored_by_digest(tokens, redis_client):
+    token = tokens.create_reset_token(uuid.uuid4())
+
+    assert not any(token in key for key in redis_client.keys("*"))
+
+
+def test_legacy_raw_token_keys_are_still_consumed(tokens, redis_client):
+    user_id = uuid.uuid4()
+    redis_client.set("reset:legacy-token", json.dumps({"user_id": str(user_id)}), ex=3600)
+
+    assert tokens.consume_reset_token("legacy-token") == user_id
+    assert tokens.consume_reset_token("legacy-token") is None
+
+
+def test_completed_reset_invalidates_the_users_other_tokens(db, settings, redis_client):
+    settings = settings.model_copy(update={"reset_tokens_per_user": 2})
+    users = UserService(db)
+    user = users.create_user(UserCreate(username="alice", email="alice@example.com", password="Correct-Horse-9-Battery"))
+    tokens = ResetTokenService(settings, client=redis_client)
+    reset = PasswordResetService(
+        users,
+        SessionService(settings, client=redis_client, cache=SessionCache(1, 0)),
+        tokens,
+        send_email_fn=lambda *args: None,
+    )
+    used, other = tokens.create_reset_token(user.id), tokens.create_reset_token(user.id)
+
+    reset.complete_reset(used, "Battery-Staple-7-Horse", client_ip="127.0.0.1")
+
+    with pytest.raises(InvalidResetTokenError):
+        reset.complete_reset(other, "Another-Pass-8-Word", client_ip="127.0.0.1")
+    assert redis_client.exists(tokens._user_index_key(user.id)) == 0
+
+
+def test_async_service_consumes_once_and_replaces_tokens(settings, async_redis_client):
+    tokens = AsyncResetTokenService(settings, client=async_redis_client)
+    user_id = uuid.uuid4()
+
+    async def scenario():
+        first = await tokens.create_reset_token(user_id)
+        second = await tokens.create_reset_token(user_id)
+        return [await tokens.consume_reset_token(token) for token in (first, second, second)]
+
+    assert asyncio.run(scenario()) == [None, user_id, None]
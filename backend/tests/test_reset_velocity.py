@@ -0,0 +1,47 @@
+import asyncio
+import uuid
+
+import httpx
+
+from app.core.redis_client import count_round_trips
+from app.services.password_reset import audit
+from app.services.password_reset.audit import ResetVelocityTracker
+
+
+class _Gauge:
+    value = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+def test_health_makes_no_redis_round_trips(db):
+    from app.main import app
+
+    async def probe():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            with count_round_trips() as tally:
+                response = await client.get("/health")
+        return response, tally[0]
+
+    response, trips = asyncio.run(probe())
+
+    assert response.status_code == 200
+    assert "reset_velocity" not in response.json()
+    assert trips == 0
+
+
+def test_refresh_metrics_reports_tracked_users(redis_client, monkeypatch):
+    tracked, local = _Gauge(), _Gauge()
+    monkeypatch.setattr(audit, "RESET_VELOCITY_TRACKED_USERS", tracked)
+    monkeypatch.setattr(audit, "RESET_VELOCITY_LOCAL_USERS", local)
+    tracker = ResetVelocityTracker(3600, 3, 100, client=redis_client)
+    for _ in range(2):
+        tracker.record(uuid.uuid4(), "127.0.0.1")
+
+    with count_round_trips() as tally:
+        tracker.refresh_metrics()
+
+    assert (tracked.value, local.value) == (2, 0)
+    assert tally[0] == 3  # ZCOUNT, sampling ZRANGE, MEMORY USAGE (refused by fakeredis).
@@ -0,0 +1,82 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.services import session_scripts
+from app.services.session_cache import SessionCache
+from app.services.session_service import AsyncSessionService, SessionService
+
+SCRIPTS = (
+    session_scripts.CREATE_SESSION,
+    session_scripts.TOUCH_SESSION,
+    session_scripts.LIST_SESSIONS,
+    session_scripts.REVOKE_SESSION,
+    session_scripts.REVOKE_OWNED_SESSION,
+    session_scripts.REVOKE_ALL_SESSIONS,
+)
+
+
+@pytest.fixture
+def service(settings, redis_client):
+    # Open the connection and load the scripts up front, as a warm worker would have them.
+    for source in SCRIPTS:
+        redis_client.script_load(source)
+    # A zero TTL disables the in-process cache so lookups always reach Redis.
+    return SessionService(settings, client=redis_client, cache=SessionCache(1, 0))
+
+
+def _cost(service, call):
+    service.round_trips = 0
+    result = call()
+    return result, service.round_trips
+
+
+def test_each_operation_is_one_round_trip(service):
+    user_id = uuid.uuid4()
+
+    token, trips = _cost(service, lambda: service.create_session(user_id, user_agent="pytest", ip="127.0.0.1"))
+    assert trips == 1
+    other, _ = _cost(service, lambda: service.create_session(user_id))
+    third, _ = _cost(service, lambda: service.create_session(user_id))
+
+    assert _cost(service, lambda: service.get_user_id_for_session(token)) == (user_id, 1)
+    sessions, trips = _cost(service, lambda: service.list_sessions(user_id))
+    assert (len(sessions), trips) == (3, 1)
+    assert _cost(service, lambda: service.revoke_session_for_user(user_id, other)) == (True, 1)
+    assert _cost(service, lambda: service.revoke_session(third))[1] == 1
+    assert _cost(service, lambda: service.revoke_all_sessions(user_id))[1] == 1
+    assert _cost(service, lambda: service.get_user_id_for_session(token)) == (None, 1)
+
+
+def test_counts_script_loads(settings, redis_client):
+    redis_client.script_flush()
+    redis_client.ping()
+    service = SessionService(settings, client=redis_client, cache=SessionCache(1, 0))
+
+    service.create_session(uuid.uuid4())
+
+    # EVALSHA answered NOSCRIPT, then SCRIPT LOAD, then EVALSHA again.
+    assert service.round_trips == 3
+
+
+def test_async_operations_are_one_round_trip(settings, redis_client, async_redis_client):
+    for source in SCRIPTS:
+        redis_client.script_load(source)
+    service = AsyncSessionService(settings, client=async_redis_client, cache=SessionCache(1, 0))
+    user_id = uuid.uuid4()
+
+    async def scenario():
+        await async_redis_client.ping()
+        costs = []
+        for call in (
+            lambda: service.create_session(user_id),
+            lambda: service.list_sessions(user_id),
+            lambda: service.revoke_all_sessions(user_id),
+        ):
+            service.round_trips = 0
+            await call()
+            costs.append(service.round_trips)
+        return costs
+
+    assert asyncio.run(scenario()) == [1, 1, 1]
@@ -0,0 +1,88 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.session_cache import SessionCache, SessionRevocationListener
+from app.services.session_service import SessionService
+from app.services.session_tokens import RevokedSessions, SessionClaims
+
+PASSWORD = "Correct-Horse-9-Battery"
+
+
+@pytest.fixture
+def stateless(settings, monkeypatch):
+    monkeypatch.setattr(settings, "session_mode", "stateless")
+    return settings
+
+
+@pytest.fixture
+def client(db, stateless):
+    from app.main import app
+
+    client = TestClient(app)
+    response = client.post("/auth/register", json={"username": "alice", "email": "alice@example.com", "password": PASSWORD})
+    assert response.status_code == 201
+    return client
+
+
+def _login(client: TestClient) -> str:
+    client.cookies.clear()
+    assert client.post("/auth/login", json={"identifier": "alice", "password": PASSWORD}).status_code == 200
+    return client.cookies.get("session")
+
+
+def _me(client: TestClient, cookie: str) -> int:
+    client.cookies.set("session", cookie)
+    return client.get("/auth/me").status_code
+
+
+def test_logged_out_cookie_is_rejected(client):
+    cookie = client.cookies.get("session")
+    assert _me(client, cookie) == 200
+
+    assert client.post("/auth/logout").status_code == 204
+
+    assert _me(client, cookie) == 401
+
+
+def test_revoked_session_cookie_is_rejected(client):
+    stolen = client.cookies.get("session")
+    mine = _login(client)
+    other = next(s["id"] for s in client.get("/sessions/").json() if s["id"] not in mine)
+
+    assert client.post("/sessions/revoke", params={"session_id": other}).status_code == 204
+
+    assert _me(client, stolen) == 401
+    assert _me(client, mine) == 200
+
+
+def test_evicted_session_cookie_is_rejected(client, stateless, monkeypatch):
+    monkeypatch.setattr(stateless, "session_max_per_user", 1)
+    evicted = client.cookies.get("session")
+
+    newest = _login(client)
+
+    assert _me(client, evicted) == 401
+    assert _me(client, newest) == 200
+
+
+def test_other_workers_learn_revocations_from_the_channel_and_redis(stateless, redis_client):
+    def worker():
+        revoked = RevokedSessions(100, stateless.session_max_age_seconds, client=redis_client)
+        service = SessionService(stateless, client=redis_client, cache=SessionCache(1, 0), revoked=revoked)
+        return service, revoked
+
+    service, _ = worker()
+    listening = SessionRevocationListener(SessionCache(1, 0), redis_client, stateless.session_revocation_channel, worker()[1])
+    token = service.create_session(uuid.uuid4())
+    service.revoke_session(token)
+    session_id = SessionClaims.decode(token).session_id
+
+    # A message heard on the channel, and a worker starting later that loads from Redis.
+    listening._handle({"data": session_id})
+    _, restarted = worker()
+    restarted.load()
+
+    assert listening.revoked.is_revoked(session_id)
+    assert restarted.is_revoked(session_id)
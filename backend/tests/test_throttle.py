@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.middleware.throttle import ThrottleMiddleware
+from app.services.throttle import Throttle, ThrottleRule
+
+PASSWORD = "correct horse"
+
+
+async def _login(request):
+    body = await request.json()
+    ok = body.get("password") == PASSWORD
+    return JSONResponse({"ok": ok}, status_code=200 if ok else 401)
+
+
+def _client(throttle: Throttle, rule: ThrottleRule, ip: str = "127.0.0.1") -> httpx.AsyncClient:
+    app = ThrottleMiddleware(Starlette(routes=[Route("/auth/login", _login, methods=["POST"])]), [rule], throttle)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=(ip, 1234)), base_url="http://test")
+
+
+def test_oversized_body_is_refused_without_buffering(async_redis_client):
+    rule = ThrottleRule(prefix="/auth/login", ip_limit=10, identifier_limit=10, period_seconds=60, max_body_bytes=64)
+
+    async def scenario():
+        async with _client(Throttle(async_redis_client), rule) as client:
+            declared = await client.post("/auth/login", content=b"{" + b" " * 100 + b"}")
+
+            async def stream():
+                for _ in range(10):
+                    yield b" " * 32
+
+            streamed = await client.post("/auth/login", content=stream())
+            return declared.status_code, streamed.status_code
+
+    assert asyncio.run(scenario()) == (413, 413)
+
+
+def test_ip_bucket_is_checked_before_the_body(async_redis_client):
+    rule = ThrottleRule(prefix="/auth/login", ip_limit=1, identifier_limit=10, period_seconds=60)
+    reads = 0
+
+    async def scenario():
+        nonlocal reads
+        async with _client(Throttle(async_redis_client), rule) as client:
+            await client.post("/auth/login", json={"identifier": "alice", "password": PASSWORD})
+
+            async def body():
+                nonlocal reads
+                reads += 1
+                yield json.dumps({"identifier": "alice", "password": PASSWORD}).encode()
+
+            return (await client.post("/auth/login", content=body())).status_code
+
+    assert asyncio.run(scenario()) == 429
+    assert reads == 0
+
+
+def test_failures_from_other_addresses_do_not_lock_out_the_account(async_redis_client):
+    rule = ThrottleRule(
+        prefix="/auth/login",
+        ip_limit=100,
+        identifier_limit=100,
+        period_seconds=60,
+        backoff_after_failures=2,
+        backoff_base_seconds=60,
+    )
+
+    throttle = Throttle(async_redis_client)
+    guess = {"identifier": "alice", "password": "wrong"}
+
+    async def scenario():
+        async with _client(throttle, rule, "203.0.113.9") as attacker, _client(throttle, rule, "198.51.100.4") as owner:
+            for _ in range(3):
+                await attacker.post("/auth/login", json=guess)
+            refused = await attacker.post("/auth/login", json=guess)
+            signed_in = await owner.post("/auth/login", json={"identifier": "alice", "password": PASSWORD})
+            return refused.status_code, refused.json()["detail"]["code"], signed_in.status_code
+
+    assert asyncio.run(scenario()) == (429, "backoff", 200)
@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime
+
+from app.repositories.user_repo import UserRepository
+from app.services.user_service import UserService
+
+
+def _rows(count: int, **extra) -> list[dict]:
+    return [
+        {"id": uuid.uuid4(), "username": f"user{i}", "email": f"user{i}@example.com", "hashed_password": "x", **extra}
+        for i in range(count)
+    ]
+
+
+def _page_through(service: UserService, limit: int) -> list[uuid.UUID]:
+    seen, cursor = [], None
+    for _ in range(20):
+        users, cursor = service.list_users(limit, cursor)
+        seen.extend(user.id for user in users)
+        if cursor is None:
+            return seen
+    raise AssertionError("next_cursor never ran out")
+
+
+def test_pages_advance_over_default_timestamps(db):
+    inserted = UserRepository(db).bulk_insert(_rows(5))
+
+    seen = _page_through(UserService(db), limit=2)
+
+    assert len(seen) == len(set(seen)) == 5
+    assert set(seen) == inserted
+
+
+def test_pages_advance_over_shared_created_at(db):
+    created_at = datetime(2026, 1, 1, 12, 0, 0)
+    inserted = UserRepository(db).bulk_insert(_rows(7, created_at=created_at))
+
+    seen = _page_through(UserService(db), limit=3)
+
+    assert len(seen) == len(set(seen)) == 7
+    assert set(seen) == inserted
+    assert seen == sorted(seen, reverse=True)
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.password_executor import PasswordHasherBusyError
+from app.db.session import _async_database_url
+from app.repositories import user_repo
+from app.schemas.user import UserCreate
+from app.services import user_service
+from app.services.user_service import AsyncUserService, UserService
+
+PASSWORD = "Correct-Horse-9-Battery"
+
+
+def _payload(username: str = "alice", email: str = "alice@example.com") -> UserCreate:
+    return UserCreate(username=username, email=email, password=PASSWORD)
+
+
+@pytest.fixture
+def hash_calls(monkeypatch):
+    calls = []
+
+    def fake_hash(password: str) -> str:
+        calls.append(password)
+        return "hashed"
+
+    monkeypatch.setattr(user_repo, "hash_password", fake_hash)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "duplicate",
+    [_payload(username="someone-else", email="ALICE@example.com"), _payload(username="Alice", email="other@example.com")],
+)
+def test_duplicate_is_rejected_before_hashing(db, hash_calls, duplicate):
+    service = UserService(db)
+    service.create_user(_payload())
+
+    with pytest.raises(ValueError, match="already exists"):
+        service.create_user(duplicate)
+
+    assert len(hash_calls) == 1
+
+
+def test_unique_index_still_rejects_a_duplicate_that_passes_the_probe(db, hash_calls, monkeypatch):
+    service = UserService(db)
+    service.create_user(_payload())
+    monkeypatch.setattr(service.repo, "identifier_taken", lambda email, username: False)
+
+    with pytest.raises(ValueError, match="already exists"):
+        service.create_user(_payload(username="ALICE", email="new@example.com"))
+
+    assert len(hash_calls) == 2
+    assert service.get_by_username("alice") is not None
+
+
+@pytest.fixture
+def outdated_hash(monkeypatch):
+    monkeypatch.setattr(user_service, "password_needs_rehash", lambda hashed_password: True)
+
+
+def _fail_commit(*args, **kwargs):
+    raise OperationalError("UPDATE users", {}, Exception("database is locked"))
+
+
+def test_rehash_keeps_the_old_hash_when_the_hasher_is_busy(db, hash_calls, outdated_hash, monkeypatch):
+    service = UserService(db)
+    user = service.create_user(_payload())
+
+    def busy(password: str) -> str:
+        raise PasswordHasherBusyError("Password hashing queue is full")
+
+    monkeypatch.setattr(user_service, "hash_password", busy)
+
+    assert service.rehash_password_if_needed(user, PASSWORD) is False
+    assert user.hashed_password == "hashed"
+
+
+def test_rehash_rolls_back_when_the_write_fails(db, hash_calls, outdated_hash, monkeypatch):
+    service = UserService(db)
+    user = service.create_user(_payload())
+    monkeypatch.setattr(user_service, "hash_password", lambda password: "rehashed")
+    monkeypatch.setattr(db, "commit", _fail_commit)
+
+    assert service.rehash_password_if_needed(user, PASSWORD) is False
+    monkeypatch.undo()
+    assert user.hashed_password == "hashed"
+    assert service.get_by_username("alice").id == user.id
+
+
+def test_async_rehash_leaves_the_user_loaded_when_the_write_fails(db, hash_calls, outdated_hash, monkeypatch):
+    user_id = UserService(db).create_user(_payload()).id
+
+    async def rehashed(password: str) -> str:
+        return "rehashed"
+
+    monkeypatch.setattr(user_service, "hash_password_async", rehashed)
+
+    async def scenario():
+        engine = create_async_engine(_async_database_url(str(db.get_bind().url)))
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                service = AsyncUserService(session)
+                user = await service.get_by_username("alice")
+                monkeypatch.setattr(session, "commit", _fail_commit)
+                assert await service.rehash_password_if_needed(user, PASSWORD) is False
+                return user.id, user.hashed_password
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(scenario()) == (user_id, "hashed")